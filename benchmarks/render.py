@@ -0,0 +1,164 @@
+"""Microbenchmarks for the reply formatting and markdown rendering hot path.
+
+Usage:
+    python -m benchmarks.render
+    python -m benchmarks.render --save benchmarks/baseline.json
+    python -m benchmarks.render --compare benchmarks/baseline.json
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from loadtest import payloads
+from src.models.confidace_score import ConfidenceScore
+from src.utils.markdown import split_markdown
+from src.utils.string_formatters import (
+    format_confidence_score,
+    format_price_data,
+    format_technical_analysis,
+    markdownify,
+)
+
+SIZES = {"small": 600, "typical": 4000, "large": 40_000}
+
+
+def _confidence(size: str) -> ConfidenceScore:
+    data = payloads.confidence_score("BTC")
+    extra = {"small": 0, "typical": 4, "large": 200}[size]
+    data["additional_info"] = {f"metric_{index}": index for index in range(extra)}
+    return ConfidenceScore(**data)
+
+
+def _technical(size: str) -> dict:
+    signals, levels = {"small": (0, 0), "typical": (4, 6), "large": (100, 60)}[size]
+    return payloads.technical_analysis("BTC", signals=signals, levels=levels)
+
+
+def build_cases() -> dict[str, tuple[Callable, tuple]]:
+    """Benchmark name -> (function, arguments) for every fixture size."""
+    cases: dict[str, tuple[Callable, tuple]] = {
+        "format_price_data": (format_price_data, (payloads.price_info("BTC"),)),
+    }
+    for size, length in SIZES.items():
+        confidence = _confidence(size)
+        technical = _technical(size)
+        text = payloads.markdown_text("BTC", length)
+
+        cases[f"format_confidence_score[{size}]"] = (
+            format_confidence_score,
+            (confidence,),
+        )
+        cases[f"format_technical_analysis[{size}]"] = (
+            format_technical_analysis,
+            (technical,),
+        )
+        cases[f"markdownify[technical-{size}]"] = (
+            markdownify,
+            (format_technical_analysis(technical),),
+        )
+        cases[f"markdownify[text-{size}]"] = (markdownify, (text,))
+        cases[f"split_markdown[{size}]"] = (split_markdown, (text,))
+        cases[f"split_markdown[{size}-chunked]"] = (split_markdown, (text, 4000))
+    return cases
+
+
+def measure(func: Callable, args: tuple, min_time: float) -> dict[str, float]:
+    """Best-of-five ops/sec and the peak memory allocated by a single call.
+
+    Every call gets its own text, so no memoized rendering can serve it.
+    """
+    counter = itertools.count()
+
+    def call():
+        index = next(counter)
+        return func(
+            *(f"{arg}\n{index}" if isinstance(arg, str) else arg for arg in args)
+        )
+
+    timer = timeit.Timer(call)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=5, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"ops_per_sec": 1 / best, "peak_kib": peak / 1024}
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], tolerance: float
+) -> list[str]:
+    """Describe every benchmark that got slower or allocates more than allowed."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:.0f} ops/s "
+                f"(baseline {base['ops_per_sec']:.0f})"
+            )
+        if result["peak_kib"] > base["peak_kib"] * (1 + tolerance) + 1:
+            regressions.append(
+                f"{name}: {result['peak_kib']:.1f} KiB peak "
+                f"(baseline {base['peak_kib']:.1f})"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="Only run matching benchmarks")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--save", type=Path, help="Write results as a baseline")
+    parser.add_argument("--compare", type=Path, help="Baseline to check against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown or allocation growth",
+    )
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {}
+    print(f"{'benchmark':<44} {'ops/sec':>12} {'peak KiB':>10}")
+    for name, (func, func_args) in build_cases().items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(func, func_args, args.min_time)
+        print(
+            f"{name:<44} {results[name]['ops_per_sec']:>12.1f} "
+            f"{results[name]['peak_kib']:>10.1f}"
+        )
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.compare:
+        if not args.compare.exists():
+            print(f"\nNo baseline at {args.compare}, skipping comparison")
+            return
+        regressions = compare(
+            results, json.loads(args.compare.read_text()), args.tolerance
+        )
+        if regressions:
+            print("\nRegressions:\n" + "\n".join(f"  {line}" for line in regressions))
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
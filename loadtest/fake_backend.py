@@ -0,0 +1,222 @@
+"""Local stand-in for the analysis backend with latency and fault injection.
+
+Usage:
+    python -m loadtest.fake_backend --port 8081 --latency-ms 80 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from dataclasses import dataclass, field
+
+from loadtest import payloads
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class EndpointProfile:
+    """Latency is drawn from a log-normal distribution around ``median_ms``."""
+
+    median_ms: float
+    sigma: float = 0.5
+    error_rate: float = 0.0
+
+    def latency(self) -> float:
+        return random.lognormvariate(0, self.sigma) * self.median_ms / 1000
+
+
+@dataclass
+class BackendConfig:
+    profiles: dict[str, EndpointProfile] = field(default_factory=dict)
+    default: EndpointProfile = field(default_factory=lambda: EndpointProfile(80))
+    text_size: int = 3000
+    plots: int = 2
+    plot_size: int = 60_000
+    stream_chunk_size: int = 40
+
+    def profile(self, endpoint: str) -> EndpointProfile:
+        return self.profiles.get(endpoint, self.default)
+
+
+class FakeAnalysisBackend:
+    """Minimal HTTP/1.1 server implementing the ``/addon`` API."""
+
+    def __init__(self, config: BackendConfig, host: str = "127.0.0.1", port: int = 0):
+        self.config = config
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Fake analysis backend listening on %s", self.base_url)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                self.requests += 1
+                await self._respond(writer, method, target, body)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, method: str, target: str, body: bytes
+    ) -> None:
+        path = target.split("?", 1)[0]
+        endpoint = path.rsplit("/", 1)[0] if "/plot_image/" in path else path
+        profile = self.config.profile(endpoint.removeprefix("/addon/"))
+
+        await asyncio.sleep(profile.latency())
+        if random.random() < profile.error_rate:
+            self._write(writer, 503, b'{"detail": "injected failure"}')
+            return
+
+        request = json.loads(body) if body else {}
+        symbol = request.get("symbol", "")
+        if method == "POST" and path == "/addon/response":
+            await self._analysis(writer, request)
+        elif method == "GET" and endpoint == "/addon/plot_image":
+            image = payloads.plot_image(path.rsplit("/", 1)[1], self.config.plot_size)
+            self._write(writer, 200, image, content_type="image/png")
+        elif method == "POST" and path == "/addon/confidence_score":
+            self._json(writer, payloads.confidence_score(symbol))
+        elif method == "POST" and path == "/addon/technical":
+            self._json(writer, payloads.technical_analysis(symbol))
+        elif method == "POST" and path == "/addon/price_info":
+            self._json(writer, payloads.price_info(symbol))
+        elif method == "POST" and path == "/addon/coin_info":
+            self._json(writer, payloads.markdown_text(symbol, self.config.text_size))
+        elif method == "POST" and path == "/addon/wallet_info":
+            address = request.get("address", "")
+            self._json(writer, payloads.markdown_text(address, self.config.text_size))
+        else:
+            self._write(writer, 404, b'{"detail": "Not Found"}')
+        await writer.drain()
+
+    async def _analysis(self, writer: asyncio.StreamWriter, request: dict) -> None:
+        query = request.get("query", "")
+        text = payloads.markdown_text(query, self.config.text_size)
+        plots = [
+            hashlib.sha1(f"{query}-{index}".encode()).hexdigest()
+            for index in range(self.config.plots)
+        ]
+        if not request.get("stream"):
+            data = {"success": True, "text": text, "plots": plots}
+            self._write(writer, 200, json.dumps(data).encode())
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        step = self.config.stream_chunk_size
+        events = [{"text": text[i : i + step]} for i in range(0, len(text), step)]
+        events.append({"success": True, "plots": plots})
+        for event in events:
+            self._chunk(writer, f"data: {json.dumps(event)}\n\n".encode())
+            await writer.drain()
+            await asyncio.sleep(0.01)
+        self._chunk(writer, b"data: [DONE]\n\n")
+        self._chunk(writer, b"")
+
+    def _json(self, writer: asyncio.StreamWriter, data: dict | str) -> None:
+        self._write(writer, 200, json.dumps({"success": True, "data": data}).encode())
+
+    @staticmethod
+    def _write(
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        content_type: str = "application/json",
+    ) -> None:
+        reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+
+    @staticmethod
+    def _chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+
+def add_backend_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--analysis-latency-ms",
+        type=float,
+        default=2000.0,
+        help="Median latency of /addon/response, the LLM backed endpoint",
+    )
+    parser.add_argument("--text-size", type=int, default=3000)
+    parser.add_argument("--plots", type=int, default=2)
+    parser.add_argument("--plot-size", type=int, default=60_000)
+
+
+def config_from_args(args: argparse.Namespace) -> BackendConfig:
+    default = EndpointProfile(args.latency_ms, args.latency_sigma, args.error_rate)
+    analysis = EndpointProfile(
+        args.analysis_latency_ms, args.latency_sigma, args.error_rate
+    )
+    return BackendConfig(
+        profiles={"response": analysis},
+        default=default,
+        text_size=args.text_size,
+        plots=args.plots,
+        plot_size=args.plot_size,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    add_backend_arguments(parser)
+    args = parser.parse_args()
+
+    backend = FakeAnalysisBackend(config_from_args(args), args.host, args.port)
+    asyncio.run(backend.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
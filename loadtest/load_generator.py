@@ -0,0 +1,205 @@
+"""Drive the bot's message handlers against an analysis backend and report latency.
+
+Telegram is replaced by a no-op bot, so the numbers cover the handler path:
+backend calls, caching, formatting and markdown rendering.
+
+Usage:
+    python -m loadtest.load_generator --concurrency 50 --duration 20
+    python -m loadtest.load_generator --backend-url http://127.0.0.1:8081 --mode price
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from itertools import count
+from types import SimpleNamespace
+
+from loadtest.fake_backend import (
+    FakeAnalysisBackend,
+    add_backend_arguments,
+    config_from_args,
+)
+
+MODES = ("crypto", "confidence", "technical", "crypto_info", "price")
+
+_ids = count(1)
+
+
+class NullMessage:
+    def __init__(self, text: str = "", chat_id: int = 0):
+        self.message_id = self.id = next(_ids)
+        self.chat_id = chat_id
+        self.text = text
+
+    async def delete(self, *args, **kwargs) -> bool:
+        return True
+
+    async def edit_text(self, *args, **kwargs) -> "NullMessage":
+        return self
+
+    async def reply_text(self, *args, **kwargs) -> "NullMessage":
+        return NullMessage(chat_id=self.chat_id)
+
+
+class NullBot:
+    """Accepts every Bot API call the handlers make without sending anything."""
+
+    username = "loadtest_bot"
+
+    async def send_message(self, chat_id: int, *args, **kwargs) -> NullMessage:
+        return NullMessage(chat_id=chat_id)
+
+    async def send_chat_action(self, *args, **kwargs) -> bool:
+        return True
+
+    async def send_media_group(self, chat_id: int, *args, **kwargs) -> list:
+        return [NullMessage(chat_id=chat_id)]
+
+
+def build_update(text: str, chat_id: int) -> tuple[SimpleNamespace, SimpleNamespace]:
+    message = NullMessage(text=text, chat_id=chat_id)
+    update = SimpleNamespace(
+        effective_chat=SimpleNamespace(id=chat_id, type="private"),
+        effective_user=SimpleNamespace(id=chat_id, first_name="Load"),
+        effective_message=message,
+        message=message,
+        callback_query=None,
+    )
+    context = SimpleNamespace(bot=NullBot(), user_data={}, chat_data={})
+    return update, context
+
+
+def percentile(samples: list[float], percent: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(
+    mode: str, symbols: list[str], concurrency: int, duration: float
+) -> dict:
+    from src.handlers.message_handler import message_handler
+    from src.models.modes import Modes
+
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            symbol = random.choice(symbols)
+            text = f"Short analysis on ${symbol}" if mode == "crypto" else symbol
+            update, context = build_update(text, chat_id=worker_id)
+            start = time.perf_counter()
+            try:
+                await message_handler.handle_message(
+                    update=update, context=context, mode=Modes(mode)
+                )
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "mean": statistics.fmean(latencies) if latencies else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def print_report(results: list[dict]) -> None:
+    header = (
+        f"{'mode':<12} {'requests':>9} {'errors':>7} {'req/s':>9} "
+        f"{'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result['mode']:<12} {result['requests']:>9} {result['errors']:>7} "
+            f"{result['rps']:>9.1f} {result['mean'] * 1000:>9.1f} "
+            f"{result['p50'] * 1000:>9.1f} {result['p95'] * 1000:>9.1f} "
+            f"{result['p99'] * 1000:>9.1f}"
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    backend = None
+    if not args.backend_url:
+        backend = FakeAnalysisBackend(config_from_args(args))
+        await backend.start()
+
+    # Settings are read on import, so configure them before loading the bot
+    os.environ["API_BASE_URL"] = args.backend_url or backend.base_url
+    os.environ.setdefault("API_KEY", "loadtest")
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:loadtest")
+    os.environ.setdefault("PLOT_CACHE_MAX_BYTES", "0")
+    if not args.admission:
+        os.environ["ADMISSION_LIMITS"] = "{}"
+        os.environ["ADMISSION_MAX_IN_FLIGHT"] = str(2**31)
+    if args.no_cache:
+        for name in (
+            "PRICE_CACHE_TTL",
+            "CONFIDENCE_CACHE_TTL",
+            "TECHNICAL_CACHE_TTL",
+            "COIN_INFO_CACHE_TTL",
+        ):
+            os.environ[name] = "0"
+
+    from src.handlers.message_handler import message_handler
+
+    symbols = [f"COIN{index}" for index in range(args.symbols)]
+    results = []
+    try:
+        for mode in args.mode or MODES:
+            results.append(
+                await run_mode(mode, symbols, args.concurrency, args.duration)
+            )
+    finally:
+        await message_handler.api_service.close()
+        if backend is not None:
+            await backend.stop()
+
+    print_report(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backend-url", help="Target an already running backend instead"
+    )
+    parser.add_argument("--mode", choices=MODES, action="append")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--symbols", type=int, default=200, help="Distinct symbols to query"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Disable the response cache"
+    )
+    parser.add_argument(
+        "--admission",
+        action="store_true",
+        help="Keep admission control on, rejected requests count as fast replies",
+    )
+    add_backend_arguments(parser)
+    run_args = parser.parse_args()
+    asyncio.run(run(run_args))
+
+
+if __name__ == "__main__":
+    main()
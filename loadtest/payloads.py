@@ -0,0 +1,174 @@
+"""Synthetic analysis backend payloads shaped like the real API responses."""
+
+import random
+import time
+
+from src.utils.symbols import normalize_symbol
+
+WORDS = (
+    "bullish bearish momentum volume breakout support resistance liquidity "
+    "whales accumulation funding rate open interest trend reversal range "
+    "consolidation volatility halving on-chain inflows outflows sentiment"
+).split()
+
+
+def _rng(symbol: str) -> random.Random:
+    return random.Random(normalize_symbol(symbol))
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text.capitalize() + "."
+
+
+def markdown_text(symbol: str, size: int) -> str:
+    """Markdown analysis of roughly ``size`` characters split in sections."""
+    rng = _rng(symbol)
+    sections = []
+    length = 0
+    index = 1
+    while length < size:
+        lines = [f"## {index}. {symbol.upper()} {rng.choice(WORDS).title()}"]
+        lines.append(" ".join(_sentence(rng) for _ in range(rng.randint(2, 5))))
+        lines.extend(
+            f"- **{rng.choice(WORDS)}**: {_sentence(rng, 6)}"
+            for _ in range(rng.randint(1, 4))
+        )
+        section = "\n".join(lines) + "\n"
+        sections.append(section)
+        length += len(section)
+        index += 1
+    return "\n".join(sections)[: max(size, 1)]
+
+
+def price_info(symbol: str) -> dict:
+    rng = _rng(symbol)
+    return {
+        "coin_id": normalize_symbol(symbol),
+        "usd": rng.uniform(0.0001, 90_000),
+        "usd_market_cap": rng.uniform(1e6, 1e12),
+        "usd_24h_vol": rng.uniform(1e5, 5e10),
+        "usd_24h_change": rng.uniform(-15, 15),
+        "last_updated_at": int(time.time()),
+    }
+
+
+def confidence_score(symbol: str) -> dict:
+    rng = _rng(symbol)
+    scores = {
+        name: round(rng.uniform(0, 10), 2)
+        for name in (
+            "trend_score",
+            "momentum_score",
+            "volatility_score",
+            "volume_score",
+            "pattern_score",
+            "support_resistance_score",
+            "confidence_score",
+        )
+    }
+    return {
+        **scores,
+        "signal": rng.choice(["BUY", "SELL", "HOLD", "NEUTRAL"]),
+        "symbol": symbol.upper(),
+        "closing_price": rng.uniform(0.0001, 90_000),
+        "version": 2,
+        "additional_info": {"market_phase": rng.choice(["markup", "markdown"])},
+    }
+
+
+def technical_analysis(symbol: str, signals: int = 4, levels: int = 6) -> dict:
+    rng = _rng(symbol)
+    price = rng.uniform(0.0001, 90_000)
+
+    def near(spread: float = 0.1) -> float:
+        return price * rng.uniform(1 - spread, 1 + spread)
+
+    return {
+        "basic_information": {
+            "identifiers": {"symbol": symbol.upper(), "name": symbol.title()},
+            "analysis_period": {"start_date": "2024-01-01", "end_date": "2024-06-30"},
+        },
+        "price_metrics": {
+            "current_price_usd": price,
+            "daily_range": {"low_usd": near(0.05), "high_usd": near(0.05)},
+            "volume": {
+                "daily_volume_usd": rng.uniform(1e5, 5e10),
+                "volume_change_7d_percent": round(rng.uniform(-50, 50), 2),
+            },
+            "price_changes": {
+                "change_24h_percent": round(rng.uniform(-15, 15), 2),
+                "change_7d_percent": round(rng.uniform(-30, 30), 2),
+            },
+        },
+        "moving_averages": {
+            "simple_moving_averages": {"sma_20_usd": near(), "sma_200_usd": near()},
+            "exponential_moving_averages": {"ema_8_usd": near(), "ema_20_usd": near()},
+        },
+        "momentum_indicators": {
+            "relative_strength_index": rng.uniform(0, 100),
+            "money_flow_index": rng.uniform(0, 100),
+            "commodity_channel_index": rng.uniform(-200, 200),
+            "relative_momentum_indicator": rng.uniform(0, 100),
+        },
+        "trend_indicators": {
+            "macd": {
+                "macd_line": rng.uniform(-5, 5),
+                "signal_line": rng.uniform(-5, 5),
+                "histogram": rng.uniform(-1, 1),
+            },
+            "directional_system": {
+                "average_directional_index": rng.uniform(0, 60),
+                "positive_directional_indicator": rng.uniform(0, 60),
+                "negative_directional_indicator": rng.uniform(0, 60),
+            },
+            "super_trend": {"direction": rng.choice(["up", "down"]), "value": near()},
+        },
+        "volatility_indicators": {
+            "bollinger_bands": {
+                "upper_band_usd": near(),
+                "middle_band_usd": price,
+                "lower_band_usd": near(),
+            }
+        },
+        "market_condition": {
+            "sentiment": {
+                "fear_greed_index": rng.uniform(0, 100),
+                "fear_greed_interpretation": rng.choice(["Fear", "Greed"]),
+            },
+            "market_phase": rng.choice(["Accumulation", "Distribution"]),
+            "volatility_percent": round(rng.uniform(0, 100), 2),
+            "trend_strength_percent": round(rng.uniform(0, 100), 2),
+            "volume_analysis": rng.choice(["Increasing", "Decreasing"]),
+            "risk_level_percent": round(rng.uniform(0, 100), 2),
+        },
+        "technical_signals": [
+            {
+                "indicator_name": rng.choice(["RSI", "MACD", "EMA Cross", "OBV"]),
+                "signal_type": rng.choice(["BUY", "SELL"]),
+                "strength_percent": rng.randint(0, 100),
+                "confidence_level": rng.choice(["low", "medium", "high"]),
+            }
+            for _ in range(signals)
+        ],
+        "support_resistance_levels": {
+            "active_channels": [
+                {
+                    "type": rng.choice(["support_channel", "resistance_channel"]),
+                    "channel_start": near(),
+                    "channel_end": near(),
+                }
+                for _ in range(levels // 2)
+            ]
+        },
+        "fibonacci_levels": [
+            {"level": f"{ratio:.3f}", "price": near()}
+            for ratio in (0.236, 0.382, 0.5, 0.618, 0.786, 1.0)[:levels]
+        ],
+    }
+
+
+def plot_image(hash_string: str, size: int) -> bytes:
+    """Deterministic PNG-signed bytes of ``size`` length for a plot hash."""
+    header = b"\x89PNG\r\n\x1a\n"
+    return header + random.Random(hash_string).randbytes(max(size - len(header), 0))
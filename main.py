@@ -1,4 +1,6 @@
 from src.bot import CryptoAnalysisBot
+from src.core.cofig import settings
+from src.dispatcher import ShardDispatcher
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -6,8 +8,11 @@ logger = get_logger(__name__)
 
 def main():
     try:
-        bot = CryptoAnalysisBot()
-        bot.run()
+        if settings.WORKER_PROCESSES > 1:
+            ShardDispatcher(settings.WORKER_PROCESSES).run()
+        else:
+            bot = CryptoAnalysisBot()
+            bot.run()
 
     except Exception as e:
         logger.error("Application failed to start: %s", e)
@@ -1,47 +1,148 @@
+import asyncio
+import json
+import secrets
+from multiprocessing.queues import Queue
 from pathlib import Path
+from typing import Callable
 
+from telegram import Update
 from telegram.ext import (
     Application,
     CallbackQueryHandler,
+    InlineQueryHandler,
     MessageHandler,
-    PicklePersistence,
     filters,
 )
 
+from src.core import replies
 from src.core.cofig import settings
+from src.core.metrics import register_rate_limiter_metrics, register_update_metrics
 from src.handlers import error_handler
 from src.handlers.callback_qery_handlers import ai_button_handler
 from src.handlers.command_handlers import command_manager
+from src.handlers.inline_query_handler import inline_query_manager
 from src.handlers.message_handler import message_handler
+from src.services.persistence import SQLitePersistence
+from src.services.rate_limiter import PriorityRateLimiter
+from src.services.state_store import state_store
+from src.services.symbol_index import symbol_registry
+from src.services.telegram_request import InstrumentedHTTPXRequest
+from src.services.update_processor import ChatOrderedUpdateProcessor
 from src.utils.logger import get_logger
+from src.utils.metrics import REGISTRY, MetricsServer
 
 logger = get_logger(__name__)
 
 
+def webhook_options() -> dict:
+    """Arguments for starting the webhook listener from the settings."""
+    return {
+        "listen": settings.WEBHOOK_LISTEN,
+        "port": settings.WEBHOOK_PORT,
+        "url_path": settings.WEBHOOK_PATH,
+        "webhook_url": settings.WEBHOOK_URL,
+        "secret_token": settings.WEBHOOK_SECRET_TOKEN or secrets.token_urlsafe(32),
+        "max_connections": settings.WEBHOOK_MAX_CONNECTIONS,
+        "allowed_updates": Update.ALL_TYPES,
+    }
+
+
+def build_metrics_server(
+    port: int, health_check: Callable[[], bool]
+) -> MetricsServer | None:
+    """The metrics and health check endpoint, None if both are disabled."""
+    if not settings.METRICS_ENABLED and not settings.HEALTH_CHECK_ENABLED:
+        return None
+    return MetricsServer(
+        settings.METRICS_HOST,
+        port,
+        registry=REGISTRY if settings.METRICS_ENABLED else None,
+        health_check=health_check,
+    )
+
+
+def build_persistence(shared: bool = False) -> SQLitePersistence:
+    """The bot persistence, ``shared`` by the workers of a sharded deployment."""
+    percistance_file_path = Path(settings.BOT_PERCISTANCE_FILE_PATH)
+    file_path_parent = percistance_file_path.parent
+    if file_path_parent:
+        file_path_parent.mkdir(parents=True, exist_ok=True)
+
+    return SQLitePersistence(
+        database=settings.persistence_database_path,
+        migrate_from=percistance_file_path,
+        update_interval=settings.PERSISTENCE_UPDATE_INTERVAL,
+        shared=shared,
+    )
+
+
 class CryptoAnalysisBot:
-    def __init__(self):
+    """The bot application.
+
+    Without ``worker_index`` the bot receives its own updates. Worker
+    processes of a sharded deployment pass their index and are fed updates
+    by the dispatcher through :meth:`serve`.
+    """
+
+    def __init__(self, worker_index: int | None = None):
+        self.worker_index = worker_index
+        metrics_port = settings.METRICS_PORT
+        if worker_index is not None:
+            metrics_port += worker_index + 1
+        self.metrics_server = build_metrics_server(metrics_port, self._healthy)
+        self.update_processor = ChatOrderedUpdateProcessor(settings.CONCURRENT_UPDATES)
+        register_update_metrics(self.update_processor)
+        self.rate_limiter = PriorityRateLimiter(
+            global_rate=settings.RATE_LIMIT_GLOBAL_PER_SECOND,
+            chat_rate=settings.RATE_LIMIT_CHAT_PER_SECOND,
+            chat_burst=settings.RATE_LIMIT_CHAT_BURST,
+            group_rate=settings.RATE_LIMIT_GROUP_PER_MINUTE / 60,
+            group_burst=settings.RATE_LIMIT_GROUP_PER_MINUTE,
+            max_retries=settings.RATE_LIMIT_MAX_RETRIES,
+        )
+        register_rate_limiter_metrics(self.rate_limiter)
         self.application = self._build_application()
 
         self._set__hadlers()
 
     def _build_application(self):
-        percistance_file_path = Path(settings.BOT_PERCISTANCE_FILE_PATH)
-        file_path_parent = percistance_file_path.parent
-        if file_path_parent:
-            file_path_parent.mkdir(parents=True, exist_ok=True)
-
-        persistence = PicklePersistence(filepath=settings.BOT_PERCISTANCE_FILE_PATH)
-        application = (
+        builder = (
             Application.builder()
             .token(settings.TELEGRAM_BOT_TOKEN)
-            .persistence(persistence=persistence)
-            .build()
+            .persistence(
+                persistence=build_persistence(shared=self.worker_index is not None)
+            )
+            .request(
+                InstrumentedHTTPXRequest(
+                    connection_pool_size=settings.TELEGRAM_CONNECTION_POOL_SIZE
+                )
+            )
+            .concurrent_updates(self.update_processor)
+            .rate_limiter(self.rate_limiter)
+            .post_init(self._post_init)
+            .post_shutdown(self._post_shutdown)
         )
+        if self.worker_index is not None:
+            builder = builder.updater(None)
+        application = builder.build()
 
         logger.info("Application built successfully.")
 
         return application
 
+    async def _post_init(self, application: Application) -> None:
+        replies.warm_up()
+        await asyncio.to_thread(symbol_registry.load)
+        command_manager.alerts.load(application.chat_data, owns=self._owns_chat)
+        if self.metrics_server:
+            await self.metrics_server.start()
+
+    async def _post_shutdown(self, application: Application) -> None:
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        await message_handler.api_service.close()
+        await state_store.close()
+
     def _set__hadlers(self):
         self.application.add_error_handler(error_handler)
         command_manager.set_handlers(self.application)
@@ -52,12 +153,73 @@ class CryptoAnalysisBot:
             )
         )
         self.application.add_handler(CallbackQueryHandler(ai_button_handler))
+        # Debouncing sleeps, so inline queries must not hold up the user's updates
+        self.application.add_handler(
+            InlineQueryHandler(inline_query_manager.handle_inline_query, block=False)
+        )
+
+        # Every process keeps its own index, the snapshot on disk is shared
+        self.application.job_queue.run_repeating(
+            symbol_registry.refresh_job,
+            interval=min(settings.COIN_LIST_REFRESH_INTERVAL, 3600),
+            first=settings.SCHEDULER_TIMOUT,
+        )
+
+        # Every process keeps its own response cache warm
+        if settings.CACHE_WARM_TOP_N:
+            self.application.job_queue.run_repeating(
+                message_handler.cache_warmer.warm_job,
+                interval=settings.CACHE_WARM_INTERVAL,
+                first=settings.CACHE_WARM_INTERVAL,
+            )
 
-        #  Initialize bot jobs
-        self.application.job_queue.run_once(
-            command_manager.setup_commands, when=settings.SCHEDULER_TIMOUT
+        # Every process checks the alerts of the chats routed to it
+        self.application.job_queue.run_repeating(
+            command_manager.alerts.check_job,
+            interval=settings.ALERT_CHECK_INTERVAL,
+            first=settings.ALERT_CHECK_INTERVAL,
         )
 
+        #  Initialize bot jobs, once per deployment
+        if not self.worker_index:
+            self.application.job_queue.run_once(
+                command_manager.setup_commands, when=settings.SCHEDULER_TIMOUT
+            )
+
+    def _owns_chat(self, chat_id: int) -> bool:
+        """Whether the dispatcher routes the updates of ``chat_id`` here."""
+        return chat_id % settings.WORKER_PROCESSES == (self.worker_index or 0)
+
+    def _healthy(self) -> bool:
+        updater = self.application.updater
+        return self.application.running and (updater is None or updater.running)
+
     def run(self):
+        if settings.UPDATE_MODE == "webhook":
+            logger.info("Starting bot with webhook on %s...", settings.WEBHOOK_URL)
+            self.application.run_webhook(**webhook_options())
+            return
+
         logger.info("Starting bot...")
         self.application.run_polling()
+
+    async def serve(self, updates: Queue) -> None:
+        """Process updates put on ``updates`` as JSON until None arrives.
+
+        ``run_polling`` and ``run_webhook`` call the lifecycle hooks themselves,
+        so they are called here explicitly.
+        """
+        application = self.application
+        await application.initialize()
+        await self._post_init(application)
+        await application.start()
+        logger.info("Worker %s started", self.worker_index)
+        try:
+            while (data := await asyncio.to_thread(updates.get)) is not None:
+                update = Update.de_json(json.loads(data), application.bot)
+                await application.update_queue.put(update)
+        finally:
+            await application.stop()
+            await application.shutdown()
+            await self._post_shutdown(application)
+            logger.info("Worker %s stopped", self.worker_index)
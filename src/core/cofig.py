@@ -1,6 +1,11 @@
-from pydantic import Field
+from pathlib import Path
+from typing import Literal
+
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from src.models.modes import Modes
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -18,12 +23,368 @@ class Settings(BaseSettings):
         default=10, description="Timout for the scheduler in seconds"
     )
 
+    TELEGRAM_CONNECTION_POOL_SIZE: int = Field(
+        default=256, description="Connection pool size for Telegram Bot API calls"
+    )
+    CONCURRENT_UPDATES: int = Field(
+        default=64,
+        ge=1,
+        description="Updates processed at once, updates of one chat stay in order",
+    )
+
+    # Rate Limit Settings
+    RATE_LIMIT_GLOBAL_PER_SECOND: float = Field(
+        default=30, description="Bot API calls per second across all chats"
+    )
+    RATE_LIMIT_CHAT_PER_SECOND: float = Field(
+        default=1, description="Sustained Bot API calls per second to a single chat"
+    )
+    RATE_LIMIT_CHAT_BURST: float = Field(
+        default=3, description="Bot API calls a single chat may receive at once"
+    )
+    RATE_LIMIT_GROUP_PER_MINUTE: float = Field(
+        default=20, description="Bot API calls per minute to a single group"
+    )
+    RATE_LIMIT_MAX_RETRIES: int = Field(
+        default=2, description="Retries of a call rejected by Telegram flood control"
+    )
+
+    # Update Settings
+    UPDATE_MODE: Literal["polling", "webhook"] = Field(
+        default="polling", description="Receive updates by long polling or a webhook"
+    )
+    WEBHOOK_URL: str | None = Field(
+        default=None,
+        description="Public HTTPS URL of the webhook including its path, "
+        "required in webhook mode",
+    )
+    WEBHOOK_LISTEN: str = Field(
+        default="127.0.0.1",
+        description="Interface the webhook listener binds to behind the reverse proxy",
+    )
+    WEBHOOK_PORT: int = Field(default=8443, description="Port of the webhook listener")
+    WEBHOOK_PATH: str = Field(
+        default="telegram", description="Path the webhook listener accepts updates on"
+    )
+    WEBHOOK_SECRET_TOKEN: str | None = Field(
+        default=None,
+        description="Secret Telegram sends with every webhook request, "
+        "random on each start if unset",
+    )
+    WEBHOOK_MAX_CONNECTIONS: int = Field(
+        default=40,
+        ge=1,
+        le=100,
+        description="Maximum simultaneous connections Telegram opens to the webhook",
+    )
+
+    # Scale-out Settings
+    WORKER_PROCESSES: int = Field(
+        default=1,
+        ge=1,
+        description="Worker processes updates are sharded across by chat, "
+        "1 runs everything in a single process",
+    )
+    STATE_STORE: Literal["sqlite", "redis", "memory"] = Field(
+        default="sqlite", description="Store for state shared by workers, like modes"
+    )
+    STATE_STORE_PATH: str | None = Field(
+        default=None,
+        description="SQLite state store, next to the persistence file if unset",
+    )
+    STATE_STORE_URL: str = Field(
+        default="redis://127.0.0.1:6379/0", description="URL of the redis state store"
+    )
+
+    # Persistence Settings
+    PERSISTENCE_DATABASE_PATH: str | None = Field(
+        default=None,
+        description="SQLite persistence database, next to the persistence file if unset",
+    )
+    PERSISTENCE_UPDATE_INTERVAL: float = Field(
+        default=60.0, description="Seconds between writes of changed bot state"
+    )
+
+    # Metrics Settings
+    METRICS_ENABLED: bool = Field(
+        default=True, description="Serve Prometheus metrics over HTTP"
+    )
+    METRICS_HOST: str = Field(
+        default="127.0.0.1", description="Interface the metrics endpoint binds to"
+    )
+    METRICS_PORT: int = Field(default=9108, description="Port of the metrics endpoint")
+    HEALTH_CHECK_ENABLED: bool = Field(
+        default=True,
+        description="Serve /healthz on the metrics port, also with metrics disabled",
+    )
+
     # API Settings
     API_BASE_URL: str = Field(
         ...,
         description="Base URL for API endpoints",
     )
     API_KEY: str = Field(..., description="API authentication key")
+    API_MAX_CONNECTIONS: int = Field(
+        default=100, description="Maximum concurrent connections to the API"
+    )
+    API_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20, description="Maximum idle keep-alive connections to the API"
+    )
+    API_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0, description="Idle keep-alive connection expiry in seconds"
+    )
+    API_CONNECT_TIMEOUT: float = Field(
+        default=5.0, description="Connect timeout for API requests in seconds"
+    )
+    API_POOL_TIMEOUT: float = Field(
+        default=10.0,
+        description="Timeout waiting for a free pooled connection in seconds",
+    )
+    API_READ_TIMEOUT: float = Field(
+        default=15.0, description="Read timeout for the per-symbol endpoints"
+    )
+    API_ANALYSIS_READ_TIMEOUT: float = Field(
+        default=90.0, description="Read timeout for the analysis endpoint"
+    )
+    API_PLOT_READ_TIMEOUT: float = Field(
+        default=20.0, description="Read timeout for the plot image endpoint"
+    )
+
+    # Resilience Settings
+    API_MAX_RETRIES: int = Field(
+        default=2, description="Retries for transient API failures"
+    )
+    API_RETRY_BACKOFF_BASE: float = Field(
+        default=0.5, description="Base delay of the jittered exponential backoff"
+    )
+    API_RETRY_BACKOFF_MAX: float = Field(
+        default=5.0, description="Maximum delay between two retries in seconds"
+    )
+    CRYPTO_DEADLINE: float = Field(
+        default=120.0, description="Total time budget of a crypto mode request"
+    )
+    CONFIDENCE_DEADLINE: float = Field(
+        default=20.0, description="Total time budget of a confidence mode request"
+    )
+    TECHNICAL_DEADLINE: float = Field(
+        default=20.0, description="Total time budget of a technical mode request"
+    )
+    CRYPTO_INFO_DEADLINE: float = Field(
+        default=30.0, description="Total time budget of a crypto info mode request"
+    )
+    PRICE_DEADLINE: float = Field(
+        default=10.0, description="Total time budget of a price mode request"
+    )
+    WALLET_DEADLINE: float = Field(
+        default=30.0, description="Total time budget of a wallet address request"
+    )
+    BREAKER_FAILURE_THRESHOLD: int = Field(
+        default=5, description="Consecutive failures that open an endpoint circuit"
+    )
+    BREAKER_RESET_TIMEOUT: float = Field(
+        default=30.0, description="Seconds an open circuit waits before probing"
+    )
+    BREAKER_HALF_OPEN_MAX_CALLS: int = Field(
+        default=1, description="Concurrent probe requests while half-open"
+    )
+
+    # Query Settings
+    MAX_SYMBOLS_PER_MESSAGE: int = Field(
+        default=10, description="Maximum symbols looked up from a single message"
+    )
+    SYMBOL_LOOKUP_CONCURRENCY: int = Field(
+        default=5, description="Maximum concurrent backend lookups per message"
+    )
+
+    # Price Alert Settings
+    ALERT_CHECK_INTERVAL: float = Field(
+        default=60.0, description="Seconds between two checks of the price alerts"
+    )
+    ALERTS_MAX_PER_CHAT: int = Field(
+        default=20, description="Maximum price alerts and watches of one chat"
+    )
+    WATCH_MOVE_PERCENT: float = Field(
+        default=5.0,
+        gt=0,
+        lt=100,
+        description="Price move in percent notified by /watch",
+    )
+
+    # Symbol Index Settings
+    SYMBOL_VALIDATION: bool = Field(
+        default=True, description="Reject unknown coins before calling the backend"
+    )
+    COIN_LIST_URL: str = Field(
+        default="",
+        description="Coin list with id, symbol and name of every coin, like "
+        "https://api.coingecko.com/api/v3/coins/list, downloaded when the "
+        "snapshot is stale. Unset to only use a provided snapshot",
+    )
+    COIN_LIST_PATH: str | None = Field(
+        default=None,
+        description="Coin list snapshot, next to the persistence file if unset",
+    )
+    COIN_LIST_REFRESH_INTERVAL: float = Field(
+        default=24 * 3600,
+        description="Maximum age of the coin list snapshot in seconds",
+    )
+
+    # Response Cache Settings
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(
+        default=2048, description="Maximum cached per-symbol API responses"
+    )
+    PRICE_CACHE_TTL: float = Field(
+        default=30.0, description="Price info cache TTL in seconds, 0 disables it"
+    )
+    CONFIDENCE_CACHE_TTL: float = Field(
+        default=300.0, description="Confidence score cache TTL in seconds"
+    )
+    TECHNICAL_CACHE_TTL: float = Field(
+        default=300.0, description="Technical analysis cache TTL in seconds"
+    )
+    COIN_INFO_CACHE_TTL: float = Field(
+        default=3600.0, description="Coin info cache TTL in seconds"
+    )
+    WALLET_CACHE_MAX_ENTRIES: int = Field(
+        default=1024, description="Maximum cached wallet address analyses"
+    )
+    WALLET_CACHE_TTL: float = Field(
+        default=600.0, description="Wallet address analysis cache TTL in seconds"
+    )
+
+    # Cache Warming Settings
+    POPULARITY_CAPACITY: int = Field(
+        default=256, ge=1, description="Symbols tracked per endpoint for popularity"
+    )
+    POPULARITY_HALF_LIFE: float = Field(
+        default=3600.0, description="Seconds after which a request counts half"
+    )
+    CACHE_WARM_TOP_N: int = Field(
+        default=20, description="Most popular symbols kept cached, 0 disables it"
+    )
+    CACHE_WARM_MIN_SCORE: float = Field(
+        default=3.0, description="Decayed request count needed to be kept cached"
+    )
+    CACHE_WARM_INTERVAL: float = Field(
+        default=10.0, description="Seconds between two cache warming runs"
+    )
+    CACHE_WARM_LEAD_TIME: float = Field(
+        default=15.0, description="Refresh entries expiring within this many seconds"
+    )
+
+    # Inline Query Settings
+    INLINE_CACHE_TIME: int = Field(
+        default=30, description="Seconds Telegram and the bot cache inline answers"
+    )
+    INLINE_CACHE_MAX_ENTRIES: int = Field(
+        default=1024, description="Maximum cached inline query answers"
+    )
+    INLINE_DEBOUNCE: float = Field(
+        default=0.4, description="Typing pause before an inline query calls the API"
+    )
+    INLINE_DEADLINE: float = Field(
+        default=5.0, description="Time budget for answering an inline query"
+    )
+    INLINE_MAX_COINS: int = Field(
+        default=3, description="Coins shown for an inline query matching several"
+    )
+
+    # Group Dedupe Settings
+    GROUP_DEDUPE_WINDOW: float = Field(
+        default=60.0,
+        description="Seconds a repeated group query links to the earlier answer, "
+        "0 disables",
+    )
+    GROUP_DEDUPE_MODES: list[Modes] = Field(
+        default=[Modes.PRICE, Modes.TECHNICAL, Modes.CONFIDENCE, Modes.CRYPTO_INFO],
+        description="Modes whose group answers are deduplicated",
+    )
+    GROUP_DEDUPE_MAX_ENTRIES: int = Field(
+        default=4096, description="Maximum group answers remembered for dedupe"
+    )
+
+    # Streaming Settings
+    ANALYSIS_STREAMING: bool = Field(
+        default=False, description="Stream crypto mode answers as they generate"
+    )
+    STREAM_EDIT_INTERVAL: float = Field(
+        default=1.5, description="Minimum seconds between edits of a streamed answer"
+    )
+
+    # Admission Settings
+    ADMISSION_LIMITS: dict[Modes, tuple[float, float]] = Field(
+        default={
+            Modes.CRYPTO: (6, 3),
+            Modes.CONFIDENCE: (30, 10),
+            Modes.TECHNICAL: (30, 10),
+            Modes.CRYPTO_INFO: (20, 5),
+            Modes.PRICE: (60, 20),
+        },
+        description="Requests per minute and burst per user for each mode, "
+        "a rate of 0 disables the limit",
+    )
+    ADMISSION_CHAT_MULTIPLIER: float = Field(
+        default=3, description="Group chat limits as a multiple of the user limits"
+    )
+    ADMISSION_MAX_IN_FLIGHT: int = Field(
+        default=32, description="Requests of expensive modes processed at once"
+    )
+    ADMISSION_EXPENSIVE_MODES: list[Modes] = Field(
+        default=[Modes.CRYPTO, Modes.CRYPTO_INFO],
+        description="Modes counted against ADMISSION_MAX_IN_FLIGHT",
+    )
+
+    # Plot Settings
+    PLOT_FETCH_CONCURRENCY: int = Field(
+        default=4, description="Maximum plot images downloaded at once per query"
+    )
+    PLOT_FETCH_TIMEOUT: float = Field(
+        default=15.0, description="Deadline for a single plot image in seconds"
+    )
+    PLOT_CACHE_DIR: str | None = Field(
+        default=None,
+        description="Plot image cache directory, next to the persistence file if unset",
+    )
+    PLOT_CACHE_MAX_BYTES: int = Field(
+        default=256 * 1024 * 1024,
+        description="Disk budget for cached plot images in bytes, 0 disables it",
+    )
+
+    @model_validator(mode="after")
+    def check_webhook(self) -> "Settings":
+        if self.UPDATE_MODE == "webhook" and not self.WEBHOOK_URL:
+            raise ValueError("WEBHOOK_URL is required when UPDATE_MODE is webhook")
+        return self
+
+    @model_validator(mode="after")
+    def check_state_store(self) -> "Settings":
+        if self.WORKER_PROCESSES > 1 and self.STATE_STORE == "memory":
+            raise ValueError("The memory state store can not be shared by workers")
+        return self
+
+    @property
+    def plot_cache_dir(self) -> Path:
+        if self.PLOT_CACHE_DIR:
+            return Path(self.PLOT_CACHE_DIR)
+        return Path(self.BOT_PERCISTANCE_FILE_PATH).parent / "plot_cache"
+
+    @property
+    def state_store_path(self) -> Path:
+        if self.STATE_STORE_PATH:
+            return Path(self.STATE_STORE_PATH)
+        return Path(self.BOT_PERCISTANCE_FILE_PATH).parent / "state.sqlite3"
+
+    @property
+    def coin_list_path(self) -> Path:
+        if self.COIN_LIST_PATH:
+            return Path(self.COIN_LIST_PATH)
+        return Path(self.BOT_PERCISTANCE_FILE_PATH).parent / "coin_list.json"
+
+    @property
+    def persistence_database_path(self) -> Path:
+        if self.PERSISTENCE_DATABASE_PATH:
+            return Path(self.PERSISTENCE_DATABASE_PATH)
+        return Path(self.BOT_PERCISTANCE_FILE_PATH).with_suffix(".sqlite3")
 
 
 settings = Settings()
@@ -1,3 +1,4 @@
 """The constants for the nostradamus application"""
 
 BUY_AMEN_LINK: str = "https://www.coingecko.com/en/coins/project-nostradamus"
+NOSTRADAMUS_LINK: str = "https://www.projectnostradamus.com/"
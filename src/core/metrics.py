@@ -0,0 +1,242 @@
+"""Metrics exported by the nostradamus application"""
+
+import functools
+import heapq
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, TypeVar
+
+from src.utils.metrics import Counter, Gauge, Histogram
+
+if TYPE_CHECKING:
+    from src.services.admission import AdmissionController
+    from src.services.alerts import PriceAlerts
+    from src.services.api_service import AnalysisAPIService
+    from src.services.plot_cache import PlotCache
+    from src.services.rate_limiter import PriorityRateLimiter
+    from src.services.update_processor import ChatOrderedUpdateProcessor
+
+HandlerT = TypeVar("HandlerT", bound=Callable[..., Awaitable])
+
+# Only the deepest chat queues get their own series, to bound label cardinality
+TOP_CHAT_QUEUES = 10
+
+HANDLER_LATENCY = Histogram(
+    "bot_handler_latency_seconds", "Time spent in update handlers", ("handler",)
+)
+HANDLER_IN_FLIGHT = Gauge(
+    "bot_handler_in_flight", "Update handlers currently running", ("handler",)
+)
+HANDLER_ERRORS = Counter(
+    "bot_handler_errors_total", "Update handlers that raised", ("handler",)
+)
+
+BACKEND_LATENCY = Histogram(
+    "bot_backend_latency_seconds",
+    "Latency of single analysis backend requests",
+    ("endpoint",),
+)
+BACKEND_IN_FLIGHT = Gauge(
+    "bot_backend_in_flight", "Analysis backend requests in flight", ("endpoint",)
+)
+BACKEND_ERRORS = Counter(
+    "bot_backend_errors_total",
+    "Failed analysis backend requests by kind",
+    ("endpoint", "kind"),
+)
+BACKEND_RETRIES = Counter(
+    "bot_backend_retries_total", "Retried analysis backend requests", ("endpoint",)
+)
+
+TELEGRAM_LATENCY = Histogram(
+    "bot_telegram_request_latency_seconds",
+    "Latency of Telegram Bot API calls",
+    ("method",),
+)
+TELEGRAM_ERRORS = Counter(
+    "bot_telegram_errors_total", "Failed Telegram Bot API calls", ("method",)
+)
+TELEGRAM_RATE_LIMITED = Counter(
+    "bot_telegram_rate_limited_total",
+    "Telegram Bot API calls delayed by the chat or group rate limit",
+    ("method",),
+)
+TELEGRAM_DROPPED = Counter(
+    "bot_telegram_dropped_total",
+    "Low priority Telegram Bot API calls dropped under rate limiting",
+    ("method",),
+)
+
+CACHE_WARMED = Counter(
+    "bot_cache_warmed_total",
+    "Responses of popular symbols refreshed ahead of expiry",
+    ("endpoint",),
+)
+ALERTS_SENT = Counter(
+    "bot_alerts_sent_total", "Price alert and watch notifications sent", ("kind",)
+)
+GROUP_DEDUPED = Counter(
+    "bot_group_deduped_total",
+    "Repeated group queries answered with a link to the earlier answer",
+    ("mode",),
+)
+
+DISPATCHED_UPDATES = Counter(
+    "bot_dispatched_updates_total", "Updates forwarded to each worker", ("worker",)
+)
+
+
+def track_handler(func: HandlerT) -> HandlerT:
+    """Record latency, concurrency and errors of an async update handler."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        HANDLER_IN_FLIGHT.inc(handler=name)
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            HANDLER_ERRORS.inc(handler=name)
+            raise
+        finally:
+            HANDLER_LATENCY.observe(time.perf_counter() - start, handler=name)
+            HANDLER_IN_FLIGHT.dec(handler=name)
+
+    return wrapper
+
+
+def register_service_metrics(
+    api_service: "AnalysisAPIService", plot_cache: "PlotCache"
+) -> None:
+    """Expose counters kept by the services, read when metrics are scraped."""
+
+    def cache_counters() -> dict[tuple[str, str], float]:
+        values = {}
+        for cache, stats in (
+            ("response", api_service.response_cache.stats()),
+            ("wallet", api_service.wallet_cache.stats()),
+            ("plot", plot_cache.stats()),
+        ):
+            values[(cache, "hit")] = stats["hits"]
+            values[(cache, "miss")] = stats["misses"]
+        return values
+
+    Counter(
+        "bot_cache_requests_total",
+        "Cache lookups by cache and result",
+        ("cache", "result"),
+        callback=cache_counters,
+    )
+    Gauge(
+        "bot_cache_entries",
+        "Entries held per cache",
+        ("cache",),
+        callback=lambda: {
+            ("response",): len(api_service.response_cache),
+            ("wallet",): len(api_service.wallet_cache),
+            ("plot",): plot_cache.stats()["entries"],
+        },
+    )
+    Gauge(
+        "bot_plot_cache_bytes",
+        "Bytes held by the plot image cache",
+        callback=lambda: {(): plot_cache.total_bytes},
+    )
+    Counter(
+        "bot_backend_coalesced_total",
+        "Backend requests saved by request coalescing",
+        callback=lambda: {(): api_service.single_flight.coalesced},
+    )
+    Gauge(
+        "bot_backend_circuit_open",
+        "Circuit breaker state per endpoint, 0 closed, 0.5 half-open, 1 open",
+        ("endpoint",),
+        callback=lambda: {
+            (endpoint,): {"closed": 0, "half_open": 0.5, "open": 1}[state["state"]]
+            for endpoint, state in api_service.breaker_states().items()
+        },
+    )
+    Counter(
+        "bot_backend_circuit_rejected_total",
+        "Requests rejected by an open circuit breaker",
+        ("endpoint",),
+        callback=lambda: {
+            (endpoint,): state["rejected"]
+            for endpoint, state in api_service.breaker_states().items()
+        },
+    )
+
+
+def register_update_metrics(processor: "ChatOrderedUpdateProcessor") -> None:
+    """Expose the state of the per-chat update queues."""
+
+    def queue_depths() -> dict[tuple[str], float]:
+        depths = processor.queue_depths().values()
+        return {
+            ("chats",): len(depths),
+            ("updates",): sum(depths),
+            ("max_chat_depth",): max(depths, default=0),
+            ("running",): processor.running,
+        }
+
+    Gauge(
+        "bot_update_queue",
+        "Chats with pending updates, pending updates, the deepest chat queue "
+        "and updates being processed",
+        ("stat",),
+        callback=queue_depths,
+    )
+
+    def deepest_chats() -> dict[tuple[str], float]:
+        depths = processor.queue_depths()
+        return {
+            (str(chat),): depths[chat]
+            for chat in heapq.nlargest(TOP_CHAT_QUEUES, depths, key=depths.get)
+        }
+
+    Gauge(
+        "bot_update_queue_chat_depth",
+        f"Pending updates of the {TOP_CHAT_QUEUES} chats with the deepest queues",
+        ("chat",),
+        callback=deepest_chats,
+    )
+
+
+def register_rate_limiter_metrics(rate_limiter: "PriorityRateLimiter") -> None:
+    """Expose the backlog of Bot API calls waiting for the global limit."""
+    Gauge(
+        "bot_telegram_queue_depth",
+        "Telegram Bot API calls waiting for the global rate limit",
+        callback=lambda: {(): rate_limiter.queue_depth},
+    )
+
+
+def register_admission_metrics(admission: "AdmissionController") -> None:
+    """Expose admitted load and the requests shed by admission control."""
+    Gauge(
+        "bot_admission_in_flight",
+        "Requests of expensive modes being processed",
+        callback=lambda: {(): admission.in_flight},
+    )
+    Counter(
+        "bot_admission_rejected_total",
+        "Requests rejected by admission control by mode and reason",
+        ("mode", "reason"),
+        callback=lambda: {
+            (mode.value, reason): count
+            for (mode, reason), count in admission.rejected.items()
+        },
+    )
+
+
+def register_alert_metrics(alerts: "PriceAlerts") -> None:
+    """Expose the number of price alerts and of symbols polled for them."""
+    Gauge(
+        "bot_alerts",
+        "Price alerts and watches, and the distinct symbols they need",
+        ("stat",),
+        callback=lambda: {
+            ("alerts",): len(alerts.book),
+            ("symbols",): len(alerts.book.symbols()),
+        },
+    )
@@ -0,0 +1,164 @@
+"""Static bot replies, rendered to MarkdownV2 once and reused"""
+
+from functools import lru_cache
+
+from telegram.helpers import escape_markdown
+
+from src.models.modes import Modes
+from src.utils.string_formatters import markdownify
+
+# Plain alphanumeric token that passes through markdownify unchanged, replaced
+# with the escaped user name at send time
+FIRST_NAME_PLACEHOLDER = "XFIRSTNAMEPLACEHOLDERX"
+
+
+@lru_cache
+def _start_text(private: bool) -> str:
+    if private:
+        return markdownify(
+            f"👋 Welcome {FIRST_NAME_PLACEHOLDER}!\n\n"
+            "I'm your AI-powered crypto trading assistant. Here's what I can do:\n\n"
+            "🤖 *AI & Analysis*\n"
+            "• /crypto - Get AI-powered crypto analysis\n"
+            "• /technical - Get technical analysis\n"
+            "• /crypto_info - Get detailed coin information\n"
+            "• /confidence - Get AI confidence score\n"
+            "• /nostradamus - Learn about Nostradamus\n"
+            "• /price - Get recent price information\n"
+            "\n💡 *Utilities*\n"
+            "• /mode - Check current mode\n"
+            "• /stop_mode - Stop current mode\n\n"
+            "Type /help to see all commands!"
+        )
+    return markdownify(
+        "👋 Hi everyone!\n\n"
+        "I'm a crypto trading bot with AI capabilities.\n"
+        "Use /help to see what I can do!"
+    )
+
+
+def start_text(private: bool, first_name: str) -> str:
+    """The /start reply with the user's first name filled in."""
+    return _start_text(private).replace(
+        FIRST_NAME_PLACEHOLDER, escape_markdown(first_name, version=2)
+    )
+
+
+@lru_cache
+def help_text(private: bool) -> str:
+    if private:
+        return markdownify(
+            "🚀 *Available Commands* 📚\n\n"
+            "*Basic Commands*\n"
+            "• /start - Start the bot\n"
+            "• /help - Show this help message\n"
+            "• /about - About this bot\n"
+            "• /nostradamus - Learn about Nostradamus\n\n"
+            "*AI & Analysis*\n"
+            "• /crypto - Get AI-powered crypto analysis\n"
+            "• /technical - Get technical analysis\n"
+            "• /crypto_info - Get detailed coin information\n"
+            "• /confidence - Get AI confidence score\n"
+            "• /price - Get recent price information\n"
+            "\n*Alerts*\n"
+            "• /watch - Watch coins for price moves\n"
+            "• /unwatch - Stop watching coins\n"
+            "• /alert - Set a price alert, e.g. /alert BTC >100000\n"
+            "\n*Utility Commands*\n"
+            "• /mode - Check current mode\n"
+            "• /stop_mode - Stop current mode\n\n"
+            "_Use the buttons below for quick access:_"
+        )
+    return markdownify(
+        "👋 *Available Commands*\n\n"
+        "*Basic Commands*\n"
+        "• /start - Start the bot\n"
+        "• /help - Show this help message\n"
+        "• /about - About this bot\n"
+        "• /nostradamus - About Nostradamus\n\n"
+        "*Analysis Commands*\n"
+        "• /crypto - AI-powered crypto analysis\n"
+        "• /technical - Technical analysis\n"
+        "• /confidence - AI confidence score\n"
+        "• /crypto_info - Get coin information\n"
+        "• /price - Get recent price information\n"
+        "\n*Alerts*\n"
+        "• /watch - Watch coins for price moves\n"
+        "• /unwatch - Stop watching coins\n"
+        "• /alert - Set a price alert\n"
+        "\n*Utility Commands*\n"
+        "• /mode - Check current mode\n"
+        "• /stop_mode - Stop current mode\n\n"
+    )
+
+
+@lru_cache
+def about_text() -> str:
+    return markdownify(
+        "🤖 *Crypto Trading Bot*\n\n"
+        "This bot helps you trade cryptocurrencies using advanced AI predictions "
+        "and market analysis\\.\n\n"
+        "*Features*:\n"
+        "• AI\\-powered trading signals\n"
+        "• Real\\-time market data\n\n"
+        "*Version*: v1\\.0\\.0\n"
+        "*Website*: [Visit Here](https://www.projectnostradamus.com/)\n"
+        "*Coin*: [check this out](https://www.coingecko.com/en/coins/project-nostradamus)\n\n"
+        "*Disclaimer*: Trading cryptocurrencies involves substantial risk\\. "
+        "Always do your own research before making investment decisions\\."
+    )
+
+
+@lru_cache
+def nostradamus_text() -> str:
+    return markdownify(
+        "🤖 *Nostradamus*\n\n"
+        "Nostradamus is an AI-powered trading agent that provides actionable insights, "
+        "real-time chart evaluations, and data-driven recommendations "
+        "for smarter trading.\n\n"
+        "It leverages advanced machine learning and market data to analyze trends, "
+        "identify patterns, and helps traders stay ahead with informed decisions.\n"
+        "Trade with confidence."
+    )
+
+
+@lru_cache
+def mode_activated_text(mode: Modes, example: str | None) -> str:
+    message = (
+        f"💬 {mode.value} Mode enabled. type further queries\n\nExample: *{example}*\n"
+        if example
+        else ""
+    ) + "\nEnter /stop_mode to switch to normal mode"
+    return markdownify(message)
+
+
+@lru_cache
+def mode_status_text(mode: Modes | None) -> str:
+    if not mode:
+        message = "No mode has been activated"
+    else:
+        message = f"You are in *{mode.value} mode*"
+    message += "\n\nType /help to see all commands!"
+    return markdownify(message)
+
+
+@lru_cache
+def mode_removed_text(mode: Modes | None) -> str:
+    if mode is None:
+        message = "No mode has been activated."
+    else:
+        message = f"✅ *{mode.value} Mode* removed. You can now chat normally."
+    message += "\n\n/help to get all of available commands"
+    return markdownify(message)
+
+
+def warm_up() -> None:
+    """Render every static reply ahead of the first request."""
+    for private in (True, False):
+        _start_text(private)
+        help_text(private)
+    about_text()
+    nostradamus_text()
+    for mode in (None, *Modes):
+        mode_status_text(mode)
+        mode_removed_text(mode)
@@ -0,0 +1,121 @@
+"""Front process of a sharded deployment.
+
+The dispatcher receives updates by polling or webhook and forwards each one to
+a worker process picked by chat id, so all updates of a chat are handled by the
+same worker in the order they arrived. Workers share user state through the
+state store and one persistence database, which the dispatcher sets up before
+starting them.
+"""
+
+import asyncio
+import multiprocessing
+import signal
+from multiprocessing.queues import Queue
+
+from telegram import Bot, Update
+from telegram.ext import ExtBot, Updater
+
+from src.bot import (
+    CryptoAnalysisBot,
+    build_metrics_server,
+    build_persistence,
+    webhook_options,
+)
+from src.core.cofig import settings
+from src.core.metrics import DISPATCHED_UPDATES
+from src.services.update_processor import update_chat_key
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def shard_key(update: Update) -> int:
+    """Chat of the update, or its user for updates outside of a chat."""
+    return update_chat_key(update) or 0
+
+
+def run_worker(index: int, updates: Queue) -> None:
+    # Workers are stopped by the dispatcher through their queue, after it has
+    # forwarded every update it received
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(CryptoAnalysisBot(worker_index=index).serve(updates))
+
+
+class ShardDispatcher:
+    def __init__(self, workers: int):
+        context = multiprocessing.get_context("spawn")
+        self.queues: list[Queue] = [context.Queue() for _ in range(workers)]
+        self.processes = [
+            context.Process(
+                target=run_worker, args=(index, queue), name=f"worker-{index}"
+            )
+            for index, queue in enumerate(self.queues)
+        ]
+        self.metrics_server = build_metrics_server(settings.METRICS_PORT, self._healthy)
+        self.updater: Updater | None = None
+
+    def route(self, update: Update) -> int:
+        return shard_key(update) % len(self.queues)
+
+    def run(self) -> None:
+        asyncio.run(self._prepare_persistence())
+        for process in self.processes:
+            process.start()
+        try:
+            asyncio.run(self._dispatch())
+        finally:
+            for queue in self.queues:
+                queue.put(None)
+            for process in self.processes:
+                process.join()
+            logger.info("All workers stopped")
+
+    @staticmethod
+    async def _prepare_persistence() -> None:
+        """Create the database and migrate old data once, not in every worker."""
+        persistence = build_persistence()
+        persistence.set_bot(ExtBot(settings.TELEGRAM_BOT_TOKEN))
+        await persistence.prepare()
+
+    def _healthy(self) -> bool:
+        return (
+            self.updater is not None
+            and self.updater.running
+            and all(process.is_alive() for process in self.processes)
+        )
+
+    def _forward(self, update: Update) -> None:
+        worker = self.route(update)
+        self.queues[worker].put(update.to_json())
+        DISPATCHED_UPDATES.inc(worker=str(worker))
+
+    async def _forward_all(self, updates: asyncio.Queue) -> None:
+        while True:
+            self._forward(await updates.get())
+
+    async def _dispatch(self) -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+
+        updates: asyncio.Queue = asyncio.Queue()
+        self.updater = Updater(Bot(settings.TELEGRAM_BOT_TOKEN), updates)
+        if self.metrics_server:
+            await self.metrics_server.start()
+        forwarder = asyncio.create_task(self._forward_all(updates))
+        try:
+            async with self.updater:
+                if settings.UPDATE_MODE == "webhook":
+                    await self.updater.start_webhook(**webhook_options())
+                else:
+                    await self.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+                logger.info("Dispatching updates to %d workers", len(self.queues))
+                await stop.wait()
+                await self.updater.stop()
+        finally:
+            forwarder.cancel()
+            while not updates.empty():
+                self._forward(updates.get_nowait())
+            if self.metrics_server:
+                await self.metrics_server.stop()
@@ -1,23 +1,45 @@
+import re
 from functools import partial
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram import Update
 from telegram.constants import ChatType, ParseMode
 from telegram.ext import Application, CommandHandler, ContextTypes
 
+from src.core import replies
+from src.core.cofig import settings
+from src.core.metrics import register_alert_metrics, track_handler
 from src.handlers.message_handler import message_handler
 from src.keyboard.inline_keyboard import (
     command_inline_coin_keyboard,
     get_inline_coin_keyboard,
+    help_keyboard,
+    nostradamus_keyboard,
+    start_keyboard,
 )
 from src.models.commands import Commands
 from src.models.modes import Modes
+from src.services.alerts import Alert, PriceAlerts
+from src.services.state_store import user_modes
 from src.utils.logger import get_logger
 from src.utils.string_formatters import markdownify
+from src.utils.symbols import normalize_symbol, split_symbols
 
 logger = get_logger(__name__)
 
 
+ALERT_PATTERN = re.compile(r"(\S+)\s*([<>])\s*\$?(\d[\d,]*(?:\.\d+)?)")
+
+
 class CommandManager:
+    def __init__(self):
+        # Polling for alerts is no user demand, so it doesn't make coins popular
+        self.alerts = PriceAlerts(
+            partial(message_handler.api_service.get_price_info, track=False),
+            max_per_chat=settings.ALERTS_MAX_PER_CHAT,
+            concurrency=settings.SYMBOL_LOOKUP_CONCURRENCY,
+        )
+        register_alert_metrics(self.alerts)
+
     def set_handlers(self, application: Application):
         # Basic
         application.add_handler(
@@ -41,6 +63,17 @@ class CommandManager:
             CommandHandler(Commands.STOP_MODE.value, self.remove_mode)
         )
 
+        # Alerts
+        application.add_handler(
+            CommandHandler(Commands.WATCH.value, self.watch_command)
+        )
+        application.add_handler(
+            CommandHandler(Commands.UNWATCH.value, self.unwatch_command)
+        )
+        application.add_handler(
+            CommandHandler(Commands.ALERT.value, self.alert_command)
+        )
+
         # Modes
         application.add_handler(
             CommandHandler(
@@ -83,6 +116,7 @@ class CommandManager:
 
     # -----------------------Commands-------------------------------
 
+    @track_handler
     async def _start_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -93,62 +127,13 @@ class CommandManager:
         """
         try:
             user = update.effective_user
-            chat_type = update.effective_chat.type
+            private = update.effective_chat.type == ChatType.PRIVATE
 
             # Different welcome messages for private chats and groups
-            if chat_type == ChatType.PRIVATE:
-                welcome_text = (
-                    f"👋 Welcome {user.first_name}!\n\n"
-                    "I'm your AI-powered crypto trading assistant. Here's what I can do:\n\n"
-                    "🤖 *AI & Analysis*\n"
-                    "• /crypto - Get AI-powered crypto analysis\n"
-                    "• /technical - Get technical analysis\n"
-                    "• /crypto_info - Get detailed coin information\n"
-                    "• /confidence - Get AI confidence score\n"
-                    "• /nostradamus - Learn about Nostradamus\n"
-                    "• /price - Get recent price information\n"
-                    "\n💡 *Utilities*\n"
-                    "• /mode - Check current mode\n"
-                    "• /stop_mode - Stop current mode\n\n"
-                    "Type /help to see all commands!"
-                )
-                keyboard = [
-                    [
-                        InlineKeyboardButton(
-                            "🤖 Start Analysis", callback_data="crypto"
-                        ),
-                    ],
-                    [
-                        InlineKeyboardButton(
-                            "🌐 Nostradamus",
-                            url="https://www.projectnostradamus.com/",
-                        ),
-                        InlineKeyboardButton(
-                            "💬 Add to Group",
-                            url=f"https://t.me/{context.bot.username}?startgroup=true",
-                        ),
-                    ],
-                ]
-            else:
-                welcome_text = (
-                    "👋 Hi everyone!\n\n"
-                    "I'm a crypto trading bot with AI capabilities.\n"
-                    "Use /help to see what I can do!"
-                )
-                keyboard = [
-                    [
-                        InlineKeyboardButton(
-                            "🌐 Nostradamus",
-                            url="https://www.projectnostradamus.com/",
-                        ),
-                    ],
-                ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
             await update.message.reply_text(
-                markdownify(welcome_text),
+                replies.start_text(private, user.first_name),
                 parse_mode=ParseMode.MARKDOWN_V2,
-                reply_markup=reply_markup,
+                reply_markup=start_keyboard(private, context.bot.username),
             )
 
         except Exception as e:
@@ -158,6 +143,7 @@ class CommandManager:
                 parse_mode=ParseMode.MARKDOWN,
             )
 
+    @track_handler
     async def _help_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -166,63 +152,15 @@ class CommandManager:
         Command: /help
         Description: Displays a list of available commands based on chat type.
         """
-        chat_type = update.effective_chat.type
-
-        if chat_type == ChatType.PRIVATE:
-            help_text = (
-                "🚀 *Available Commands* 📚\n\n"
-                "*Basic Commands*\n"
-                "• /start - Start the bot\n"
-                "• /help - Show this help message\n"
-                "• /about - About this bot\n"
-                "• /nostradamus - Learn about Nostradamus\n\n"
-                "*AI & Analysis*\n"
-                "• /crypto - Get AI-powered crypto analysis\n"
-                "• /technical - Get technical analysis\n"
-                "• /crypto_info - Get detailed coin information\n"
-                "• /confidence - Get AI confidence score\n"
-                "• /price - Get recent price information\n"
-                "\n*Utility Commands*\n"
-                "• /mode - Check current mode\n"
-                "• /stop_mode - Stop current mode\n\n"
-                "_Use the buttons below for quick access:_"
-            )
-            keyboard = [
-                [
-                    InlineKeyboardButton("🤖 Start Analysis", callback_data="crypto"),
-                    InlineKeyboardButton(
-                        "🌐 Nostradamus", url="https://www.projectnostradamus.com/"
-                    ),
-                ],
-            ]
-        else:
-            help_text = (
-                "👋 *Available Commands*\n\n"
-                "*Basic Commands*\n"
-                "• /start - Start the bot\n"
-                "• /help - Show this help message\n"
-                "• /about - About this bot\n"
-                "• /nostradamus - About Nostradamus\n\n"
-                "*Analysis Commands*\n"
-                "• /crypto - AI-powered crypto analysis\n"
-                "• /technical - Technical analysis\n"
-                "• /confidence - AI confidence score\n"
-                "• /crypto_info - Get coin information\n"
-                "• /price - Get recent price information\n"
-                "\n*Utility Commands*\n"
-                "• /mode - Check current mode\n"
-                "• /stop_mode - Stop current mode\n\n"
-            )
-            keyboard = [[]]
-
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        private = update.effective_chat.type == ChatType.PRIVATE
 
         await update.message.reply_text(
-            text=markdownify(help_text),
+            text=replies.help_text(private),
             parse_mode=ParseMode.MARKDOWN_V2,
-            reply_markup=reply_markup,
+            reply_markup=help_keyboard(private),
         )
 
+    @track_handler
     async def about_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -231,64 +169,203 @@ class CommandManager:
         Command: /about
         Description: Displays information about the bot's features and capabilities.
         """
-        about_text = (
-            "🤖 *Crypto Trading Bot*\n\n"
-            "This bot helps you trade cryptocurrencies using advanced AI predictions "
-            "and market analysis\\.\n\n"
-            "*Features*:\n"
-            "• AI\\-powered trading signals\n"
-            "• Real\\-time market data\n\n"
-            "*Version*: v1\\.0\\.0\n"
-            "*Website*: [Visit Here](https://www.projectnostradamus.com/)\n"
-            "*Coin*: [check this out](https://www.coingecko.com/en/coins/project-nostradamus)\n\n"
-            "*Disclaimer*: Trading cryptocurrencies involves substantial risk\\. "
-            "Always do your own research before making investment decisions\\."
-        )
-
-        keyboard = [
-            [
-                InlineKeyboardButton(
-                    "🌐 Nostradamus", url="https://www.projectnostradamus.com/"
-                ),
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await update.effective_message.reply_text(
-            text=markdownify(about_text),
+            text=replies.about_text(),
             parse_mode=ParseMode.MARKDOWN_V2,
-            reply_markup=reply_markup,
+            reply_markup=nostradamus_keyboard(),
         )
 
+    @track_handler
     async def noustradamus(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Nostradamus command - displays information about Nostradamus."""
-        text = (
-            "🤖 *Nostradamus*\n\n"
-            "Nostradamus is an AI-powered trading agent that provides actionable insights, "
-            "real-time chart evaluations, and data-driven recommendations "
-            "for smarter trading.\n\n"
-            "It leverages advanced machine learning and market data to analyze trends, "
-            "identify patterns, and helps traders stay ahead with informed decisions.\n"
-            "Trade with confidence."
+        await update.message.reply_text(
+            replies.nostradamus_text(),
+            parse_mode=ParseMode.MARKDOWN_V2,
+            reply_markup=nostradamus_keyboard(),
+        )
+
+    # -----------------------Alerts-------------------------------
+
+    @track_handler
+    async def watch_command(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Watch coins for price moves.
+
+        Command: /watch [SYMBOL ...]
+        Description: Notifies the chat whenever a coin moves by WATCH_MOVE_PERCENT
+        from the last notified price. Lists the watched coins without symbols.
+        """
+        symbols = split_symbols(
+            " ".join(context.args), limit=settings.MAX_SYMBOLS_PER_MESSAGE
         )
-        keyboard = [
-            [
-                InlineKeyboardButton(
-                    "🌐 Nostradamus", url="https://www.projectnostradamus.com/"
+        alerts = self.alerts.chat_alerts(context.chat_data)
+        watched = {alert.symbol for alert in alerts if alert.watch_percent}
+        if not symbols:
+            if not watched:
+                text = "👀 No coins are watched. Use /watch BTC to start."
+            else:
+                text = "👀 Watching " + ", ".join(sorted(watched))
+            await self._reply(update, text)
+            return
+
+        lines = []
+        for symbol in symbols:
+            symbol, price, error = await self._current_price(symbol)
+            if error:
+                lines.append(f"❌ {error}")
+            elif symbol in watched:
+                lines.append(f"👀 {symbol} is already watched")
+            elif self.alerts.add(
+                context.chat_data,
+                Alert.watch(
+                    update.effective_chat.id,
+                    symbol,
+                    price,
+                    settings.WATCH_MOVE_PERCENT,
+                ),
+            ):
+                watched.add(symbol)
+                lines.append(
+                    f"👀 Watching {symbol} at ${price:,.8g}, you'll be notified "
+                    f"when it moves by {settings.WATCH_MOVE_PERCENT:g}%"
                 )
-            ]
+            else:
+                lines.append(self._alerts_full_text())
+                break
+        await self._reply(update, "\n".join(lines))
+
+    @track_handler
+    async def unwatch_command(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Stop watching coins, all of them without symbols.
+
+        Command: /unwatch [SYMBOL ...]
+        """
+        symbols = {
+            normalize_symbol(message_handler.canonical_symbol(symbol)[0]).upper()
+            for symbol in split_symbols(" ".join(context.args))
+        }
+        watches = [
+            alert
+            for alert in self.alerts.chat_alerts(context.chat_data)
+            if alert.watch_percent and (not symbols or alert.symbol in symbols)
         ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await update.message.reply_text(
-            markdownify(text),
-            parse_mode=ParseMode.MARKDOWN_V2,
-            reply_markup=reply_markup,
+        self.alerts.remove(context.chat_data, watches)
+        if watches:
+            text = "✅ Stopped watching " + ", ".join(
+                sorted({alert.symbol for alert in watches})
+            )
+        else:
+            text = "👀 None of these coins are watched."
+        await self._reply(update, text)
+
+    @track_handler
+    async def alert_command(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Set a one-off price alert.
+
+        Command: /alert SYMBOL >PRICE | SYMBOL <PRICE | clear
+        Description: Notifies the chat once when the price rises above or falls
+        below the given price. Lists the alerts without arguments.
+        """
+        query = " ".join(context.args)
+        alerts = [
+            alert
+            for alert in self.alerts.chat_alerts(context.chat_data)
+            if not alert.watch_percent
+        ]
+
+        if not query:
+            if not alerts:
+                text = "🔔 No price alerts are set. Example: /alert BTC >100000"
+            else:
+                text = "🔔 Price alerts\n" + "\n".join(
+                    f"• {alert.symbol} above ${alert.high:,.8g}"
+                    if alert.high is not None
+                    else f"• {alert.symbol} below ${alert.low:,.8g}"
+                    for alert in alerts
+                )
+            await self._reply(update, text)
+            return
+
+        if query.casefold() == "clear":
+            self.alerts.remove(context.chat_data, alerts)
+            await self._reply(update, "✅ Removed all price alerts.")
+            return
+
+        match = ALERT_PATTERN.fullmatch(query.strip())
+        if not match:
+            await self._reply(
+                update, "❌ Usage: /alert BTC >100000 or /alert ETH <2500"
+            )
+            return
+
+        symbol, direction, target = match.groups()
+        target = float(target.replace(",", ""))
+        symbol, price, error = await self._current_price(symbol)
+        if error:
+            await self._reply(update, f"❌ {error}")
+            return
+
+        above = direction == ">"
+        if (price >= target) if above else (price <= target):
+            await self._reply(
+                update,
+                f"❌ {symbol} is already {'above' if above else 'below'} "
+                f"${target:,.8g}, now ${price:,.8g}",
+            )
+            return
+
+        alert = Alert(update.effective_chat.id, symbol)
+        if above:
+            alert.high = target
+        else:
+            alert.low = target
+        if not self.alerts.add(context.chat_data, alert):
+            await self._reply(update, self._alerts_full_text())
+            return
+        await self._reply(
+            update,
+            f"🔔 You'll be notified when {symbol} goes "
+            f"{'above' if above else 'below'} ${target:,.8g}, now ${price:,.8g}",
+        )
+
+    @staticmethod
+    async def _current_price(symbol: str) -> tuple[str, float, str | None]:
+        """The canonical symbol and current price, or an error."""
+        symbol, error = message_handler.canonical_symbol(symbol)
+        if error:
+            return symbol, 0.0, error
+        symbol = normalize_symbol(symbol).upper()
+        success, data = await message_handler.api_service.get_price_info(symbol)
+        if not success:
+            return symbol, 0.0, f"{symbol}: {data}"
+        try:
+            return symbol, float(data["usd"]), None
+        except (KeyError, TypeError, ValueError):
+            return symbol, 0.0, f"{symbol}: no price available"
+
+    @staticmethod
+    def _alerts_full_text() -> str:
+        return (
+            f"❌ This chat already has {settings.ALERTS_MAX_PER_CHAT} alerts and "
+            "watches, remove some with /unwatch or /alert clear"
+        )
+
+    @staticmethod
+    async def _reply(update: Update, text: str) -> None:
+        await update.effective_message.reply_text(
+            markdownify(text), parse_mode=ParseMode.MARKDOWN_V2
         )
 
     # -----------------------Mode Config-------------------------------
 
+    @track_handler
     async def command_activate(
         self,
         update: Update,
@@ -304,48 +381,40 @@ class CommandManager:
             return
 
         # Handle callback query first if it exists
-        message = (
-            f"💬 {mode.value} Mode enabled. type further queries\n"
-            f"\nExample: *{example}*\n"
-            if example
-            else ""
-        ) + "\nEnter /stop_mode to switch to normal mode"
+        message = replies.mode_activated_text(mode, example)
 
         if update.callback_query:
             await update.callback_query.answer()
             await context.bot.send_message(
                 chat_id=update.effective_chat.id,
-                text=markdownify(message),
+                text=message,
                 parse_mode=ParseMode.MARKDOWN_V2,
                 reply_markup=command_inline_coin_keyboard(),
             )
         else:
             await update.message.reply_text(
-                text=markdownify(message),
+                text=message,
                 parse_mode=ParseMode.MARKDOWN_V2,
                 reply_markup=command_inline_coin_keyboard(),
             )
 
-        context.user_data["mode"] = mode
+        await user_modes.set(update.effective_user.id, mode)
 
+    @track_handler
     async def check_mode(
         self,
         update: Update,
         context: ContextTypes.DEFAULT_TYPE,
     ) -> None:
         """Check the current mode"""
-        mode: Modes = context.user_data.get("mode")
-        if not mode:
-            message = "No mode has been activated"
-        else:
-            message = f"You are in *{mode.value} mode*"
-        message += "\n\nType /help to see all commands!"
+        mode = await user_modes.get(update.effective_user.id, context.user_data)
         await update.effective_message.reply_text(
-            text=markdownify(message),
+            text=replies.mode_status_text(mode),
             parse_mode=ParseMode.MARKDOWN_V2,
             reply_markup=get_inline_coin_keyboard(),
         )
 
+    @track_handler
     async def remove_mode(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -353,26 +422,21 @@ class CommandManager:
         if update.effective_chat.type in [ChatType.GROUP, ChatType.SUPERGROUP]:
             return
 
-        mode: Modes = context.user_data.get("mode")
-
-        if mode is None:
-            message = "No mode has been activated."
-        else:
-            context.user_data["mode"] = None
-            message = f"✅ *{mode.value} Mode* removed. You can now chat normally."
-
-        message += "\n\n/help to get all of available commands"
+        mode = await user_modes.get(update.effective_user.id, context.user_data)
+        if mode is not None:
+            await user_modes.set(update.effective_user.id, None)
+        message = replies.mode_removed_text(mode)
 
         if update.callback_query:
             await update.callback_query.answer()
             await update.callback_query.message.reply_text(
-                text=markdownify(message),
+                text=message,
                 parse_mode=ParseMode.MARKDOWN_V2,
                 reply_markup=get_inline_coin_keyboard(include_switch_normal=False),
             )
         else:
             await update.effective_message.reply_text(
-                text=markdownify(message),
+                text=message,
                 parse_mode=ParseMode.MARKDOWN_V2,
                 reply_markup=get_inline_coin_keyboard(include_switch_normal=False),
             )
@@ -392,6 +456,10 @@ class CommandManager:
             (Commands.CONFIDENCE_ENABLE.value, "🎯 Get confidence score"),
             (Commands.CRYPTOINFO_ENABLE.value, "📈 Get coin information"),
             (Commands.PRICE_ENABLE.value, "📊 Get recent price information"),
+            # Alert Commands
+            (Commands.WATCH.value, "👀 Watch coins for price moves"),
+            (Commands.UNWATCH.value, "🙈 Stop watching coins"),
+            (Commands.ALERT.value, "🔔 Set a price alert"),
             # Utility Commands
             (Commands.CHECK_MODE.value, "🔍 Check current mode"),
             (Commands.STOP_MODE.value, "⏹️ Stop current mode"),
@@ -1,6 +1,6 @@
 from telegram import Update
 from telegram.constants import ParseMode
-from telegram.error import Forbidden
+from telegram.error import Forbidden, RetryAfter
 from telegram.ext import ContextTypes
 
 from src.utils.logger import get_logger
@@ -11,7 +11,15 @@ logger = get_logger(__name__)
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle errors in commands."""
     error = context.error
+    if isinstance(error, RetryAfter):
+        # Replying would only hit the same flood limit again
+        logger.warning("Flood control exceeded, retry after %ss", error.retry_after)
+        return
+
     logger.exception(error)
+    if not isinstance(update, Update) or update.effective_chat is None:
+        # Nowhere to report errors of inline queries and jobs
+        return
 
     if isinstance(error, Forbidden):
         await context.bot.send_message(
@@ -0,0 +1,181 @@
+import asyncio
+
+from telegram import InlineQueryResultArticle, InputTextMessageContent, Update
+from telegram.constants import InlineQueryResultLimit, ParseMode
+from telegram.ext import ContextTypes
+
+from src.core.cofig import settings
+from src.core.metrics import track_handler
+from src.handlers.message_handler import message_handler
+from src.models.confidace_score import ConfidenceScore
+from src.services.api_service import AnalysisAPIService
+from src.services.symbol_index import symbol_registry
+from src.utils.cache import TTLCache
+from src.utils.logger import get_logger
+from src.utils.markdown import pack_markdown
+from src.utils.string_formatters import format_confidence_score, format_price_data
+from src.utils.symbols import normalize_symbol
+
+logger = get_logger(__name__)
+
+PRICE_ENDPOINT = "/addon/price_info"
+CONFIDENCE_ENDPOINT = "/addon/confidence_score"
+
+
+class InlineQueryManager:
+    """Answer inline queries like ``@bot BTC`` with price and confidence cards.
+
+    Cards are built from the response cache and the answers for a query are
+    cached too. A query that needs the backend is only sent once the user
+    paused typing for ``INLINE_DEBOUNCE`` seconds, so queries made obsolete by
+    the next keystroke never reach the backend. Coins that only match the
+    query as a prefix get cards only when their data is cached already.
+    """
+
+    def __init__(self, api_service: AnalysisAPIService):
+        self.api_service = api_service
+        self.answers = TTLCache(maxsize=settings.INLINE_CACHE_MAX_ENTRIES)
+        self._latest: dict[int, str] = {}
+
+    @track_handler
+    async def handle_inline_query(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Answer an inline query, registered with ``block=False``."""
+        query = update.inline_query
+        key = normalize_symbol(query.query)
+        if not key:
+            await query.answer([], cache_time=settings.INLINE_CACHE_TIME)
+            return
+
+        results = self.answers.get(key)
+        if results is not None:
+            await query.answer(results, cache_time=settings.INLINE_CACHE_TIME)
+            return
+
+        exact, prefixed = self._symbols(key)
+        results, complete = self._cached_results(exact, prefixed)
+        if complete:
+            await query.answer(
+                results, cache_time=settings.INLINE_CACHE_TIME if results else 0
+            )
+            return
+
+        # Wait for the next keystroke, which supersedes this query
+        user_id = query.from_user.id
+        self._latest[user_id] = query.id
+        await asyncio.sleep(settings.INLINE_DEBOUNCE)
+        if self._latest.get(user_id) != query.id:
+            return
+        del self._latest[user_id]
+
+        try:
+            results = await asyncio.wait_for(
+                self._fetch_results(key, exact, prefixed), settings.INLINE_DEADLINE
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Inline query %r missed its deadline", query.query)
+            results = []
+        await query.answer(
+            results,
+            cache_time=settings.INLINE_CACHE_TIME if results else 0,
+        )
+
+    def _symbols(self, key: str) -> tuple[str | None, list[str]]:
+        """The symbol ``key`` names exactly, if any, and the ones it prefixes."""
+        index = symbol_registry.index
+        if not len(index):
+            return key.upper(), []
+        coin = index.resolve(key)
+        exact = coin.symbol.upper() if coin else None
+        prefixed = [
+            match.symbol.upper()
+            for match in index.prefix(key, limit=settings.INLINE_MAX_COINS)
+        ]
+        return exact, [symbol for symbol in prefixed if symbol != exact][
+            : settings.INLINE_MAX_COINS - bool(exact)
+        ]
+
+    def _cached_results(
+        self, exact: str | None, prefixed: list[str]
+    ) -> tuple[list[InlineQueryResultArticle], bool]:
+        """Cards for the matching coins whose data is cached, and whether the
+        data of the exact match, if any, was complete."""
+        complete = True
+        results = []
+        for symbol in ([exact] if exact else []) + prefixed:
+            price = self.api_service.cached_response(PRICE_ENDPOINT, symbol)
+            confidence = self.api_service.cached_response(CONFIDENCE_ENDPOINT, symbol)
+            if symbol == exact:
+                complete = price is not None and confidence is not None
+            results += self._cards(symbol, price, confidence)
+        return results, complete
+
+    async def _fetch_results(
+        self, key: str, exact: str, prefixed: list[str]
+    ) -> list[InlineQueryResultArticle]:
+        price, confidence = await asyncio.gather(
+            self.api_service.get_price_info(exact),
+            self.api_service.get_confidence_score(exact),
+        )
+        results = self._cards(exact, price, confidence)
+        results += self._cached_results(None, prefixed)[0]
+        if results:
+            self._remember(key, results)
+        return results
+
+    def _remember(self, key: str, results: list[InlineQueryResultArticle]) -> None:
+        self.answers.set(key, results, ttl=settings.INLINE_CACHE_TIME)
+
+    @classmethod
+    def _cards(
+        cls,
+        symbol: str,
+        price: tuple[bool, dict | str] | None,
+        confidence: tuple[bool, dict | str] | None,
+    ) -> list[InlineQueryResultArticle]:
+        cards = []
+        # A malformed payload only costs its own card
+        if price and price[0]:
+            try:
+                data = price[1]
+                cards.append(
+                    cls._card(
+                        f"price:{symbol}",
+                        f"💰 {symbol} ${data['usd']:,.8g}",
+                        f"24h change {data['usd_24h_change']:+.2f}%",
+                        format_price_data(data),
+                    )
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error("Error building the price card for %s: %s", symbol, e)
+        if confidence and confidence[0]:
+            try:
+                score = ConfidenceScore(**confidence[1])
+                cards.append(
+                    cls._card(
+                        f"confidence:{symbol}",
+                        f"🎯 {symbol} confidence {score.confidence_score:.1f}/10",
+                        f"Signal: {score.signal}",
+                        format_confidence_score(score),
+                    )
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error("Error building the confidence card for %s: %s", symbol, e)
+        return cards
+
+    @staticmethod
+    def _card(
+        result_id: str, title: str, description: str, message: str
+    ) -> InlineQueryResultArticle:
+        return InlineQueryResultArticle(
+            id=result_id[: InlineQueryResultLimit.MAX_ID_LENGTH],
+            title=title,
+            description=description,
+            input_message_content=InputTextMessageContent(
+                pack_markdown([message])[0], parse_mode=ParseMode.MARKDOWN_V2
+            ),
+        )
+
+
+inline_query_manager = InlineQueryManager(message_handler.api_service)
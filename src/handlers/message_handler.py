@@ -1,28 +1,87 @@
-import io
-
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, Update
-from telegram.constants import ChatAction, ChatType, ParseMode
+import asyncio
+import contextlib
+import functools
+import mmap
+import time
+from typing import Awaitable, Callable
+
+from telegram import (
+    InputFile,
+    InputMediaPhoto,
+    Message,
+    ReplyParameters,
+    Update,
+)
+from telegram.constants import ChatAction, ChatType, MessageLimit, ParseMode
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 
+from src.core import replies
+from src.core.cofig import settings
+from src.core.metrics import (
+    GROUP_DEDUPED,
+    register_admission_metrics,
+    register_service_metrics,
+    track_handler,
+)
 from src.keyboard.inline_keyboard import get_inline_coin_keyboard
 from src.models.confidace_score import ConfidenceScore
 from src.models.modes import Modes
+from src.services.admission import AdmissionController, Rejection
 from src.services.api_service import AnalysisAPIService
+from src.services.cache_warmer import CacheWarmer
+from src.services.plot_cache import PlotCache
+from src.services.state_store import user_modes
+from src.services.symbol_index import symbol_registry
+from src.utils.addresses import WalletAddress, parse_address
+from src.utils.cache import TTLCache
 from src.utils.logger import get_logger
-from src.utils.markdown import split_markdown
+from src.utils.markdown import cut_to_fit, pack_markdown, split_markdown
 from src.utils.string_formatters import (
+    CONFIDENCE_DISCLAIMER,
     format_confidence_score,
     format_price_data,
     format_technical_analysis,
     markdownify,
 )
+from src.utils.symbols import normalize_symbol, split_symbols
 
 logger = get_logger(__name__)
 
+MAX_MESSAGE_LENGTH = MessageLimit.MAX_TEXT_LENGTH
+# Rendering takes a few milliseconds per message, so longer replies are
+# rendered in a worker thread instead of holding up every other chat
+THREADED_RENDER_LENGTH = 2 * MAX_MESSAGE_LENGTH
+
 
 class MessageManager:
     def __init__(self):
         self.api_service = AnalysisAPIService()
+        self.plot_cache = PlotCache(
+            settings.plot_cache_dir, max_bytes=settings.PLOT_CACHE_MAX_BYTES
+        )
+        register_service_metrics(self.api_service, self.plot_cache)
+        self.admission = AdmissionController(
+            limits=settings.ADMISSION_LIMITS,
+            chat_multiplier=settings.ADMISSION_CHAT_MULTIPLIER,
+            max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+            expensive_modes=settings.ADMISSION_EXPENSIVE_MODES,
+        )
+        register_admission_metrics(self.admission)
+        self.cache_warmer = CacheWarmer(
+            self.api_service,
+            renderers={
+                "/addon/price_info": format_price_data,
+                "/addon/confidence_score": self._format_confidence,
+                "/addon/technical": format_technical_analysis,
+            },
+            top_n=settings.CACHE_WARM_TOP_N,
+            min_score=settings.CACHE_WARM_MIN_SCORE,
+            lead_time=settings.CACHE_WARM_LEAD_TIME,
+            concurrency=settings.SYMBOL_LOOKUP_CONCURRENCY,
+        )
+        # (chat, mode, symbols) -> (message id, link, time) of recent group answers
+        self.recent_answers = TTLCache(maxsize=settings.GROUP_DEDUPE_MAX_ENTRIES)
 
     async def handle_private_message(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -30,7 +89,7 @@ class MessageManager:
         """Handles Private chat"""
 
         if update.effective_chat.type == ChatType.PRIVATE:
-            mode = context.user_data.get("mode")
+            mode = await user_modes.get(update.effective_user.id, context.user_data)
             await self.handle_message(update=update, context=context, mode=mode)
 
     async def handle_message(
@@ -52,8 +111,107 @@ class MessageManager:
         }
 
         hanndler = handlers.get(mode, self.handle_analysis_query)
+        if mode not in handlers:
+            mode = Modes.CRYPTO
+
+        # Wallet addresses are recognized locally in every mode
+        address, error = parse_address(self._query_text(update))
+        if error:
+            await update.effective_message.reply_text(
+                f"❌ Sorry, that's an {error}.",
+                reply_to_message_id=update.effective_message.id,
+            )
+            return
+        if address:
+            hanndler = functools.partial(self.wallet_analysis, address=address)
+
+        answer_key = None if address else self._answer_key(update, mode)
+        if answer_key:
+            answer = self.recent_answers.get(answer_key)
+            if answer:
+                await self._reply_answered(update, mode, *answer)
+                return
+
+        user = update.effective_user
+        rejection = self.admission.admit(
+            mode,
+            user_id=user.id if user else update.effective_chat.id,
+            chat_id=update.effective_chat.id,
+            group=update.effective_chat.type != ChatType.PRIVATE,
+        )
+        if rejection:
+            if rejection.notify:
+                await self._reply_rejected(update, rejection)
+            return
+
+        start = time.perf_counter()
+        try:
+            answer = await hanndler(update=update, context=context)
+        finally:
+            self.admission.release(mode, time.perf_counter() - start)
+        if answer_key and answer:
+            self.recent_answers.set(
+                answer_key,
+                (answer.message_id, answer.link, time.monotonic()),
+                ttl=settings.GROUP_DEDUPE_WINDOW,
+            )
+
+    def _answer_key(self, update: Update, mode: Modes) -> tuple | None:
+        """Key of the answers a group query may be deduplicated against."""
+        if (
+            update.effective_chat.type == ChatType.PRIVATE
+            or mode not in settings.GROUP_DEDUPE_MODES
+            or settings.GROUP_DEDUPE_WINDOW <= 0
+        ):
+            return None
+        symbols = frozenset(
+            normalize_symbol(self.canonical_symbol(symbol)[0])
+            for symbol in split_symbols(self._query_text(update))
+        )
+        return (update.effective_chat.id, mode, symbols) if symbols else None
 
-        await hanndler(update=update, context=context)
+    @staticmethod
+    async def _reply_answered(
+        update: Update, mode: Modes, message_id: int, link: str | None, at: float
+    ) -> None:
+        """Point a repeated group query at the answer sent moments ago.
+
+        Chats without message links get a reply quoting the earlier answer.
+        """
+        GROUP_DEDUPED.inc(mode=mode.value)
+        text = f"☝️ This was answered {time.monotonic() - at:.0f}s ago"
+        if link:
+            await update.effective_message.reply_text(
+                f"{text}: {link}",
+                reply_to_message_id=update.effective_message.id,
+                disable_web_page_preview=True,
+            )
+            return
+        await update.effective_message.reply_text(
+            f"{text}, see above.",
+            reply_parameters=ReplyParameters(
+                message_id=message_id, allow_sending_without_reply=True
+            ),
+        )
+
+    @staticmethod
+    def _query_text(update: Update) -> str:
+        """The message text without a leading command."""
+        text = (update.effective_message.text or "").strip()
+        if text.startswith("/"):
+            text = " ".join(text.split()[1:])
+        return text
+
+    @staticmethod
+    async def _reply_rejected(update: Update, rejection: Rejection) -> None:
+        if rejection.reason == "busy":
+            text = "⏳ I'm busy right now, please try again in {}s."
+        else:
+            text = "⏳ You're sending requests too fast, please try again in {}s."
+        await update.effective_message.reply_text(
+            text.format(rejection.retry_after),
+            reply_to_message_id=update.effective_message.id,
+        )
 
     async def remove_mode(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -62,30 +220,26 @@ class MessageManager:
         if update.effective_chat.type in [ChatType.GROUP, ChatType.SUPERGROUP]:
             return
 
-        mode: Modes = context.user_data.get("mode")
-
-        if mode is None:
-            message = "No mode has been activated."
-        else:
-            context.user_data["mode"] = None
-            message = f"✅ *{mode.value} Mode* removed. You can now chat normally."
-
-        message += "\n\n/help to get all of available commands"
+        mode = await user_modes.get(update.effective_user.id, context.user_data)
+        if mode is not None:
+            await user_modes.set(update.effective_user.id, None)
+        message = replies.mode_removed_text(mode)
 
         if update.callback_query:
             await update.callback_query.answer()
             await update.callback_query.message.reply_text(
-                text=markdownify(message),
+                text=message,
                 parse_mode=ParseMode.MARKDOWN_V2,
                 reply_markup=get_inline_coin_keyboard(include_switch_normal=False),
             )
         else:
             await update.effective_message.reply_text(
-                text=markdownify(message),
+                text=message,
                 parse_mode=ParseMode.MARKDOWN_V2,
                 reply_markup=get_inline_coin_keyboard(include_switch_normal=False),
             )
 
+    @track_handler
     async def handle_analysis_query(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -111,7 +265,13 @@ class MessageManager:
             )
             return
 
-        success, text, plot_hashes = self.api_service.get_analysis(message)
+        if settings.ANALYSIS_STREAMING:
+            await self._stream_analysis_query(
+                update, context, message, analyzing_message
+            )
+            return
+
+        success, text, plot_hashes = await self.api_service.get_analysis(message)
 
         await analyzing_message.delete()
 
@@ -123,52 +283,326 @@ class MessageManager:
                 reply_markup=get_inline_coin_keyboard(update=update),
             )
             return
-        messages = split_markdown(text)
-        last_message_id = update.effective_message.id
-        total_messages = len(messages)
-        for idx, message in enumerate(messages):
-            message_data = await context.bot.send_message(
-                chat_id=update.effective_chat.id,
-                text=markdownify(message),
+        last_message = await self._send_messages(
+            update, context, await self._split_markdown(text)
+        )
+        last_message_id = (
+            last_message.message_id if last_message else update.effective_message.id
+        )
+
+        if success and plot_hashes and isinstance(plot_hashes, list):
+            await self._send_plots(update, context, plot_hashes, last_message_id)
+
+    async def _stream_analysis_query(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        query: str,
+        placeholder: Message,
+    ) -> None:
+        """Stream the analysis into the placeholder message as it is generated.
+
+        Edits are throttled to one per ``STREAM_EDIT_INTERVAL`` seconds. Once
+        the rendered text no longer fits into a message, the part that fits is
+        finalized and streaming continues in a new message.
+        """
+        loop = asyncio.get_running_loop()
+        current, text = placeholder, ""
+        last_edit = 0.0
+        result = None
+
+        # Closing the stream when an edit fails releases its connection
+        async with contextlib.aclosing(
+            self.api_service.stream_analysis(query)
+        ) as events:
+            async for event in events:
+                if event["type"] == "done":
+                    result = event
+                    break
+
+                text += event["text"]
+                if loop.time() - last_edit >= settings.STREAM_EDIT_INTERVAL:
+                    current, text = await self._edit_streamed(context, current, text)
+                    last_edit = loop.time()
+
+        if not result or not result["success"]:
+            error = result["text"] if result else "The analysis stream ended early."
+            if text:
+                await self._edit_streamed(context, current, text, final=True)
+            else:
+                await placeholder.delete()
+            await update.message.reply_text(
+                f"❌ {markdownify(error)}",
                 parse_mode=ParseMode.MARKDOWN_V2,
-                reply_markup=get_inline_coin_keyboard()
-                if idx == (total_messages - 1)
-                else None,
+                reply_to_message_id=update.effective_message.id,
+                reply_markup=get_inline_coin_keyboard(update=update),
             )
-            last_message_id = message_data.message_id
+            return
 
-        if success and plot_hashes and isinstance(plot_hashes, list):
-            try:
-                media = []
+        if not text:
+            # Nothing was streamed, the backend answered in one piece
+            text = result["text"] or ""
+        current, _ = await self._edit_streamed(context, current, text, final=True)
+
+        plot_hashes = result["plots"]
+        if plot_hashes and isinstance(plot_hashes, list):
+            await self._send_plots(update, context, plot_hashes, current.message_id)
+
+    async def _edit_streamed(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        message: Message,
+        text: str,
+        final: bool = False,
+    ) -> tuple[Message, str]:
+        """Show streamed text in ``message``, moving on to new messages on overflow.
+
+        Only the last message of a ``final`` edit gets the keyboard. Returns the
+        message still being streamed into and the text it holds.
+        """
+        while len(markdownify(text)) > MAX_MESSAGE_LENGTH:
+            head, text = cut_to_fit(text, MAX_MESSAGE_LENGTH)
+            await self._edit_message(message, head, complete=True)
+            message = await context.bot.send_message(
+                chat_id=message.chat_id, text="✍️..."
+            )
 
-                for hash_string in plot_hashes:
-                    image_data = self.api_service.get_plot_image(hash_string)
-                    if image_data:
-                        await context.bot.send_chat_action(
-                            chat_id=update.effective_chat.id,
-                            action=ChatAction.UPLOAD_PHOTO,
-                        )
-                        media.append(InputMediaPhoto(io.BytesIO(image_data)))
+        if text:
+            await self._edit_message(message, text, complete=final, keyboard=final)
+        return message, text
+
+    @staticmethod
+    async def _edit_message(
+        message: Message, text: str, complete: bool = False, keyboard: bool = False
+    ) -> None:
+        """Edit a streamed message, ``complete`` once its text is final."""
+        try:
+            await message.edit_text(
+                markdownify(text),
+                parse_mode=ParseMode.MARKDOWN_V2,
+                reply_markup=get_inline_coin_keyboard() if keyboard else None,
+            )
+        except BadRequest as e:
+            # An edit to the text already shown has nothing left to do
+            if "not modified" in e.message.lower():
+                return
+            # Intermediate edits are best effort, complete ones must land
+            if complete:
+                raise
+            logger.warning("Skipping streamed edit: %s", e)
+
+    async def _send_plots(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        plot_hashes: list[str],
+        reply_to_message_id: int,
+    ) -> None:
+        """Send the analysis plots as one media group.
 
+        Cached images are handed over as open memory maps, which the upload
+        reads in chunks instead of copying them into memory first.
+        """
+        try:
+            await context.bot.send_chat_action(
+                chat_id=update.effective_chat.id,
+                action=ChatAction.UPLOAD_PHOTO,
+            )
+            images = await self._fetch_plot_images(plot_hashes)
+            try:
+                media = [
+                    InputMediaPhoto(
+                        InputFile(image, attach=True, read_file_handle=False)
+                        if isinstance(image, mmap.mmap)
+                        else image
+                    )
+                    for image in images
+                ]
                 if media:
                     await context.bot.send_media_group(
                         chat_id=update.effective_chat.id,
                         media=media,
-                        reply_to_message_id=last_message_id,
+                        reply_to_message_id=reply_to_message_id,
                     )
+            finally:
+                for image in images:
+                    if isinstance(image, mmap.mmap):
+                        image.close()
 
-            except Exception as e:
-                logger.error(f"Error handling plots: {str(e)}")
-                await update.message.reply_text(
-                    markdownify(
-                        "❌ Sorry, there was an error displaying the analysis plots."
-                    ),
-                    parse_mode=ParseMode.MARKDOWN_V2,
-                )
+        except Exception as e:
+            logger.error(f"Error handling plots: {str(e)}")
+            await update.message.reply_text(
+                markdownify(
+                    "❌ Sorry, there was an error displaying the analysis plots."
+                ),
+                parse_mode=ParseMode.MARKDOWN_V2,
+            )
+
+    async def _fetch_plot_images(
+        self, plot_hashes: list[str]
+    ) -> list[bytes | mmap.mmap]:
+        """Download plot images concurrently, keeping the original order.
 
+        Cached images are returned as memory maps without a network round trip.
+        At most ``PLOT_FETCH_CONCURRENCY`` downloads run at once and each one is
+        bounded by ``PLOT_FETCH_TIMEOUT``. Images that fail or time out are
+        dropped so they never hold back the rest of the album. The caller must
+        close the returned memory maps.
+        """
+        semaphore = asyncio.Semaphore(settings.PLOT_FETCH_CONCURRENCY)
+
+        async def fetch(hash_string: str) -> bytes | mmap.mmap | None:
+            cached = await asyncio.to_thread(self.plot_cache.get, hash_string)
+            if cached is not None:
+                return cached
+
+            async with semaphore:
+                try:
+                    image = await asyncio.wait_for(
+                        self.api_service.get_plot_image(hash_string),
+                        timeout=settings.PLOT_FETCH_TIMEOUT,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("Timed out fetching plot image %s", hash_string)
+                    return None
+
+            if image:
+                await asyncio.to_thread(self.plot_cache.put, hash_string, image)
+            return image
+
+        results = await asyncio.gather(
+            *(fetch(hash_string) for hash_string in plot_hashes),
+            return_exceptions=True,
+        )
+        images = []
+        for hash_string, result in zip(plot_hashes, results):
+            if isinstance(result, Exception):
+                logger.error("Error fetching plot image %s: %s", hash_string, result)
+            elif result:
+                images.append(result)
+        return images
+
+    async def _lookup_symbols(
+        self,
+        symbols: list[str],
+        fetch: Callable[[str], Awaitable[tuple[bool, dict | str]]],
+    ) -> list[tuple[str, bool, dict | str]]:
+        """Query the backend for several symbols concurrently.
+
+        Returns one ``(symbol, success, data)`` row per symbol, in input order.
+        """
+        semaphore = asyncio.Semaphore(settings.SYMBOL_LOOKUP_CONCURRENCY)
+
+        async def lookup(symbol: str) -> tuple[str, bool, dict | str]:
+            canonical, error = self.canonical_symbol(symbol)
+            if error:
+                return symbol, False, error
+            async with semaphore:
+                success, data = await fetch(canonical)
+            return symbol, success, data
+
+        return await asyncio.gather(*(lookup(symbol) for symbol in symbols))
+
+    @staticmethod
+    def canonical_symbol(symbol: str) -> tuple[str, str | None]:
+        """Map a coin given by symbol, id or name to its canonical symbol.
+
+        Returns the symbol and None, or the input and an error suggesting close
+        matches when the coin is unknown. Without a coin list every input is
+        passed through as is.
+        """
+        index = symbol_registry.index
+        if not settings.SYMBOL_VALIDATION or not len(index):
+            return symbol, None
+        coin = index.resolve(symbol)
+        if coin:
+            return coin.symbol.upper(), None
+
+        error = f"unknown coin {symbol.strip()}"
+        suggestions = index.suggest(symbol)
+        if suggestions:
+            names = ", ".join(
+                f"{coin.symbol.upper()} ({coin.name})" for coin in suggestions
+            )
+            error += f", did you mean {names}?"
+        return symbol, error
+
+    @staticmethod
+    def _render_row(
+        row: tuple[str, bool, dict | str], render: Callable[[dict], str]
+    ) -> str:
+        """Render one symbol of a multi-symbol reply, marking failures inline."""
+        symbol, success, data = row
+        if not success:
+            return f"❌ {symbol.upper()}: {data}"
+        try:
+            return render(data)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Error rendering %s: %s", symbol, e)
+            return f"❌ {symbol.upper()}: unexpected response from the analysis service"
+
+    async def _send_blocks(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE, blocks: list[str]
+    ) -> Message | None:
+        """Send rendered blocks packed into as few messages as possible."""
+        return await self._send_messages(
+            update, context, await self._pack_markdown(blocks)
+        )
+
+    async def _send_card(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        data: dict,
+        render: Callable[[dict], str],
+    ) -> Message | None:
+        """Send a single-coin reply, reusing the messages the cache warmer
+        rendered for the response if there are any."""
+        messages = self.cache_warmer.card(data)
+        if messages is None:
+            messages = await self._pack_markdown([render(data)])
+        return await self._send_messages(update, context, messages)
+
+    @staticmethod
+    def _format_confidence(data: dict) -> str:
+        return format_confidence_score(ConfidenceScore(**data))
+
+    @staticmethod
+    async def _pack_markdown(sections: list[str]) -> list[str]:
+        """Render sections into messages with pack_markdown."""
+        if sum(map(len, sections)) < THREADED_RENDER_LENGTH:
+            return pack_markdown(sections, MAX_MESSAGE_LENGTH)
+        return await asyncio.to_thread(pack_markdown, sections, MAX_MESSAGE_LENGTH)
+
+    @staticmethod
+    async def _split_markdown(text: str) -> list[str]:
+        """Render markdown text into messages with split_markdown."""
+        if len(text) < THREADED_RENDER_LENGTH:
+            return split_markdown(text, MAX_MESSAGE_LENGTH)
+        return await asyncio.to_thread(split_markdown, text, MAX_MESSAGE_LENGTH)
+
+    @staticmethod
+    async def _send_messages(
+        update: Update, context: ContextTypes.DEFAULT_TYPE, messages: list[str]
+    ) -> Message | None:
+        """Send MarkdownV2 messages with the coin keyboard under the last one."""
+        last_message = None
+        total_messages = len(messages)
+        for idx, message in enumerate(messages):
+            last_message = await context.bot.send_message(
+                chat_id=update.effective_chat.id,
+                text=message,
+                parse_mode=ParseMode.MARKDOWN_V2,
+                reply_markup=get_inline_coin_keyboard()
+                if idx == (total_messages - 1)
+                else None,
+            )
+        return last_message
+
+    @track_handler
     async def confidence_inference(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
-    ) -> None:
+    ) -> Message | None:
         """Handle inference for confidence mode messages
 
         Args:
@@ -199,32 +633,44 @@ class MessageManager:
             return
 
         try:
-            success, data = self.api_service.get_confidence_score(symbol=symbol)
+            symbols = split_symbols(symbol, limit=settings.MAX_SYMBOLS_PER_MESSAGE)
+            results = await self._lookup_symbols(
+                symbols, self.api_service.get_confidence_score
+            )
 
-            if not success:
+            if len(results) == 1:
+                _, success, data = results[0]
+                if not success:
+                    await reply_message.delete()
+                    await update.message.reply_text(
+                        markdownify(f"❌ {data}"), parse_mode=ParseMode.MARKDOWN_V2
+                    )
+                    return
                 await reply_message.delete()
-                await update.message.reply_text(
-                    markdownify(f"❌ {data}"), parse_mode=ParseMode.MARKDOWN_V2
+                return await self._send_card(
+                    update, context, data, self._format_confidence
                 )
-                return
 
-            confidence_score = ConfidenceScore(**data)
-
-            message = format_confidence_score(confidence_score)
+            blocks = [
+                self._render_row(
+                    row,
+                    lambda data: format_confidence_score(
+                        ConfidenceScore(**data), include_disclaimer=False
+                    ),
+                )
+                for row in results
+            ]
+            blocks.append(CONFIDENCE_DISCLAIMER)
             await reply_message.delete()
-            await context.bot.send_message(
-                chat_id=update.effective_chat.id,
-                text=markdownify(message),
-                parse_mode=ParseMode.MARKDOWN_V2,
-                reply_markup=get_inline_coin_keyboard(),
-            )
+            return await self._send_blocks(update, context, blocks)
 
         except Exception as e:
             raise e
 
+    @track_handler
     async def technical_inference(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
-    ) -> None:
+    ) -> Message | None:
         """Handle inference for confidence mode messages
 
         Args:
@@ -255,7 +701,15 @@ class MessageManager:
             return
 
         try:
-            success, data = self.api_service.get_technical_analysis(symbol=symbol)
+            symbol, error = self.canonical_symbol(symbol)
+            if error:
+                await reply_message.delete()
+                await update.message.reply_text(
+                    markdownify(f"❌ {error}"), parse_mode=ParseMode.MARKDOWN_V2
+                )
+                return
+
+            success, data = await self.api_service.get_technical_analysis(symbol=symbol)
 
             if not success:
                 await reply_message.delete()
@@ -264,21 +718,18 @@ class MessageManager:
                 )
                 return
 
-            message = format_technical_analysis(data)
             await reply_message.delete()
-            await context.bot.send_message(
-                chat_id=update.effective_chat.id,
-                text=markdownify(message),
-                parse_mode=ParseMode.MARKDOWN_V2,
-                reply_markup=get_inline_coin_keyboard(),
+            return await self._send_card(
+                update, context, data, format_technical_analysis
             )
 
         except Exception as e:
             raise e
 
+    @track_handler
     async def crypto_info(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
-    ) -> None:
+    ) -> Message | None:
         """Get Crypto information"""
         reply_message = await context.bot.send_message(
             chat_id=update.effective_chat.id,
@@ -302,7 +753,15 @@ class MessageManager:
             )
             return
         try:
-            success, text = self.api_service.get_crypto_info(symbol)
+            symbol, error = self.canonical_symbol(symbol)
+            if error:
+                await reply_message.delete()
+                await update.message.reply_text(
+                    markdownify(f"❌ {error}"), parse_mode=ParseMode.MARKDOWN_V2
+                )
+                return
+
+            success, text = await self.api_service.get_crypto_info(symbol)
             if not success:
                 await reply_message.delete()
                 await update.message.reply_text(
@@ -311,24 +770,46 @@ class MessageManager:
                 return
 
             await reply_message.delete()
-            messages = split_markdown(text, chunk_size=4000)
-            total_messages = len(messages)
-            for idx, message_part in enumerate(messages):
-                await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text=markdownify(message_part),
-                    parse_mode=ParseMode.MARKDOWN_V2,
-                    reply_markup=get_inline_coin_keyboard()
-                    if idx == (total_messages - 1)
-                    else None,
-                )
+            return await self._send_messages(
+                update, context, await self._split_markdown(text)
+            )
 
         except Exception as e:
             raise e
 
+    @track_handler
+    async def wallet_analysis(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        address: WalletAddress,
+    ) -> None:
+        """Analyze a wallet address recognized in the message"""
+        reply_message = await context.bot.send_message(
+            chat_id=update.effective_chat.id,
+            text="🔍 Analyzing the wallet...",
+            reply_to_message_id=update.effective_message.id,
+        )
+        await context.bot.send_chat_action(
+            chat_id=update.effective_chat.id, action=ChatAction.TYPING
+        )
+
+        success, text = await self.api_service.get_wallet_info(
+            address.address, address.chain
+        )
+        await reply_message.delete()
+        if not success:
+            await update.message.reply_text(
+                markdownify(f"❌ {text}"), parse_mode=ParseMode.MARKDOWN_V2
+            )
+            return
+
+        await self._send_messages(update, context, await self._split_markdown(text))
+
+    @track_handler
     async def price_inference(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
-    ) -> None:
+    ) -> Message | None:
         """Get Price information"""
         reply_message = await context.bot.send_message(
             chat_id=update.effective_chat.id,
@@ -352,21 +833,23 @@ class MessageManager:
             )
             return
         try:
-            success, data = self.api_service.get_price_info(symbol=symbol)
-            message = format_price_data(data)
+            symbols = split_symbols(symbol, limit=settings.MAX_SYMBOLS_PER_MESSAGE)
+            results = await self._lookup_symbols(
+                symbols, self.api_service.get_price_info
+            )
             await reply_message.delete()
-            if not success:
-                await update.message.reply_text(
-                    markdownify(f"❌ {data}"), parse_mode=ParseMode.MARKDOWN_V2
-                )
-                return
 
-            await context.bot.send_message(
-                chat_id=update.effective_chat.id,
-                text=markdownify(message),
-                parse_mode=ParseMode.MARKDOWN_V2,
-                reply_markup=get_inline_coin_keyboard(),
-            )
+            if len(results) == 1:
+                _, success, data = results[0]
+                if not success:
+                    await update.message.reply_text(
+                        markdownify(f"❌ {data}"), parse_mode=ParseMode.MARKDOWN_V2
+                    )
+                    return
+                return await self._send_card(update, context, data, format_price_data)
+
+            blocks = [self._render_row(row, format_price_data) for row in results]
+            return await self._send_blocks(update, context, blocks)
 
         except Exception as e:
             raise e
@@ -1,7 +1,9 @@
+from functools import lru_cache
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.constants import ChatType
 
-from src.core.costants import BUY_AMEN_LINK
+from src.core.costants import BUY_AMEN_LINK, NOSTRADAMUS_LINK
 
 
 def get_inline_coin_keyboard(
@@ -17,21 +19,26 @@ def get_inline_coin_keyboard(
     Returns:
         InlineKeyboardMarkup: the keyboard object
     """
+    return _coin_keyboard(
+        include_switch_normal
+        and ((not update) or update.effective_chat.type == ChatType.PRIVATE)
+    )
+
+
+@lru_cache
+def _coin_keyboard(include_switch_normal: bool) -> InlineKeyboardMarkup:
+    # Telegram objects are immutable, so one instance can be shared by all replies
     keyboard = [
         [
             InlineKeyboardButton("Buy $AMEN", url=BUY_AMEN_LINK),
         ],
     ]
-    if include_switch_normal and (
-        (not update) or update.effective_chat.type == ChatType.PRIVATE
-    ):
+    if include_switch_normal:
         keyboard.append(
             [InlineKeyboardButton("Switch to Normal Mode", callback_data="stop_mode")]
         )
 
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
-    return reply_markup
+    return InlineKeyboardMarkup(keyboard)
 
 
 def command_inline_coin_keyboard() -> InlineKeyboardMarkup:
@@ -39,12 +46,52 @@ def command_inline_coin_keyboard() -> InlineKeyboardMarkup:
     Returns:
         InlineKeyboardMarkup: the keyboard object
     """
-    keyboard = [
+    return _coin_keyboard(True)
+
+
+@lru_cache
+def start_keyboard(private: bool, bot_username: str) -> InlineKeyboardMarkup:
+    """Keyboard of the /start reply"""
+    if not private:
+        return InlineKeyboardMarkup(
+            [[InlineKeyboardButton("🌐 Nostradamus", url=NOSTRADAMUS_LINK)]]
+        )
+
+    return InlineKeyboardMarkup(
         [
-            InlineKeyboardButton("Buy $AMEN", url=BUY_AMEN_LINK),
-        ],
-        [InlineKeyboardButton("Switch to Normal Mode", callback_data="stop_mode")],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+            [
+                InlineKeyboardButton("🤖 Start Analysis", callback_data="crypto"),
+            ],
+            [
+                InlineKeyboardButton("🌐 Nostradamus", url=NOSTRADAMUS_LINK),
+                InlineKeyboardButton(
+                    "💬 Add to Group",
+                    url=f"https://t.me/{bot_username}?startgroup=true",
+                ),
+            ],
+        ]
+    )
+
+
+@lru_cache
+def help_keyboard(private: bool) -> InlineKeyboardMarkup:
+    """Keyboard of the /help reply"""
+    if not private:
+        return InlineKeyboardMarkup([[]])
+
+    return InlineKeyboardMarkup(
+        [
+            [
+                InlineKeyboardButton("🤖 Start Analysis", callback_data="crypto"),
+                InlineKeyboardButton("🌐 Nostradamus", url=NOSTRADAMUS_LINK),
+            ],
+        ]
+    )
+
 
-    return reply_markup
+@lru_cache
+def nostradamus_keyboard() -> InlineKeyboardMarkup:
+    """Keyboard linking to the Nostradamus website"""
+    return InlineKeyboardMarkup(
+        [[InlineKeyboardButton("🌐 Nostradamus", url=NOSTRADAMUS_LINK)]]
+    )
@@ -20,3 +20,8 @@ class Commands(str, Enum):
     TECHNICALS_ENABLE = "technical"
     CRYPTOINFO_ENABLE = "crypto_info"
     PRICE_ENABLE = "price"
+
+    # Alert commands
+    WATCH = "watch"
+    UNWATCH = "unwatch"
+    ALERT = "alert"
@@ -0,0 +1,102 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+from src.models.modes import Modes
+from src.utils.token_bucket import TokenBuckets
+
+
+@dataclass(frozen=True)
+class Rejection:
+    reason: str
+    retry_after: float
+    # Only the first rejection of a burst is answered, the rest are dropped
+    notify: bool
+
+
+class AdmissionController:
+    """Admission control in front of the mode handlers.
+
+    Requests take a token of the user's bucket for the mode, and in groups
+    also of the chat's bucket. Expensive modes are additionally capped at
+    ``max_in_flight`` requests at once. Rejected requests get a retry hint
+    instead of waiting, so an overloaded bot sheds load rather than queueing
+    without bound.
+    """
+
+    def __init__(
+        self,
+        limits: dict[Modes, tuple[float, float]],
+        chat_multiplier: float,
+        max_in_flight: int,
+        expensive_modes: Iterable[Modes],
+    ):
+        self.max_in_flight = max_in_flight
+        self.expensive_modes = frozenset(expensive_modes)
+        self.in_flight = 0
+        self.rejected: dict[tuple[Modes, str], int] = {}
+
+        self._user_buckets = {
+            mode: TokenBuckets(per_minute / 60, burst)
+            for mode, (per_minute, burst) in limits.items()
+            if per_minute > 0
+        }
+        self._chat_buckets = {
+            mode: TokenBuckets(
+                per_minute * chat_multiplier / 60, burst * chat_multiplier
+            )
+            for mode, (per_minute, burst) in limits.items()
+            if per_minute > 0
+        }
+        # Running average duration of expensive requests, the retry hint when busy
+        self._average_duration = 10.0
+        self._notified_until: dict[int, float] = {}
+
+    def admit(
+        self, mode: Modes, user_id: int, chat_id: int, group: bool
+    ) -> Rejection | None:
+        """Admit a request, or return why it was rejected.
+
+        Every admitted request must be followed by :meth:`release`.
+        """
+        if mode in self.expensive_modes and self.in_flight >= self.max_in_flight:
+            return self._reject(mode, "busy", self._average_duration, user_id)
+
+        buckets = []
+        if mode in self._user_buckets:
+            buckets.append(self._user_buckets[mode][user_id])
+            if group:
+                buckets.append(self._chat_buckets[mode][chat_id])
+        wait_time = max((bucket.wait_time() for bucket in buckets), default=0.0)
+        if wait_time:
+            return self._reject(mode, "rate_limited", wait_time, user_id)
+
+        for bucket in buckets:
+            bucket.take()
+        if mode in self.expensive_modes:
+            self.in_flight += 1
+        return None
+
+    def release(self, mode: Modes, duration: float) -> None:
+        if mode in self.expensive_modes:
+            self.in_flight -= 1
+            self._average_duration += (duration - self._average_duration) * 0.2
+
+    def _reject(
+        self, mode: Modes, reason: str, retry_after: float, user_id: int
+    ) -> Rejection:
+        self.rejected[(mode, reason)] = self.rejected.get((mode, reason), 0) + 1
+        retry_after = max(1, math.ceil(retry_after))
+
+        now = time.monotonic()
+        notify = self._notified_until.get(user_id, 0.0) <= now
+        if notify:
+            if len(self._notified_until) > 10_000:
+                self._notified_until = {
+                    key: until
+                    for key, until in self._notified_until.items()
+                    if until > now
+                }
+            self._notified_until[user_id] = now + retry_after
+        return Rejection(reason, retry_after, notify)
@@ -0,0 +1,263 @@
+import asyncio
+import itertools
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Awaitable, Callable, Iterable, Mapping
+
+from telegram import Bot
+from telegram.error import Forbidden, TelegramError
+from telegram.ext import ContextTypes
+
+from src.core.metrics import ALERTS_SENT
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# chat_data key of the alerts of a chat
+CHAT_ALERTS = "alerts"
+
+PriceFetcher = Callable[[str], Awaitable[tuple[bool, dict | str]]]
+
+_threshold = itemgetter(0)
+
+
+@dataclass(eq=False, slots=True)
+class Alert:
+    """A price range of one chat, notified once the price leaves it.
+
+    One-off alerts have a single bound. Watches have both, around the price
+    the last notification was sent at, and are re-armed after each one.
+    """
+
+    chat_id: int
+    symbol: str
+    low: float | None = None
+    high: float | None = None
+    # Move in percent around the reference price, None for one-off alerts
+    watch_percent: float | None = None
+
+    @classmethod
+    def watch(cls, chat_id: int, symbol: str, price: float, percent: float) -> "Alert":
+        alert = cls(chat_id, symbol, watch_percent=percent)
+        alert.rearm(price)
+        return alert
+
+    def rearm(self, price: float) -> None:
+        self.low = price * (1 - self.watch_percent / 100)
+        self.high = price * (1 + self.watch_percent / 100)
+
+    @property
+    def reference(self) -> float:
+        return (self.low + self.high) / 2
+
+
+class _SymbolAlerts:
+    __slots__ = ("above", "below")
+
+    def __init__(self):
+        # (threshold, sequence, alert), ascending by threshold
+        self.above: list[tuple[float, int, Alert]] = []
+        self.below: list[tuple[float, int, Alert]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.above or self.below)
+
+
+class AlertBook:
+    """Alerts of all chats indexed by symbol.
+
+    The upper and lower bounds of each symbol are kept in sorted lists, so a
+    new price only visits the alerts it triggers instead of every alert.
+    """
+
+    def __init__(self):
+        self._symbols: dict[str, _SymbolAlerts] = {}
+        self._sequence = itertools.count()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def symbols(self) -> list[str]:
+        return list(self._symbols)
+
+    def add(self, alert: Alert) -> None:
+        alerts = self._symbols.setdefault(alert.symbol, _SymbolAlerts())
+        sequence = next(self._sequence)
+        if alert.high is not None:
+            insort(alerts.above, (alert.high, sequence, alert), key=_threshold)
+        if alert.low is not None:
+            insort(alerts.below, (alert.low, sequence, alert), key=_threshold)
+        self._count += 1
+
+    def remove(self, alert: Alert) -> None:
+        alerts = self._symbols.get(alert.symbol)
+        if alerts is None:
+            return
+        removed = self._discard(alerts.above, alert.high, alert)
+        removed |= self._discard(alerts.below, alert.low, alert)
+        self._count -= removed
+        if not alerts:
+            del self._symbols[alert.symbol]
+
+    def triggered(self, symbol: str, price: float) -> list[Alert]:
+        """Remove and return the alerts of ``symbol`` that ``price`` crosses."""
+        alerts = self._symbols.get(symbol)
+        if alerts is None:
+            return []
+
+        above = bisect_right(alerts.above, price, key=_threshold)
+        below = bisect_left(alerts.below, price, key=_threshold)
+        fired = [entry[2] for entry in alerts.above[:above]]
+        fired += [entry[2] for entry in alerts.below[below:]]
+        del alerts.above[:above]
+        del alerts.below[below:]
+
+        # Alerts with both bounds are still listed under the other one
+        fired = list(dict.fromkeys(fired))
+        for alert in fired:
+            self._discard(alerts.above, alert.high, alert)
+            self._discard(alerts.below, alert.low, alert)
+        self._count -= len(fired)
+        if not alerts:
+            del self._symbols[symbol]
+        return fired
+
+    @staticmethod
+    def _discard(
+        entries: list[tuple[float, int, Alert]], threshold: float | None, alert: Alert
+    ) -> bool:
+        if threshold is None:
+            return False
+        index = bisect_left(entries, threshold, key=_threshold)
+        while index < len(entries) and entries[index][0] == threshold:
+            if entries[index][2] is alert:
+                del entries[index]
+                return True
+            index += 1
+        return False
+
+
+class PriceAlerts:
+    """Price alerts and watches of all chats, checked by a repeating job.
+
+    Alerts are kept in the chat's ``chat_data`` so they are persisted with it,
+    and mirrored in an :class:`AlertBook`. Every check fetches the price of
+    each distinct symbol once, however many chats subscribed to it.
+    """
+
+    def __init__(
+        self,
+        fetch_price: PriceFetcher,
+        max_per_chat: int = 20,
+        concurrency: int = 5,
+    ):
+        self.fetch_price = fetch_price
+        self.max_per_chat = max_per_chat
+        self.concurrency = concurrency
+        self.book = AlertBook()
+
+    def load(self, chat_data: Mapping[int, dict], owns: Callable[[int], bool]) -> None:
+        """Index the persisted alerts of the chats handled by this process."""
+        for chat_id, data in chat_data.items():
+            if owns(chat_id):
+                for alert in data.get(CHAT_ALERTS, ()):
+                    self.book.add(alert)
+        logger.info("Loaded %d price alerts", len(self.book))
+
+    @staticmethod
+    def chat_alerts(chat_data: dict) -> list[Alert]:
+        return chat_data.get(CHAT_ALERTS, [])
+
+    def add(self, chat_data: dict, alert: Alert) -> bool:
+        """Subscribe a chat, False if it already has the maximum of alerts."""
+        alerts = chat_data.setdefault(CHAT_ALERTS, [])
+        if len(alerts) >= self.max_per_chat:
+            return False
+        alerts.append(alert)
+        self.book.add(alert)
+        return True
+
+    def remove(self, chat_data: dict, alerts: Iterable[Alert]) -> None:
+        alerts = list(alerts)
+        for alert in alerts:
+            self.book.remove(alert)
+        chat_data[CHAT_ALERTS] = [
+            alert for alert in self.chat_alerts(chat_data) if alert not in alerts
+        ]
+
+    async def check_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        changed = await self.check(context.bot, context.application.chat_data)
+        # Job updates have no chat, so PTB would not persist these changes
+        if changed:
+            context.application.mark_data_for_update_persistence(chat_ids=changed)
+
+    async def check(self, bot: Bot, chat_data: Mapping[int, dict]) -> set[int]:
+        """Fetch the price of every subscribed symbol and notify crossed alerts.
+
+        Returns the ids of the chats whose alerts changed.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(symbol: str) -> tuple[str, float | None]:
+            async with semaphore:
+                success, data = await self.fetch_price(symbol)
+            try:
+                return symbol, float(data["usd"]) if success else None
+            except (KeyError, TypeError, ValueError):
+                logger.error("Unexpected price data for %s: %s", symbol, data)
+                return symbol, None
+
+        prices = await asyncio.gather(*map(fetch, self.book.symbols()))
+
+        notifications: dict[int, list[str]] = {}
+        for symbol, price in prices:
+            if price is None:
+                continue
+            for alert in self.book.triggered(symbol, price):
+                notifications.setdefault(alert.chat_id, []).append(
+                    self._notification(alert, price)
+                )
+                if alert.watch_percent is not None:
+                    alert.rearm(price)
+                    self.book.add(alert)
+                else:
+                    data = chat_data.get(alert.chat_id, {})
+                    data[CHAT_ALERTS] = [
+                        other for other in self.chat_alerts(data) if other is not alert
+                    ]
+
+        await asyncio.gather(
+            *(
+                self._notify(bot, chat_id, lines, chat_data.get(chat_id, {}))
+                for chat_id, lines in notifications.items()
+            )
+        )
+        return set(notifications)
+
+    async def _notify(
+        self, bot: Bot, chat_id: int, lines: list[str], chat_data: dict
+    ) -> None:
+        try:
+            await bot.send_message(chat_id=chat_id, text="\n".join(lines))
+        except Forbidden:
+            # The bot was blocked or removed from the chat
+            logger.info("Dropping the price alerts of unreachable chat %s", chat_id)
+            self.remove(chat_data, list(self.chat_alerts(chat_data)))
+        except TelegramError as e:
+            logger.error("Error sending price alerts to chat %s: %s", chat_id, e)
+
+    @staticmethod
+    def _notification(alert: Alert, price: float) -> str:
+        symbol = alert.symbol.upper()
+        if alert.watch_percent is not None:
+            ALERTS_SENT.inc(kind="watch")
+            change = (price / alert.reference - 1) * 100
+            trend = "📈" if change > 0 else "📉"
+            return f"{trend} {symbol} moved {change:+.2f}% to ${price:,.8g}"
+
+        ALERTS_SENT.inc(kind="alert")
+        if alert.high is not None:
+            return f"🔔 {symbol} is above ${alert.high:,.8g}, now ${price:,.8g}"
+        return f"🔔 {symbol} is below ${alert.low:,.8g}, now ${price:,.8g}"
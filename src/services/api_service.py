@@ -1,9 +1,26 @@
+import asyncio
+import json
 import logging
-from typing import Optional, Tuple
+import math
+import time
+from typing import AsyncIterator, Optional, Tuple
 
-import requests
+import httpx
 
 from src.core.cofig import settings
+from src.core.metrics import (
+    BACKEND_ERRORS,
+    BACKEND_IN_FLIGHT,
+    BACKEND_LATENCY,
+    BACKEND_RETRIES,
+)
+from src.utils.cache import TTLCache
+from src.utils.heavy_hitters import DecayingTopK
+from src.utils.resilience import CircuitBreaker, CircuitOpenError, backoff_delay
+from src.utils.singleflight import SingleFlight
+from src.utils.symbols import normalize_symbol
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 class AnalysisAPIService:
@@ -11,125 +28,435 @@ class AnalysisAPIService:
         self.base_url = settings.API_BASE_URL
         self.api_key = settings.API_KEY
         self.headers = {"X-API-Key": self.api_key, "Content-Type": "application/json"}
+        self._client: httpx.AsyncClient | None = None
+
+        self.response_cache = TTLCache(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES)
+        self.wallet_cache = TTLCache(maxsize=settings.WALLET_CACHE_MAX_ENTRIES)
+        self.single_flight = SingleFlight()
+        self.popularity: dict[str, DecayingTopK] = {}
+        self.cache_ttls = {
+            "/addon/confidence_score": settings.CONFIDENCE_CACHE_TTL,
+            "/addon/technical": settings.TECHNICAL_CACHE_TTL,
+            "/addon/coin_info": settings.COIN_INFO_CACHE_TTL,
+            "/addon/price_info": settings.PRICE_CACHE_TTL,
+            "/addon/wallet_info": settings.WALLET_CACHE_TTL,
+        }
+        self.read_timeouts = {
+            "/addon/response": settings.API_ANALYSIS_READ_TIMEOUT,
+            "/addon/plot_image": settings.API_PLOT_READ_TIMEOUT,
+        }
+        self.deadlines = {
+            "/addon/response": settings.CRYPTO_DEADLINE,
+            "/addon/plot_image": settings.PLOT_FETCH_TIMEOUT,
+            "/addon/confidence_score": settings.CONFIDENCE_DEADLINE,
+            "/addon/technical": settings.TECHNICAL_DEADLINE,
+            "/addon/coin_info": settings.CRYPTO_INFO_DEADLINE,
+            "/addon/price_info": settings.PRICE_DEADLINE,
+            "/addon/wallet_info": settings.WALLET_DEADLINE,
+        }
+        self.breakers: dict[str, CircuitBreaker] = {}
 
-    def get_analysis(self, query: str) -> Tuple[bool, str, Optional[str]]:
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Shared keep-alive client, created lazily inside the running event loop
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                limits=httpx.Limits(
+                    max_connections=settings.API_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.API_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.API_KEEPALIVE_EXPIRY,
+                ),
+                timeout=self._timeout(settings.API_READ_TIMEOUT),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled client and release its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def _timeout(read: float) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=settings.API_CONNECT_TIMEOUT,
+            read=read,
+            write=settings.API_CONNECT_TIMEOUT,
+            pool=settings.API_POOL_TIMEOUT,
+        )
+
+    def breaker_states(self) -> dict[str, dict]:
+        """Circuit breaker state per endpoint, for monitoring."""
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self.breakers:
+            self.breakers[endpoint] = CircuitBreaker(
+                endpoint,
+                failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.BREAKER_RESET_TIMEOUT,
+                half_open_max_calls=settings.BREAKER_HALF_OPEN_MAX_CALLS,
+            )
+        return self.breakers[endpoint]
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        stream: bool = False,
+        deadline: float | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request through the endpoint's circuit breaker, retrying
+        transient failures with jittered backoff inside its deadline budget.
+        The backend endpoints only read data, so every request is safe to retry.
+        With ``stream`` the response body is left unread, and the caller must
+        read it within ``deadline``, close the response and record the outcome
+        with the endpoint's breaker.
+        """
+        breaker = self._breaker(endpoint)
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            deadline = loop.time() + self.deadlines[endpoint]
+        read_timeout = self.read_timeouts.get(endpoint, settings.API_READ_TIMEOUT)
+
+        attempt = 0
+        while True:
+            remaining = deadline - loop.time()
+            try:
+                breaker.acquire()
+            except CircuitOpenError:
+                BACKEND_ERRORS.inc(endpoint=endpoint, kind="circuit_open")
+                raise
+
+            success = None
+            BACKEND_IN_FLIGHT.inc(endpoint=endpoint)
+            start = time.perf_counter()
+            try:
+                request = self.client.build_request(
+                    method,
+                    url,
+                    timeout=self._timeout(min(read_timeout, remaining)),
+                    **kwargs,
+                )
+                response = await asyncio.wait_for(
+                    self.client.send(request, stream=stream), timeout=remaining
+                )
+                if stream and response.is_error:
+                    await response.aclose()
+                response.raise_for_status()
+                # A stream only succeeded once it was read to the end
+                success = None if stream else True
+                return response
+            except httpx.HTTPStatusError as e:
+                # Client errors mean the backend is healthy, don't retry them
+                success = e.response.status_code not in RETRYABLE_STATUS_CODES
+                BACKEND_ERRORS.inc(endpoint=endpoint, kind=self._error_kind(e))
+                if success:
+                    raise
+                error = e
+            except (httpx.TransportError, asyncio.TimeoutError) as e:
+                success = False
+                BACKEND_ERRORS.inc(endpoint=endpoint, kind=self._error_kind(e))
+                error = e
+            finally:
+                BACKEND_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+                BACKEND_IN_FLIGHT.dec(endpoint=endpoint)
+                breaker.release(success)
+
+            delay = backoff_delay(
+                attempt, settings.API_RETRY_BACKOFF_BASE, settings.API_RETRY_BACKOFF_MAX
+            )
+            attempt += 1
+            if attempt > settings.API_MAX_RETRIES or loop.time() + delay >= deadline:
+                raise error
+            BACKEND_RETRIES.inc(endpoint=endpoint)
+            logging.warning(
+                f"Retrying {endpoint} in {delay:.2f}s "
+                f"(attempt {attempt}/{settings.API_MAX_RETRIES}): {error!r}"
+            )
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _error_kind(error: Exception) -> str:
+        if isinstance(error, CircuitOpenError):
+            return "circuit_open"
+        if isinstance(error, httpx.HTTPStatusError):
+            return "status"
+        if isinstance(error, (httpx.TimeoutException, asyncio.TimeoutError)):
+            return "timeout"
+        if isinstance(error, httpx.TransportError):
+            return "transport"
+        return "invalid_response"
+
+    @staticmethod
+    def _error_message(error: Exception) -> str:
+        if isinstance(error, CircuitOpenError):
+            return (
+                "The analysis service is temporarily unavailable. "
+                f"Please try again in {math.ceil(error.retry_after) or 1} seconds."
+            )
+        if isinstance(error, asyncio.TimeoutError):
+            return "The analysis service took too long to respond. Please try again."
+        return "Sorry, there was an error connecting to the analysis service."
+
+    async def get_analysis(self, query: str) -> Tuple[bool, str, Optional[str]]:
         """
         Fetch analysis from the API
         Returns: (success, text, plots)
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/addon/response",
-                json={"query": query},
-                headers=self.headers,
+            response = await self._send(
+                "POST", "/addon/response", "/addon/response", json={"query": query}
             )
-            response.raise_for_status()
             data = response.json()
-            print(f"resp;:{data}")
+            logging.debug(f"Analysis response: {data}")
             return data.get("success"), data.get("text"), data.get("plots")
-        except requests.RequestException as e:
+        except (
+            httpx.HTTPError,
+            ValueError,
+            asyncio.TimeoutError,
+            CircuitOpenError,
+        ) as e:
             logging.error(f"API Error: {str(e)}")
-            return (
-                False,
-                "Sorry, there was an error connecting to the analysis service.",
-                None,
+            return False, self._error_message(e), None
+
+    async def stream_analysis(self, query: str) -> AsyncIterator[dict]:
+        """
+        Stream analysis from the API as server-sent events
+        The stream is opened like any other request and has to end within the
+        endpoint's deadline. Only a stream read to the end counts as a success
+        towards the circuit breaker, one breaking off counts as a failure and
+        one closed early by the caller as neither. Callers should iterate under
+        ``contextlib.aclosing`` so the response is closed when they stop early.
+        Yields: {"type": "delta", "text": str} for every received chunk and
+            finally {"type": "done", "success": bool, "text": str, "plots": list}
+        """
+        endpoint = "/addon/response"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadlines[endpoint]
+        response = None
+        text_parts = []
+        try:
+            response = await self._send(
+                "POST",
+                endpoint,
+                endpoint,
+                stream=True,
+                deadline=deadline,
+                json={"query": query, "stream": True},
+                headers={"Accept": "text/event-stream"},
             )
 
-    def get_plot_image(self, hash_string: str) -> Optional[bytes]:
+            # Backends without streaming support answer with a plain body
+            content_type = response.headers.get("content-type", "")
+            if not content_type.startswith("text/event-stream"):
+                body = await asyncio.wait_for(response.aread(), deadline - loop.time())
+                data = json.loads(body)
+                result = {
+                    "type": "done",
+                    "success": data.get("success"),
+                    "text": data.get("text"),
+                    "plots": data.get("plots"),
+                }
+            else:
+                result = {"type": "done", "success": True, "plots": None}
+                lines = response.aiter_lines()
+                while True:
+                    try:
+                        line = await asyncio.wait_for(
+                            lines.__anext__(), deadline - loop.time()
+                        )
+                    except StopAsyncIteration:
+                        break
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[len("data:") :].strip()
+                    if payload == "[DONE]":
+                        break
+                    event = json.loads(payload)
+                    if event.get("text"):
+                        text_parts.append(event["text"])
+                        yield {"type": "delta", "text": event["text"]}
+                    if "success" in event:
+                        result["success"] = event["success"]
+                    if "plots" in event:
+                        result["plots"] = event["plots"]
+                result["text"] = "".join(text_parts)
+            self._breaker(endpoint).record(True)
+        except (
+            httpx.HTTPError,
+            ValueError,
+            asyncio.TimeoutError,
+            CircuitOpenError,
+        ) as e:
+            logging.error(f"API Error: {str(e)}")
+            if response is not None:
+                # The stream broke off after it was opened
+                BACKEND_ERRORS.inc(endpoint=endpoint, kind=self._error_kind(e))
+                self._breaker(endpoint).record(False)
+            result = {
+                "type": "done",
+                "success": False,
+                "text": self._error_message(e),
+                "plots": None,
+            }
+        finally:
+            if response is not None:
+                await response.aclose()
+        yield result
+
+    async def get_plot_image(self, hash_string: str) -> Optional[bytes]:
         """
         Fetch plot image by hash string
         Returns: Image bytes if successful, None otherwise
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/addon/plot_image/{hash_string}", headers=self.headers
+            response = await self._send(
+                "GET", f"/addon/plot_image/{hash_string}", "/addon/plot_image"
             )
-            response.raise_for_status()
             return response.content
-        except requests.RequestException as e:
+        except (
+            httpx.HTTPError,
+            ValueError,
+            asyncio.TimeoutError,
+            CircuitOpenError,
+        ) as e:
             logging.error(f"Error fetching plot image {hash_string}: {str(e)}")
             return None
 
-    def get_confidence_score(self, symbol: str) -> Tuple[bool, dict | str]:
+    async def _post_symbol(
+        self, endpoint: str, symbol: str, track: bool = True
+    ) -> Tuple[bool, dict | str]:
         """
-        Fetch get_confidence_score from the API
+        POST a symbol to one of the structured per-symbol endpoints
+        Successful responses are cached per (endpoint, normalized symbol) and
+        identical in-flight requests share a single backend call. Requests are
+        counted towards the popularity of the symbol unless ``track`` is off.
+        Returns: (success, data)
+        """
+        key = normalize_symbol(symbol)
+        if track:
+            if endpoint not in self.popularity:
+                self.popularity[endpoint] = DecayingTopK(
+                    settings.POPULARITY_CAPACITY, settings.POPULARITY_HALF_LIFE
+                )
+            self.popularity[endpoint].add(key)
+        return await self._post_cached(
+            self.response_cache, endpoint, (endpoint, key), {"symbol": symbol}
+        )
+
+    def popular_symbols(self, endpoint: str, n: int) -> list[tuple[str, float]]:
+        """The ``n`` most requested normalized symbols with their decayed counts."""
+        if endpoint not in self.popularity:
+            return []
+        return self.popularity[endpoint].top(n)
+
+    def cached_response(
+        self, endpoint: str, symbol: str
+    ) -> Tuple[bool, dict | str] | None:
+        """The cached response for a symbol, without calling the backend."""
+        return self.response_cache.get((endpoint, normalize_symbol(symbol)))
+
+    def cache_expires_in(self, endpoint: str, symbol: str) -> float | None:
+        return self.response_cache.expires_in((endpoint, normalize_symbol(symbol)))
+
+    async def refresh_symbol(
+        self, endpoint: str, symbol: str
+    ) -> Tuple[bool, dict | str]:
+        """
+        Fetch a symbol again and replace its cache entry
+        Refreshes don't count towards the popularity of the symbol.
         Returns: (success, data)
         """
+        return await self._post_cached(
+            self.response_cache,
+            endpoint,
+            (endpoint, normalize_symbol(symbol)),
+            {"symbol": symbol},
+            refresh=True,
+        )
+
+    async def _post_cached(
+        self,
+        cache: TTLCache,
+        endpoint: str,
+        cache_key: tuple,
+        payload: dict,
+        refresh: bool = False,
+    ) -> Tuple[bool, dict | str]:
+        if not refresh:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        async def fetch() -> Tuple[bool, dict | str]:
+            result = await self._request(endpoint, payload)
+            success, data = result
+            if success and data is not None:
+                cache.set(cache_key, result, ttl=self.cache_ttls[endpoint])
+            return result
+
+        return await self.single_flight.do(cache_key, fetch)
+
+    async def _request(self, endpoint: str, payload: dict) -> Tuple[bool, dict | str]:
         try:
-            response = requests.post(
-                f"{self.base_url}/addon/confidence_score",
-                json={"symbol": symbol},
-                headers=self.headers,
-            )
-            response.raise_for_status()
+            response = await self._send("POST", endpoint, endpoint, json=payload)
             data = response.json()
             return data.get("success"), data.get("data")
-        except requests.RequestException as e:
+        except (
+            httpx.HTTPError,
+            ValueError,
+            asyncio.TimeoutError,
+            CircuitOpenError,
+        ) as e:
             logging.error(f"API Error: {str(e)}")
-            return (
-                False,
-                "Sorry, there was an error connecting to the analysis service.",
-            )
+            return False, self._error_message(e)
+
+    async def get_confidence_score(self, symbol: str) -> Tuple[bool, dict | str]:
+        """
+        Fetch get_confidence_score from the API
+        Returns: (success, data)
+        """
+        return await self._post_symbol("/addon/confidence_score", symbol)
 
-    def get_technical_analysis(self, symbol: str) -> Tuple[bool, dict | str]:
+    async def get_technical_analysis(self, symbol: str) -> Tuple[bool, dict | str]:
         """
         Fetch technical_analysi from the API
         Returns: (success, data)
         """
-        try:
-            response = requests.post(
-                f"{self.base_url}/addon/technical",
-                json={"symbol": symbol},
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("success"), data.get("data")
-        except requests.RequestException as e:
-            logging.error(f"API Error: {str(e)}")
-            return (
-                False,
-                "Sorry, there was an error connecting to the analysis service.",
-            )
+        return await self._post_symbol("/addon/technical", symbol)
 
-    def get_crypto_info(self, symbol: str) -> Tuple[bool, str]:
+    async def get_crypto_info(self, symbol: str) -> Tuple[bool, str]:
         """
         Fetch crypto_info from the API
         Returns: (success, text)
         """
-        try:
-            response = requests.post(
-                f"{self.base_url}/addon/coin_info",
-                json={"symbol": symbol},
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("success"), data.get("data")
-        except requests.RequestException as e:
-            logging.error(f"API Error: {str(e)}")
-            return (
-                False,
-                "Sorry, there was an error connecting to the analysis service.",
-            )
+        return await self._post_symbol("/addon/coin_info", symbol)
 
-    def get_price_info(self, symbol: str) -> Tuple[bool, dict | str]:
+    async def get_price_info(
+        self, symbol: str, track: bool = True
+    ) -> Tuple[bool, dict | str]:
         """
         Fetch price_info from the API
         Returns: (success, data)
         """
-        try:
-            response = requests.post(
-                f"{self.base_url}/addon/price_info",
-                json={"symbol": symbol},
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("success"), data.get("data")
-        except requests.RequestException as e:
-            logging.error(f"API Error: {str(e)}")
-            return (
-                False,
-                "Sorry, there was an error connecting to the analysis service.",
-            )
+        return await self._post_symbol("/addon/price_info", symbol, track)
+
+    async def get_wallet_info(self, address: str, chain: str) -> Tuple[bool, str]:
+        """
+        Fetch the analysis of a wallet address from the API
+        Returns: (success, text)
+        """
+        return await self._post_cached(
+            self.wallet_cache,
+            "/addon/wallet_info",
+            ("/addon/wallet_info", chain, address),
+            {"address": address, "chain": chain},
+        )
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Callable
+
+from telegram.ext import ContextTypes
+
+from src.core.metrics import CACHE_WARMED
+from src.services.api_service import AnalysisAPIService
+from src.utils.cache import TTLCache
+from src.utils.logger import get_logger
+from src.utils.markdown import pack_markdown
+
+logger = get_logger(__name__)
+
+
+class CacheWarmer:
+    """Keep the answers for the most requested coins cached.
+
+    Each run refreshes the ``top_n`` most popular symbols of every endpoint in
+    ``renderers`` whose cache entry is missing or expires within
+    ``lead_time`` seconds. Each result is then rendered like a single-coin
+    reply and kept next to it for as long as it is cached, see :meth:`card`.
+    Symbols requested fewer than ``min_score`` times per popularity half-life
+    are left to expire.
+    """
+
+    def __init__(
+        self,
+        api_service: AnalysisAPIService,
+        renderers: dict[str, Callable[[dict], str]],
+        top_n: int,
+        min_score: float,
+        lead_time: float,
+        concurrency: int = 5,
+    ):
+        self.api_service = api_service
+        self.renderers = renderers
+        self.top_n = top_n
+        self.min_score = min_score
+        self.lead_time = lead_time
+        self.concurrency = concurrency
+        # id of a warmed response -> (response, its rendered messages)
+        self.cards = TTLCache(maxsize=2 * top_n * len(renderers))
+
+    def card(self, data: dict) -> list[str] | None:
+        """The messages rendered for a warmed response, None if it wasn't warmed."""
+        entry = self.cards.get(id(data))
+        if entry is None or entry[0] is not data:
+            return None
+        return entry[1]
+
+    def due(self) -> list[tuple[str, str]]:
+        """The ``(endpoint, symbol)`` pairs to refresh now."""
+        due = []
+        for endpoint in self.renderers:
+            if self.api_service.cache_ttls[endpoint] <= 0:
+                continue
+            for symbol, score in self.api_service.popular_symbols(endpoint, self.top_n):
+                if score < self.min_score:
+                    break
+                expires_in = self.api_service.cache_expires_in(endpoint, symbol)
+                if expires_in is None or expires_in <= self.lead_time:
+                    due.append((endpoint, symbol))
+        return due
+
+    async def warm(self) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh(endpoint: str, symbol: str) -> None:
+            async with semaphore:
+                success, data = await self.api_service.refresh_symbol(
+                    endpoint, symbol.upper()
+                )
+            if not success:
+                return
+            CACHE_WARMED.inc(endpoint=endpoint)
+            try:
+                messages = await asyncio.to_thread(
+                    lambda: pack_markdown([self.renderers[endpoint](data)])
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error("Error rendering %s for %s: %s", symbol, endpoint, e)
+                return
+            # The response holds on to its id for as long as the card is kept
+            self.cards.set(
+                id(data), (data, messages), ttl=self.api_service.cache_ttls[endpoint]
+            )
+
+        await asyncio.gather(*(refresh(*pair) for pair in self.due()))
+
+    async def warm_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await self.warm()
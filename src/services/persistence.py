@@ -0,0 +1,355 @@
+import asyncio
+import json
+import pickle
+import sqlite3
+import threading
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any
+
+from telegram.ext import (
+    BasePersistence,
+    ContextTypes,
+    PersistenceInput,
+    PicklePersistence,
+)
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+USER_DATA = "user_data"
+CHAT_DATA = "chat_data"
+BOT_DATA = "bot_data"
+CALLBACK_DATA = "callback_data"
+CONVERSATION = "conversation:"
+
+# Key of the single row stored for bot and callback data
+SINGLETON_KEY = ""
+
+# Failed writes are retried with exponential backoff between these delays
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+# Write attempts on shutdown before the changes are given up
+FLUSH_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _digest(blob: bytes) -> bytes:
+    return blake2b(blob, digest_size=16).digest()
+
+
+class SQLitePersistence(BasePersistence):
+    """Bot persistence on an embedded SQLite database in WAL mode.
+
+    Every user, chat and conversation is stored in its own row. Only rows whose
+    pickled value changed since the last write are written, and all changes of
+    one persistence run are committed in a single transaction off the event
+    loop. On first start, data of an existing ``PicklePersistence`` file at
+    ``migrate_from`` is imported once.
+
+    Worker processes of a sharded deployment share one database and pass
+    ``shared``. The database is then set up beforehand with :meth:`prepare`,
+    and the data of a user, chat or the bot is read again before each update
+    unless this process has unsaved changes to it.
+    """
+
+    def __init__(
+        self,
+        database: str | Path,
+        migrate_from: str | Path | None = None,
+        store_data: PersistenceInput | None = None,
+        update_interval: float = 60,
+        context_types: ContextTypes | None = None,
+        shared: bool = False,
+    ):
+        super().__init__(store_data=store_data, update_interval=update_interval)
+        self.database = Path(database)
+        self.migrate_from = Path(migrate_from) if migrate_from else None
+        self.context_types = context_types or ContextTypes()
+        self.shared = shared
+
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._open_lock = asyncio.Lock()
+        self._digests: dict[tuple[str, str], bytes] = {}
+        self._pending: dict[tuple[str, str], bytes | None] = {}
+        self._write_task: asyncio.Task | None = None
+        self._closing = False
+        self._retry_now = asyncio.Event()
+
+    async def get_user_data(self) -> dict[int, Any]:
+        rows = await self._load(USER_DATA)
+        return {int(key): value for key, value in rows.items()}
+
+    async def get_chat_data(self) -> dict[int, Any]:
+        rows = await self._load(CHAT_DATA)
+        return {int(key): value for key, value in rows.items()}
+
+    async def get_bot_data(self) -> Any:
+        rows = await self._load(BOT_DATA)
+        return rows.get(SINGLETON_KEY, self.context_types.bot_data())
+
+    async def get_callback_data(self) -> Any:
+        rows = await self._load(CALLBACK_DATA)
+        return rows.get(SINGLETON_KEY)
+
+    async def get_conversations(self, name: str) -> dict:
+        rows = await self._load(CONVERSATION + name)
+        return {tuple(json.loads(key)): value for key, value in rows.items()}
+
+    async def update_conversation(
+        self, name: str, key: tuple[int | str, ...], new_state: object | None
+    ) -> None:
+        row_key = json.dumps(list(key))
+        if new_state is None:
+            self._drop(CONVERSATION + name, row_key)
+        else:
+            self._stage(CONVERSATION + name, row_key, new_state)
+
+    async def update_user_data(self, user_id: int, data: Any) -> None:
+        self._stage(USER_DATA, str(user_id), data)
+
+    async def update_chat_data(self, chat_id: int, data: Any) -> None:
+        self._stage(CHAT_DATA, str(chat_id), data)
+
+    async def update_bot_data(self, data: Any) -> None:
+        self._stage(BOT_DATA, SINGLETON_KEY, data)
+
+    async def update_callback_data(self, data: Any) -> None:
+        self._stage(CALLBACK_DATA, SINGLETON_KEY, data)
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._drop(USER_DATA, str(user_id))
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        self._drop(CHAT_DATA, str(chat_id))
+
+    async def refresh_user_data(self, user_id: int, user_data: Any) -> None:
+        # A user talking in chats of several workers is seen by all of them
+        await self._refresh(USER_DATA, str(user_id), user_data)
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: Any) -> None:
+        await self._refresh(CHAT_DATA, str(chat_id), chat_data)
+
+    async def refresh_bot_data(self, bot_data: Any) -> None:
+        await self._refresh(BOT_DATA, SINGLETON_KEY, bot_data)
+
+    async def prepare(self) -> None:
+        """Create the database and import ``migrate_from``, then close it.
+
+        Run once before starting the processes that share the database.
+        """
+        await self._open()
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write outstanding changes and close the database."""
+        self._closing = True
+        self._retry_now.set()
+        if self._write_task is not None:
+            await self._write_task
+        await self._write_pending()
+        if self._connection is not None:
+            await asyncio.to_thread(self._connection.close)
+            self._connection = None
+
+    def _stage(self, namespace: str, key: str, data: Any) -> None:
+        blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = _digest(blob)
+        if self._digests.get((namespace, key)) == digest:
+            return
+        self._digests[(namespace, key)] = digest
+        self._pending[(namespace, key)] = blob
+        self._schedule_write()
+
+    async def _refresh(self, namespace: str, key: str, data: Any) -> None:
+        """Replace ``data`` in place with the stored row if another process
+        changed it. Without ``shared`` nothing else writes to the database."""
+        if not self.shared or self._dirty((namespace, key), data):
+            return
+        await self._open()
+        blob = await asyncio.to_thread(self._read_row, namespace, key)
+        known = self._digests.get((namespace, key))
+        if blob is None:
+            if known is not None:
+                self._digests.pop((namespace, key))
+                data.clear()
+            return
+        digest = _digest(blob)
+        if digest != known:
+            self._digests[(namespace, key)] = digest
+            data.clear()
+            data.update(pickle.loads(blob))
+
+    def _dirty(self, row: tuple[str, str], data: Any) -> bool:
+        """Whether ``data`` has changes this process did not write yet."""
+        if row in self._pending:
+            return True
+        known = self._digests.get(row)
+        if known is None:
+            return bool(data)
+        return _digest(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)) != known
+
+    def _drop(self, namespace: str, key: str) -> None:
+        if self._digests.pop((namespace, key), None) is None:
+            return
+        self._pending[(namespace, key)] = None
+        self._schedule_write()
+
+    def _schedule_write(self) -> None:
+        # Updates of one persistence run are staged back to back, so a single
+        # task scheduled after the first of them commits them all together
+        if self._write_task is None or self._write_task.done():
+            self._write_task = asyncio.create_task(self._write_pending())
+
+    async def _write_pending(self) -> None:
+        await self._open()
+        delay, failures = RETRY_DELAY, 0
+        while self._pending:
+            batch, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except sqlite3.Error as e:
+                # Rows staged meanwhile are newer than the ones that failed
+                self._pending = batch | self._pending
+                failures += 1
+                if self._closing and failures >= FLUSH_ATTEMPTS:
+                    logger.error(
+                        "Giving up on %d persistence rows: %s", len(self._pending), e
+                    )
+                    self._pending = {}
+                    return
+                logger.error(
+                    "Error writing %d persistence rows, retrying in %.0fs: %s",
+                    len(batch),
+                    delay,
+                    e,
+                )
+                try:
+                    await asyncio.wait_for(self._retry_now.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+            else:
+                delay, failures = RETRY_DELAY, 0
+
+    def _write(self, batch: dict[tuple[str, str], bytes | None]) -> None:
+        upserts = [(*row, blob) for row, blob in batch.items() if blob is not None]
+        deletes = [row for row, blob in batch.items() if blob is None]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO state (namespace, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value",
+                upserts,
+            )
+            self._connection.executemany(
+                "DELETE FROM state WHERE namespace = ? AND key = ?", deletes
+            )
+
+    async def _load(self, namespace: str) -> dict[str, Any]:
+        await self._open()
+        rows = await asyncio.to_thread(self._read, namespace)
+        data = {}
+        for key, blob in rows:
+            self._digests[(namespace, key)] = _digest(blob)
+            data[key] = pickle.loads(blob)
+        return data
+
+    def _read(self, namespace: str) -> list[tuple[str, bytes]]:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT key, value FROM state WHERE namespace = ?", (namespace,)
+            ).fetchall()
+
+    def _read_row(self, namespace: str, key: str) -> bytes | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM state WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        return row[0] if row else None
+
+    async def _open(self) -> None:
+        async with self._open_lock:
+            if self._connection is not None:
+                return
+            self._connection = await asyncio.to_thread(self._connect)
+            if self.shared:
+                return
+            if self.migrate_from and self.migrate_from.is_file():
+                await self._migrate(self.migrate_from)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.shared:
+            # Set up by prepare(), WAL mode is a property of the database file
+            connection = sqlite3.connect(self.database, check_same_thread=False)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            return connection
+        self.database.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.database, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    async def _migrate(self, path: Path) -> None:
+        with self._lock:
+            migrated = self._connection.execute(
+                "SELECT value FROM meta WHERE name = 'migrated_from'"
+            ).fetchone()
+        if migrated:
+            return
+
+        source = PicklePersistence(
+            filepath=path,
+            store_data=self.store_data,
+            context_types=self.context_types,
+        )
+        source.set_bot(self.bot)
+        rows: dict[tuple[str, str], Any] = {}
+        if self.store_data.user_data:
+            for user_id, data in (await source.get_user_data()).items():
+                rows[(USER_DATA, str(user_id))] = data
+        if self.store_data.chat_data:
+            for chat_id, data in (await source.get_chat_data()).items():
+                rows[(CHAT_DATA, str(chat_id))] = data
+        if self.store_data.bot_data:
+            rows[(BOT_DATA, SINGLETON_KEY)] = await source.get_bot_data()
+        if self.store_data.callback_data:
+            callback_data = await source.get_callback_data()
+            if callback_data is not None:
+                rows[(CALLBACK_DATA, SINGLETON_KEY)] = callback_data
+        for name, conversation in (source.conversations or {}).items():
+            for key, state in conversation.items():
+                rows[(CONVERSATION + name, json.dumps(list(key)))] = state
+
+        batch = {
+            row: pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            for row, data in rows.items()
+        }
+        await asyncio.to_thread(self._write_migration, batch, str(path))
+        logger.info("Migrated %d persistence rows from %s", len(batch), path)
+
+    def _write_migration(self, batch: dict[tuple[str, str], bytes], path: str) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO state (namespace, key, value) VALUES (?, ?, ?)",
+                [(*row, blob) for row, blob in batch.items()],
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('migrated_from', ?)",
+                (path,),
+            )
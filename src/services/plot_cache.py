@@ -0,0 +1,155 @@
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_HASH_PATTERN = re.compile(r"[A-Za-z0-9_-]{4,128}")
+
+
+class PlotCache:
+    """On-disk LRU cache for plot images, keyed by their content hash.
+
+    Plot hashes are content-addressed, so cached files never go stale and only
+    have to be evicted to stay within ``max_bytes``. Files are sharded into
+    two levels of sub-directories taken from the hash prefix.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def stats(self) -> dict[str, int]:
+        """Counters used to size the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+        }
+
+    def get(self, hash_string: str) -> mmap.mmap | None:
+        """Return a read-only memory map of the cached image.
+
+        The caller owns the returned map and must close it once the image has
+        been consumed. Performs blocking file IO, and the first call indexes
+        the cache directory, so run it off the event loop.
+        """
+        if not self.enabled or not _HASH_PATTERN.fullmatch(hash_string):
+            return None
+
+        with self._lock:
+            self._load()
+            if hash_string not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(hash_string)
+
+        path = self._path(hash_string)
+        try:
+            with open(path, "rb") as file:
+                image = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except (OSError, ValueError) as e:
+            logger.warning("Dropping unreadable cached plot %s: %s", hash_string, e)
+            with self._lock:
+                self._forget(hash_string)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return image
+
+    def put(self, hash_string: str, image: bytes) -> None:
+        """Store an image and evict least recently used ones over budget.
+
+        Performs blocking file IO, run it off the event loop.
+        """
+        if (
+            not self.enabled
+            or not image
+            or len(image) > self.max_bytes
+            or not _HASH_PATTERN.fullmatch(hash_string)
+        ):
+            return
+
+        path = self._path(hash_string)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(image)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not cache plot %s: %s", hash_string, e)
+            return
+
+        with self._lock:
+            self._load()
+            self._forget(hash_string)
+            self._entries[hash_string] = len(image)
+            self._total_bytes += len(image)
+            self._evict()
+
+    def _path(self, hash_string: str) -> Path:
+        return self.directory / hash_string[:2] / hash_string[2:4] / hash_string
+
+    def _forget(self, hash_string: str) -> None:
+        size = self._entries.pop(hash_string, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and self._entries:
+            hash_string, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                self._path(hash_string).unlink()
+            except OSError:
+                pass
+
+    def _load(self) -> None:
+        """Index files left by previous runs, oldest access first."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        found = []
+        for path in self.directory.glob("*/*/*"):
+            if not path.is_file() or not _HASH_PATTERN.fullmatch(path.name):
+                continue
+            stat = path.stat()
+            found.append((stat.st_mtime, path.name, stat.st_size))
+
+        for _, hash_string, size in sorted(found):
+            self._entries[hash_string] = size
+            self._total_bytes += size
+        self._evict()
+        logger.info(
+            "Plot cache loaded %d images (%d bytes)",
+            len(self._entries),
+            self._total_bytes,
+        )
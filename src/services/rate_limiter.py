@@ -0,0 +1,153 @@
+import asyncio
+import heapq
+import itertools
+from typing import Any, Callable, Coroutine
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from src.core.metrics import TELEGRAM_DROPPED, TELEGRAM_RATE_LIMITED
+from src.utils.logger import get_logger
+from src.utils.token_bucket import TokenBucket, TokenBuckets
+
+logger = get_logger(__name__)
+
+# Lower values are sent first once the global limit is reached
+PRIORITY_ANSWER = 0
+PRIORITY_MESSAGE = 1
+PRIORITY_ACTION = 2
+
+ANSWER_ENDPOINTS = frozenset({"answerCallbackQuery", "answerInlineQuery"})
+ACTION_ENDPOINTS = frozenset({"sendChatAction"})
+
+
+class PriorityRateLimiter(BaseRateLimiter):
+    """Pace outgoing Bot API calls under Telegram's flood limits.
+
+    Calls to a chat wait for a token of that chat, and additionally of the
+    group for group chats. All calls then take a token of the global bucket in
+    priority order: answers to callback and inline queries first, then
+    messages, then chat actions. Chat actions are dropped when they would have
+    to wait. On ``RetryAfter`` the affected bucket is paused and the call is
+    retried up to ``max_retries`` times.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        group_rate: float = 20 / 60,
+        group_burst: float = 20.0,
+        max_retries: int = 2,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.max_retries = max_retries
+
+        self._chat_buckets = TokenBuckets(chat_rate, chat_burst)
+        self._group_buckets = TokenBuckets(group_rate, group_burst)
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._scheduler: asyncio.Task | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+        for _, _, waiter in self._queue:
+            waiter.cancel()
+        self._queue.clear()
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, bool | dict | list[dict]]],
+        args: Any,
+        kwargs: dict[str, Any],
+        endpoint: str,
+        data: dict[str, Any],
+        rate_limit_args: int | None,
+    ) -> bool | dict | list[dict]:
+        chat_id = data.get("chat_id")
+        priority = self._priority(endpoint, chat_id, rate_limit_args)
+        if priority is None:
+            return await callback(*args, **kwargs)
+
+        buckets = self._buckets(chat_id)
+        if priority == PRIORITY_ACTION and (
+            self._queue or not all(bucket.available() for bucket in buckets)
+        ):
+            # Typing indicators are only useful right away
+            TELEGRAM_DROPPED.inc(method=endpoint)
+            return True
+
+        for attempt in range(self.max_retries + 1):
+            delay = max((bucket.reserve() for bucket in buckets), default=0.0)
+            if delay:
+                TELEGRAM_RATE_LIMITED.inc(method=endpoint)
+                await asyncio.sleep(delay)
+            await self._global_turn(priority)
+
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                retry_after = e.retry_after
+                if not isinstance(retry_after, (int, float)):
+                    retry_after = retry_after.total_seconds()
+                logger.warning(
+                    "Flood control on %s for chat %s, retrying in %ss",
+                    endpoint,
+                    chat_id,
+                    retry_after,
+                )
+                for bucket in buckets or (self.global_bucket,):
+                    bucket.pause(retry_after)
+                if attempt == self.max_retries:
+                    raise
+
+    def _priority(
+        self, endpoint: str, chat_id: int | str | None, rate_limit_args: int | None
+    ) -> int | None:
+        if rate_limit_args is not None:
+            return rate_limit_args
+        if endpoint in ANSWER_ENDPOINTS:
+            return PRIORITY_ANSWER
+        if endpoint in ACTION_ENDPOINTS:
+            return PRIORITY_ACTION
+        if chat_id is not None:
+            return PRIORITY_MESSAGE
+        # Calls that do not post to a chat are not subject to the limits
+        return None
+
+    def _buckets(self, chat_id: int | str | None) -> list[TokenBucket]:
+        if chat_id is None:
+            return []
+        buckets = [self._chat_buckets[chat_id]]
+        if isinstance(chat_id, str) or chat_id < 0:
+            buckets.append(self._group_buckets[chat_id])
+        return buckets
+
+    async def _global_turn(self, priority: int) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), waiter))
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self._schedule())
+        await waiter
+
+    async def _schedule(self) -> None:
+        # The next waiter is picked only once a global token is available, so
+        # calls queued meanwhile with a higher priority go first
+        while self._queue:
+            delay = self.global_bucket.reserve()
+            if delay:
+                await asyncio.sleep(delay)
+            while self._queue:
+                _, _, waiter = heapq.heappop(self._queue)
+                if not waiter.done():
+                    waiter.set_result(None)
+                    break
@@ -0,0 +1,209 @@
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from urllib.parse import urlparse
+
+from src.core.cofig import settings
+from src.models.modes import Modes
+
+
+class StateStore(ABC):
+    """String key-value store for state shared by all worker processes."""
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str | None) -> None:
+        """Store ``value`` under ``key``, deleting the key when it is None."""
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryStateStore(StateStore):
+    """Process-local store, for a single process and for tests."""
+
+    def __init__(self):
+        self._data: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self._data.get(key)
+
+    async def set(self, key: str, value: str | None) -> None:
+        if value is None:
+            self._data.pop(key, None)
+        else:
+            self._data[key] = value
+
+
+class SQLiteStateStore(StateStore):
+    """Store in a SQLite database in WAL mode, shared by processes on one host."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str | None) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await asyncio.to_thread(self._connection.close)
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS state "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _get(self, key: str) -> str | None:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT value FROM state WHERE key = ?", (key,))
+                .fetchone()
+            )
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str | None) -> None:
+        with self._lock, self._connect() as connection:
+            if value is None:
+                connection.execute("DELETE FROM state WHERE key = ?", (key,))
+            else:
+                connection.execute(
+                    "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                    (key, value),
+                )
+
+
+class RedisStateStore(StateStore):
+    """Network store speaking the Redis protocol, for workers on several hosts.
+
+    Only ``GET``, ``SET`` and ``DEL`` are used, over one connection that is
+    opened on first use and reopened after a connection error.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.database = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> str | None:
+        value = await self._command("GET", key)
+        return value.decode() if value is not None else None
+
+    async def set(self, key: str, value: str | None) -> None:
+        if value is None:
+            await self._command("DEL", key)
+        else:
+            await self._command("SET", key, value)
+
+    async def close(self) -> None:
+        async with self._lock:
+            self._disconnect()
+
+    async def _command(self, *args: str) -> bytes | int | str | None:
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None:
+                        await self._connect()
+                    return await asyncio.wait_for(self._call(*args), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    self._disconnect()
+                    if attempt:
+                        raise
+                except asyncio.TimeoutError:
+                    self._disconnect()
+                    raise
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        if self.password:
+            await self._call("AUTH", self.password)
+        if self.database:
+            await self._call("SELECT", str(self.database))
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def _call(self, *args: str) -> bytes | int | str | None:
+        command = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg.encode()
+            command.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._writer.write(b"".join(command))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> bytes | int | str | None:
+        line = await self._reader.readuntil(b"\r\n")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RuntimeError(f"Redis error: {payload.decode()}")
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        raise ConnectionError(f"Unexpected Redis reply: {line!r}")
+
+
+class UserModes:
+    """Chat mode of every user, kept in the shared state store."""
+
+    def __init__(self, store: StateStore):
+        self.store = store
+
+    async def get(self, user_id: int, user_data: dict | None = None) -> Modes | None:
+        value = await self.store.get(f"mode:{user_id}")
+        if value is None and user_data and user_data.get("mode"):
+            # Modes used to live in user_data, move them over on first use
+            mode = Modes(user_data.pop("mode"))
+            await self.set(user_id, mode)
+            return mode
+        return Modes(value) if value else None
+
+    async def set(self, user_id: int, mode: Modes | None) -> None:
+        await self.store.set(f"mode:{user_id}", mode.value if mode else None)
+
+
+def create_state_store() -> StateStore:
+    if settings.STATE_STORE == "redis":
+        return RedisStateStore(settings.STATE_STORE_URL)
+    if settings.STATE_STORE == "memory":
+        return MemoryStateStore()
+    return SQLiteStateStore(settings.state_store_path)
+
+
+state_store = create_state_store()
+user_modes = UserModes(state_store)
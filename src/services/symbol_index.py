@@ -0,0 +1,236 @@
+import asyncio
+import json
+import os
+import re
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import httpx
+from telegram.ext import ContextTypes
+
+from src.core.cofig import settings
+from src.utils.logger import get_logger
+from src.utils.symbols import normalize_symbol
+
+logger = get_logger(__name__)
+
+# Symbols and names shorter than this are too ambiguous for typo matching
+_MIN_TYPO_LENGTH = 3
+# Longer queries are words like "bitcoin", which memecoins also use as symbol
+_MAX_TICKER_LENGTH = 5
+
+
+@dataclass(frozen=True, slots=True)
+class Coin:
+    id: str
+    symbol: str
+    name: str
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", normalize_symbol(text))
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Whether ``a`` and ``b`` differ by one insertion, deletion, substitution
+    or transposition of adjacent characters."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    prefix = 0
+    while prefix < min(len(a), len(b)) and a[prefix] == b[prefix]:
+        prefix += 1
+    a, b = a[prefix:], b[prefix:]
+    return (
+        a[1:] == b[1:]
+        or a[1:] == b
+        or a == b[1:]
+        or (len(a) == len(b) >= 2 and a[0] == b[1] and a[1] == b[0] and a[2:] == b[2:])
+    )
+
+
+class SymbolIndex:
+    """In-memory index of known coins by symbol, id and name.
+
+    Exact lookups are hash lookups and prefix lookups bisect a sorted array of
+    aliases. One edit leaves the first or the last character in place, so
+    typo suggestions only compare the query with the aliases of similar
+    length that share one of them. That is slower than an index of every
+    alias with one character deleted, but fast enough for the unknown coins
+    that need it, and such an index takes well over 100 MB in every worker.
+
+    Short queries are looked up as symbols first and longer ones as ids and
+    names first, so "bitcoin" is Bitcoin rather than a memecoin with that
+    symbol. When several coins share a symbol the one with the shortest id
+    wins, which is the original coin far more often than not. The coin list
+    has no market caps to rank them by.
+    """
+
+    def __init__(self, coins: Iterable[Coin]):
+        self.coins = sorted(coins, key=lambda coin: (len(coin.id), coin.id))
+        self._by_symbol: dict[str, Coin] = {}
+        self._by_id: dict[str, Coin] = {}
+        self._by_name: dict[str, Coin] = {}
+        # (length, first or last character) -> aliases
+        self._by_first: dict[tuple[int, str], list[str]] = {}
+        self._by_last: dict[tuple[int, str], list[str]] = {}
+        aliases: dict[str, Coin] = {}
+
+        for coin in self.coins:
+            for mapping, alias in (
+                (self._by_symbol, _normalize(coin.symbol)),
+                (self._by_id, _normalize(coin.id)),
+                (self._by_name, _normalize(coin.name)),
+            ):
+                if not alias:
+                    continue
+                mapping.setdefault(alias, coin)
+                aliases.setdefault(alias, coin)
+
+        for alias in aliases:
+            if len(alias) >= _MIN_TYPO_LENGTH:
+                self._by_first.setdefault((len(alias), alias[0]), []).append(alias)
+                self._by_last.setdefault((len(alias), alias[-1]), []).append(alias)
+
+        self._aliases = sorted(aliases)
+        self._alias_coins = aliases
+
+    def __len__(self) -> int:
+        return len(self.coins)
+
+    def resolve(self, query: str) -> Coin | None:
+        """The coin ``query`` names exactly, by symbol, id or name."""
+        key = _normalize(query)
+        if len(key) > _MAX_TICKER_LENGTH:
+            mappings = (self._by_id, self._by_name, self._by_symbol)
+        else:
+            mappings = (self._by_symbol, self._by_id, self._by_name)
+        for mapping in mappings:
+            coin = mapping.get(key)
+            if coin:
+                return coin
+        return None
+
+    def prefix(self, query: str, limit: int = 5) -> list[Coin]:
+        """Coins with an alias starting with ``query``, shortest alias first."""
+        key = _normalize(query)
+        if not key:
+            return []
+        matches = []
+        index = bisect_left(self._aliases, key)
+        while index < len(self._aliases) and self._aliases[index].startswith(key):
+            matches.append(self._aliases[index])
+            index += 1
+            if len(matches) >= limit * 20:
+                break
+        matches.sort(key=len)
+        return self._distinct(self._alias_coins[alias] for alias in matches)[:limit]
+
+    def suggest(self, query: str, limit: int = 3) -> list[Coin]:
+        """Coins one typo away from ``query``, then coins it is a prefix of."""
+        key = _normalize(query)
+        candidates = []
+        if len(key) >= _MIN_TYPO_LENGTH:
+            for length in range(len(key) - 1, len(key) + 2):
+                candidates.extend(self._by_first.get((length, key[0]), ()))
+                candidates.extend(self._by_last.get((length, key[-1]), ()))
+        typos = sorted(
+            {alias for alias in candidates if _within_one_edit(key, alias)},
+            key=lambda alias: (alias not in self._by_symbol, len(alias), alias),
+        )
+        coins = [self._alias_coins[alias] for alias in typos]
+        return self._distinct([*coins, *self.prefix(key, limit)])[:limit]
+
+    @staticmethod
+    def _distinct(coins: Iterable[Coin]) -> list[Coin]:
+        return list(dict.fromkeys(coins))
+
+
+class SymbolRegistry:
+    """The current :class:`SymbolIndex`, backed by a coin list snapshot on disk.
+
+    The snapshot is refreshed from ``url`` once it is older than
+    ``refresh_interval`` and the index is swapped atomically. Without ``url``
+    the snapshot is provided by the deployment and only reloaded when it
+    changes. Until a snapshot exists the index is empty and queries are not
+    validated.
+    """
+
+    def __init__(self, path: str | Path, url: str, refresh_interval: float):
+        self.path = Path(path)
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.index = SymbolIndex([])
+        self._loaded_mtime = 0.0
+
+    def load(self) -> None:
+        """Build the index from the snapshot if it changed since the last load."""
+        try:
+            mtime = self.path.stat().st_mtime
+            if mtime <= self._loaded_mtime:
+                return
+            entries = json.loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error("Error reading coin list snapshot %s: %s", self.path, e)
+            return
+
+        self.index = self._build(entries)
+        self._loaded_mtime = mtime
+        logger.info("Loaded %d coins from %s", len(self.index), self.path)
+
+    def stale(self) -> bool:
+        try:
+            age = time.time() - self.path.stat().st_mtime
+        except FileNotFoundError:
+            return True
+        return age >= self.refresh_interval
+
+    async def refresh(self) -> None:
+        """Download a new snapshot when the current one is stale.
+
+        Snapshots written meanwhile by other processes are picked up as well.
+        """
+        if not self.url or not self.stale():
+            await asyncio.to_thread(self.load)
+            return
+
+        try:
+            async with httpx.AsyncClient(timeout=30) as client:
+                response = await client.get(self.url)
+                response.raise_for_status()
+            index = await asyncio.to_thread(self._build, response.json())
+            mtime = await asyncio.to_thread(self._write, response.content)
+        except (httpx.HTTPError, OSError, ValueError, KeyError, TypeError) as e:
+            logger.error("Error refreshing coin list from %s: %s", self.url, e)
+            await asyncio.to_thread(self.load)
+            return
+
+        self.index, self._loaded_mtime = index, mtime
+        logger.info("Refreshed coin list with %d coins", len(index))
+
+    async def refresh_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await self.refresh()
+
+    @staticmethod
+    def _build(entries: list[dict]) -> SymbolIndex:
+        return SymbolIndex(
+            Coin(entry["id"], entry["symbol"], entry["name"]) for entry in entries
+        )
+
+    def _write(self, content: bytes) -> float:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, self.path)
+        return self.path.stat().st_mtime
+
+
+symbol_registry = SymbolRegistry(
+    settings.coin_list_path,
+    url=settings.COIN_LIST_URL,
+    refresh_interval=settings.COIN_LIST_REFRESH_INTERVAL,
+)
@@ -0,0 +1,32 @@
+import time
+
+from telegram.request import HTTPXRequest, RequestData
+
+from src.core.metrics import TELEGRAM_ERRORS, TELEGRAM_LATENCY
+
+
+class InstrumentedHTTPXRequest(HTTPXRequest):
+    """HTTPXRequest recording the latency of every Telegram Bot API call."""
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: RequestData | None = None,
+        **kwargs,
+    ) -> tuple[int, bytes]:
+        api_method = url.rsplit("/", 1)[-1]
+        start = time.perf_counter()
+        try:
+            code, payload = await super().do_request(
+                url, method, request_data, **kwargs
+            )
+        except Exception:
+            TELEGRAM_ERRORS.inc(method=api_method)
+            raise
+        finally:
+            TELEGRAM_LATENCY.observe(time.perf_counter() - start, method=api_method)
+
+        if code >= 400:
+            TELEGRAM_ERRORS.inc(method=api_method)
+        return code, payload
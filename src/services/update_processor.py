@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any, Awaitable
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+
+def update_chat_key(update: object) -> int | None:
+    """Chat an update belongs to, or its user for updates outside of a chat."""
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat is not None:
+        return update.effective_chat.id
+    if update.effective_user is not None:
+        return update.effective_user.id
+    return None
+
+
+class _ChatLane:
+    __slots__ = ("depth", "lock")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.depth = 0
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Process updates of different chats concurrently, in order within a chat.
+
+    Updates of one chat wait for their turn on a FIFO lock of that chat before
+    taking one of the ``max_concurrent_updates`` slots, so a chat with a
+    backlog never holds slots other chats could use. The semaphore of the base
+    class only bounds the number of updates admitted at once, waiting ones
+    included.
+    """
+
+    def __init__(self, max_concurrent_updates: int, max_pending_updates: int = 4096):
+        super().__init__(max(max_pending_updates, max_concurrent_updates))
+        self.concurrency_limit = max_concurrent_updates
+        self._slots = asyncio.Semaphore(max_concurrent_updates)
+        self._running = 0
+        self._lanes: dict[int, _ChatLane] = {}
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def queue_depths(self) -> dict[int, int]:
+        """Updates admitted but not finished yet, per chat."""
+        return {key: lane.depth for key, lane in self._lanes.items()}
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any]
+    ) -> None:
+        key = update_chat_key(update)
+        if key is None:
+            await self._run(coroutine)
+            return
+
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _ChatLane()
+        lane.depth += 1
+        try:
+            async with lane.lock:
+                await self._run(coroutine)
+        finally:
+            lane.depth -= 1
+            if not lane.depth:
+                del self._lanes[key]
+
+    async def _run(self, coroutine: Awaitable[Any]) -> None:
+        async with self._slots:
+            self._running += 1
+            try:
+                await coroutine
+            finally:
+                self._running -= 1
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
@@ -0,0 +1,187 @@
+import re
+from dataclasses import dataclass
+from hashlib import sha256
+
+_BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_BASE58_INDEX = {char: index for index, char in enumerate(_BASE58_ALPHABET)}
+_BECH32_ALPHABET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_BECH32_CONSTANTS = {0: 1, 1: 0x2BC830A3}  # bech32 for witness v0, bech32m after
+
+_EVM_LIKE = re.compile(r"0x\w{38,42}", re.IGNORECASE)
+_BECH32_LIKE = re.compile(r"bc1[a-z0-9]{6,87}", re.IGNORECASE)
+_BASE58_LIKE = re.compile(r"[1-9A-HJ-NP-Za-km-z]{25,44}")
+
+_BITCOIN_VERSIONS = {0x00, 0x05}
+_TRON_VERSION = 0x41
+
+_MASK = (1 << 64) - 1
+
+
+def _keccak_constants() -> tuple[list[int], list[int]]:
+    rotations = [0] * 25
+    x, y = 1, 0
+    for t in range(24):
+        rotations[x + 5 * y] = (t + 1) * (t + 2) // 2 % 64
+        x, y = y, (2 * x + 3 * y) % 5
+
+    round_constants = []
+    lfsr = 1
+    for _ in range(24):
+        constant = 0
+        for j in range(7):
+            if lfsr & 1:
+                constant |= 1 << ((1 << j) - 1)
+            lfsr <<= 1
+            if lfsr & 0x100:
+                lfsr ^= 0x171
+        round_constants.append(constant)
+    return rotations, round_constants
+
+
+_ROTATIONS, _ROUND_CONSTANTS = _keccak_constants()
+
+
+def _rotate(value: int, shift: int) -> int:
+    return ((value << shift) | (value >> (64 - shift))) & _MASK if shift else value
+
+
+def _keccak_f(state: list[int]) -> list[int]:
+    for constant in _ROUND_CONSTANTS:
+        columns = [
+            state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20]
+            for x in range(5)
+        ]
+        state = [
+            lane ^ columns[(i - 1) % 5] ^ _rotate(columns[(i + 1) % 5], 1)
+            for i, lane in enumerate(state)
+        ]
+        moved = [0] * 25
+        for i, lane in enumerate(state):
+            x, y = i % 5, i // 5
+            moved[y + 5 * ((2 * x + 3 * y) % 5)] = _rotate(lane, _ROTATIONS[i])
+        state = [
+            moved[i]
+            ^ (~moved[(i + 1) % 5 + i // 5 * 5] & moved[(i + 2) % 5 + i // 5 * 5])
+            for i in range(25)
+        ]
+        state[0] ^= constant
+    return state
+
+
+def keccak256(data: bytes) -> bytes:
+    """Keccak-256 as used by Ethereum, which predates the SHA-3 padding."""
+    rate = 136
+    padded = bytearray(data) + b"\x01" + bytes(-(len(data) + 1) % rate)
+    padded[-1] |= 0x80
+    state = [0] * 25
+    for offset in range(0, len(padded), rate):
+        for i in range(rate // 8):
+            start = offset + 8 * i
+            state[i] ^= int.from_bytes(padded[start : start + 8], "little")
+        state = _keccak_f(state)
+    return b"".join(lane.to_bytes(8, "little") for lane in state[:4])
+
+
+def to_checksum_address(address: str) -> str:
+    """EIP-55 mixed-case checksum encoding of a ``0x`` address."""
+    digits = address[2:].lower()
+    digest = keccak256(digits.encode()).hex()
+    return "0x" + "".join(
+        char.upper() if int(nibble, 16) >= 8 else char
+        for char, nibble in zip(digits, digest)
+    )
+
+
+def _base58_decode(text: str) -> bytes:
+    number = 0
+    for char in text:
+        number = number * 58 + _BASE58_INDEX[char]
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    leading_zeros = len(text) - len(text.lstrip("1"))
+    return bytes(leading_zeros) + body
+
+
+def _base58check_version(text: str) -> int | None:
+    """Version byte of a 21 byte base58check payload, None if the check fails."""
+    data = _base58_decode(text)
+    payload, checksum = data[:-4], data[-4:]
+    if len(payload) != 21 or sha256(sha256(payload).digest()).digest()[:4] != checksum:
+        return None
+    return payload[0]
+
+
+def _bech32_valid(address: str) -> bool:
+    if address != address.lower() and address != address.upper():
+        return False
+    address = address.lower()
+    # Only the "bc" prefix is matched, and "1" is no data character
+    hrp, data = address[:2], address[3:]
+    if len(address) not in (42, 62) or any(c not in _BECH32_ALPHABET for c in data):
+        return False
+    values = [_BECH32_ALPHABET.index(c) for c in data]
+
+    checksum = 1
+    expanded = [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+    for value in expanded + values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1FFFFFF) << 5 ^ value
+        for i, generator in enumerate(
+            (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+        ):
+            if top >> i & 1:
+                checksum ^= generator
+    version = values[0]
+    return checksum == _BECH32_CONSTANTS[min(version, 1)] and version <= 16
+
+
+@dataclass(frozen=True, slots=True)
+class WalletAddress:
+    chain: str
+    # Canonical spelling, lowercase for EVM and bech32 addresses
+    address: str
+
+
+def parse_address(text: str) -> tuple[WalletAddress | None, str | None]:
+    """Recognize a wallet address of a common chain.
+
+    Returns the address and None, None and an error when ``text`` looks like an
+    address but is malformed, or None and None when it is no address at all.
+    Supports EVM addresses with EIP-55 checksums, Bitcoin legacy and segwit
+    addresses, Tron and Solana addresses.
+
+    Examples:
+        ``"0x742d35Cc6634C0532925a3b844Bc454e4438f44e"`` ->
+        ``WalletAddress("evm", "0x742d35cc6634c0532925a3b844bc454e4438f44e")``
+    """
+    text = text.strip()
+
+    if _EVM_LIKE.fullmatch(text):
+        digits = text[2:]
+        if len(digits) != 40 or not re.fullmatch(r"[0-9a-fA-F]+", digits):
+            return None, "invalid EVM address, expected 40 hex digits after 0x"
+        # Single-case addresses carry no checksum, which spares hashing them
+        mixed_case = digits not in (digits.lower(), digits.upper())
+        if mixed_case and digits != to_checksum_address(text)[2:]:
+            return None, "invalid EVM address, the checksum does not match"
+        return WalletAddress("evm", "0x" + digits.lower()), None
+
+    if _BECH32_LIKE.fullmatch(text):
+        if not _bech32_valid(text):
+            return None, "invalid Bitcoin address, the checksum does not match"
+        return WalletAddress("bitcoin", text.lower()), None
+
+    if not _BASE58_LIKE.fullmatch(text):
+        return None, None
+    version = _base58check_version(text)
+    if version in _BITCOIN_VERSIONS and text[0] in "13":
+        return WalletAddress("bitcoin", text), None
+    if version == _TRON_VERSION:
+        return WalletAddress("tron", text), None
+    # Solana addresses are bare 32 byte public keys without a checksum
+    if len(text) >= 32 and len(_base58_decode(text)) == 32:
+        return WalletAddress("solana", text), None
+    if text[0] in "13" and len(text) <= 35:
+        return None, "invalid Bitcoin address, the checksum does not match"
+    if text[0] == "T" and len(text) == 34:
+        return None, "invalid Tron address, the checksum does not match"
+    return None, None
@@ -0,0 +1,65 @@
+import heapq
+import math
+import time
+from operator import itemgetter
+from typing import Callable, Hashable
+
+# Rescale the stored weights before their growth factor overflows a float
+_MAX_EXPONENT = 64
+
+
+class DecayingTopK:
+    """Approximate top-k of a stream in bounded memory, favouring recent items.
+
+    Space-Saving keeps ``capacity`` counters. An item without a counter takes
+    over the smallest one and inherits its count, so counts overestimate by at
+    most that inherited error, and every item heavier than ``1 / capacity`` of
+    the stream is kept. Weights halve every ``half_life`` seconds. Instead of
+    decaying all counters, new weights are scaled up by the time passed since
+    a landmark, which keeps updates O(1) apart from evictions.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        half_life: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.half_life = half_life
+        self._clock = clock
+        self._landmark = clock()
+        self._counts: dict[Hashable, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(self, key: Hashable, weight: float = 1.0) -> None:
+        now = self._clock()
+        if (now - self._landmark) / self.half_life > _MAX_EXPONENT:
+            self._rescale(now)
+        exponent = (now - self._landmark) / self.half_life
+        weight *= 2.0**exponent
+
+        if key in self._counts:
+            self._counts[key] += weight
+        elif len(self._counts) < self.capacity:
+            self._counts[key] = weight
+        else:
+            smallest = min(self._counts, key=self._counts.__getitem__)
+            self._counts[key] = self._counts.pop(smallest) + weight
+
+    def top(self, n: int) -> list[tuple[Hashable, float]]:
+        """The ``n`` heaviest items with their current decayed weight."""
+        scale = 2.0 ** -((self._clock() - self._landmark) / self.half_life)
+        heaviest = heapq.nlargest(n, self._counts.items(), key=itemgetter(1))
+        return [(key, count * scale) for key, count in heaviest]
+
+    def _rescale(self, now: float) -> None:
+        scale = 2.0 ** -((now - self._landmark) / self.half_life)
+        self._counts = {
+            key: count * scale
+            for key, count in self._counts.items()
+            if count * scale > math.ulp(1.0)
+        }
+        self._landmark = now
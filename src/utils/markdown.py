@@ -1,63 +1,203 @@
+import re
+from collections.abc import Iterable
+
 from markdown_it import MarkdownIt
+from telegram.constants import MessageLimit
+
+from src.utils.string_formatters import markdownify
+
+# Parsing only needs the block structure, so a single parser is shared and
+# inline parsing, most of the work, is skipped
+_parser = MarkdownIt().disable(["inline", "text_join"])
+
+_FENCE = re.compile(r" {0,3}(`{3,}|~{3,})(.*)")
+
+
+def _blocks(markdown_text: str) -> list[tuple[bool, str]]:
+    """Top-level blocks of ``markdown_text`` as ``(is_heading, source)`` pairs.
+
+    Blocks are sliced from the original source, so list markers, code fences
+    and quotes survive untouched. Blank lines stay with the preceding block.
+    """
+    lines = markdown_text.splitlines(keepends=True)
+    starts = [
+        (token.map[0], token.type == "heading_open")
+        for token in _parser.parse(markdown_text)
+        if token.level == 0 and token.map and token.nesting >= 0
+    ]
+    if not starts:
+        return [(False, markdown_text)] if markdown_text.strip() else []
+
+    blocks = []
+    if starts[0][0] > 0:
+        blocks.append((False, "".join(lines[: starts[0][0]])))
+    for index, (start, is_heading) in enumerate(starts):
+        end = starts[index + 1][0] if index + 1 < len(starts) else len(lines)
+        blocks.append((is_heading, "".join(lines[start:end])))
+    return blocks
+
+
+def _render(markdown_text: str) -> str:
+    return markdownify(markdown_text).strip("\n")
+
+
+def _render_section(section: str, limit: int) -> list[str]:
+    """Render a section, splitting it into pieces of at most ``limit`` characters.
+
+    Sections are split between blocks first and only blocks that are too long
+    on their own are cut inside, at a line break or space where possible.
+    Text is only rendered whole when it can fit, so every character is rendered
+    a bounded number of times.
+    """
+    if len(section) <= 2 * limit:
+        rendered = _render(section)
+        if len(rendered) <= limit:
+            return [rendered] if rendered else []
+
+    pieces = []
+    ratio = 1.0
+    for _, block in _blocks(section):
+        rendered = _render(block) if len(block) <= 2 * limit * ratio else None
+        while rendered is None or len(rendered) > limit:
+            head, rendered, block = _cut(block, limit, ratio)
+            if rendered:
+                pieces.append(rendered)
+                # Source characters per rendered one, to size the next cut
+                ratio = len(head) / len(rendered)
+            rendered = _render(block) if len(block) <= 2 * limit * ratio else None
+        if rendered:
+            pieces.append(rendered)
+    return pieces
+
+
+def pack_markdown(
+    sections: Iterable[str], limit: int = MessageLimit.MAX_TEXT_LENGTH
+) -> list[str]:
+    """
+    Render markdown sections and pack them into as few messages as possible.
+
+    Every section is rendered to MarkdownV2 once and sizes are measured on the
+    rendered text, so each message fits into ``limit`` as Telegram counts it.
+
+    Args:
+        sections (Iterable[str]): Markdown sections, in order
+        limit (int): Maximum rendered length of a message
+
+    Returns:
+        list[str]: MarkdownV2 messages, ready to send
+    """
+    messages: list[str] = []
+    current = ""
+    for section in sections:
+        for piece in _render_section(section, limit):
+            if current and len(current) + len(piece) + 2 > limit:
+                messages.append(current)
+                current = ""
+            current += ("\n\n" if current else "") + piece
+    if current:
+        messages.append(current)
+    return messages
 
 
-def split_markdown(markdown_text: str, chunk_size: int | None = None) -> list[str]:
+def split_markdown(
+    markdown_text: str, limit: int = MessageLimit.MAX_TEXT_LENGTH
+) -> list[str]:
     """
-    Parse markdown text into sections and create chunks based on size limit.
+    Split markdown text at headings and pack it into MarkdownV2 messages.
 
     Args:
         markdown_text (str): Input markdown text
-        chunk_size (int): Maximum size of each chunk
+        limit (int): Maximum rendered length of a message
 
     Returns:
-        List[str]: List of text chunks
+        list[str]: MarkdownV2 messages, ready to send
     """
-    # Parse markdown into sections
-    md = MarkdownIt()
-    tokens = md.parse(markdown_text)
+    sections: list[str] = []
+    for is_heading, block in _blocks(markdown_text):
+        if is_heading or not sections:
+            sections.append(block)
+        else:
+            sections[-1] += block
+    return pack_markdown(sections, limit)
 
-    # Extract sections with proper heading levels
-    sections = []
-    current_section = []
 
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
+def cut_to_fit(markdown_text: str, limit: int) -> tuple[str, str]:
+    """
+    Cut markdown text so the rendered head fits into ``limit`` characters.
 
-        if token.type == "heading_open":
-            # Save previous section if it exists
-            if current_section:
-                sections.append("".join(current_section))
-                current_section = []
+    The cut is made at the last line break that fits, falling back to the last
+    space and finally to a hard cut. A code block that is cut is closed at the
+    end of the head and reopened at the start of the tail.
 
-            # Get heading level and text
-            level = len(token.markup)  # number of '#' characters
-            heading_text = tokens[i + 1].content
+    Args:
+        markdown_text (str): Input markdown text
+        limit (int): Maximum rendered MarkdownV2 length of the head
 
-            # Add heading with proper number of hashtags
-            current_section.append("#" * level + " " + heading_text + "\n")
-            i += 2  # Skip the heading_content and heading_close tokens
+    Returns:
+        tuple[str, str]: The head that fits and the remaining tail
+    """
+    head, _, tail = _cut(markdown_text, limit)
+    return head, tail
 
-        elif token.type == "inline" and tokens[i - 1].type != "heading_open":
-            current_section.append(token.content + "\n")
-            i += 1
-        else:
-            i += 1
-
-    # Add final section if it exists
-    if current_section:
-        sections.append("".join(current_section))
-
-    if chunk_size:
-        current_part = ""
-        result = []
-        for section in sections:
-            new_section = current_part + "\n" + section
-            if len(new_section) < chunk_size:
-                current_part = new_section
-            else:
-                result.append(current_part)
-                current_part = ""
-        return result
-
-    return sections
+
+def _cut(markdown_text: str, limit: int, ratio: float = 1.0) -> tuple[str, str, str]:
+    """Cut off a head whose rendering fits into ``limit`` characters.
+
+    The first cut is tried ``limit * ratio`` source characters in and moved
+    back in proportion to the overshoot, so only text around the size of a
+    message is rendered. Returns the head, its rendering and the tail.
+    """
+    end = max(1, int(limit * ratio))
+    while True:
+        head, tail = _split_at(markdown_text, end)
+        rendered = _render(head)
+        if len(rendered) <= limit or end == 1:
+            return head, rendered, tail
+        end = max(1, min(end - 1, int(end * limit / len(rendered) * 0.9)))
+
+
+def _split_at(markdown_text: str, end: int) -> tuple[str, str]:
+    """Split before ``end`` at a line break, else a space, else at ``end``.
+
+    A code fence left open by the head is closed there and reopened in front
+    of the tail, so both render as code.
+    """
+    # A fence opening the text must keep at least one line of its code
+    first_line = markdown_text.split("\n", 1)[0]
+    start = len(first_line) + 1 if _FENCE.match(first_line) else 1
+    end = max(end, start)
+    for separator in ("\n", " "):
+        cut = markdown_text.rfind(separator, start, end)
+        if cut > 0:
+            head, tail = markdown_text[:cut], markdown_text[cut + 1 :]
+            break
+    else:
+        head, tail = markdown_text[:end], markdown_text[end:]
+
+    fence = _open_fence(head)
+    if fence is None or not tail:
+        return head, tail
+    offset, opener = fence
+    if offset and "\n" not in head[offset:]:
+        # The head ends with the opening line, so the whole block moves on
+        return head[:offset].rstrip("\n"), markdown_text[offset:]
+    marker = _FENCE.match(opener).group(1)
+    return f"{head}\n{marker}", f"{opener}\n{tail}"
+
+
+def _open_fence(markdown_text: str) -> tuple[int, str] | None:
+    """Offset and opening line of a code fence still open at the end of the text."""
+    fence = None
+    marker = ""
+    offset = 0
+    for line in markdown_text.splitlines(keepends=True):
+        match = _FENCE.match(line)
+        if match is None:
+            pass
+        elif fence is None:
+            fence, marker = (offset, line.rstrip("\n")), match.group(1)
+        elif match.group(1).startswith(marker) and not match.group(2).strip():
+            # Closed by a fence of the same kind and at least as long
+            fence = None
+        offset += len(line)
+    return fence
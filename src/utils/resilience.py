@@ -0,0 +1,109 @@
+import random
+import time
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit {name!r} is open, retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    ``closed``: calls pass through, failures are counted.
+    ``open``: calls fail fast until ``reset_timeout`` has elapsed.
+    ``half_open``: up to ``half_open_max_calls`` probes are let through, a
+    successful probe closes the circuit and a failed one opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self.failures = 0
+        self.rejected = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def acquire(self) -> None:
+        """Reserve a call slot, raising CircuitOpenError if none is available."""
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return
+
+        self.rejected += 1
+        retry_after = max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+        raise CircuitOpenError(self.name, retry_after)
+
+    def release(self, success: bool | None) -> None:
+        """Record the outcome of an acquired call, None if it was abandoned."""
+        if self._state == self.HALF_OPEN:
+            self._half_open_calls = max(0, self._half_open_calls - 1)
+
+        if success is not None:
+            self.record(success)
+
+    def record(self, success: bool) -> None:
+        """Record the outcome of a call that already released its slot, like a
+        streamed response that is read after it was opened."""
+        if success:
+            self.failures = 0
+            if self._state != self.CLOSED:
+                self._transition(self.CLOSED)
+            return
+
+        self.failures += 1
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self._state != self.OPEN:
+                self._transition(self.OPEN)
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+    def _transition(self, state: str) -> None:
+        logger.warning("Circuit %s: %s -> %s", self.name, self._state, state)
+        self._state = state
+        self._half_open_calls = 0
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff delay for a zero-based retry attempt."""
+    return random.uniform(0, min(cap, base * 2**attempt))
@@ -0,0 +1,30 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into a single shared call.
+
+    While a call for a key is in flight, later callers await the same result
+    instead of starting their own. Each caller waits through ``asyncio.shield``
+    so a cancelled waiter never cancels the shared call for everyone else.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
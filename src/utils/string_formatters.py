@@ -4,13 +4,22 @@ import telegramify_markdown
 
 from src.models.confidace_score import ConfidenceScore
 
+CONFIDENCE_DISCLAIMER = (
+    "\n⚠️ *Disclaimer*: This analysis is for informational purposes only. "
+    "Always conduct your own research before making investment decisions."
+)
 
-def format_confidence_score(score: ConfidenceScore) -> str:
+
+def format_confidence_score(
+    score: ConfidenceScore, include_disclaimer: bool = True
+) -> str:
     """
     Convert a ConfidenceScore model into a formatted Telegram message.
 
     Args:
         score: ConfidenceScore instance to format
+        include_disclaimer: Append the disclaimer, disable it when combining
+            several scores into one message
 
     Returns:
         str: Formatted message ready to send via Telegram
@@ -56,11 +65,8 @@ def format_confidence_score(score: ConfidenceScore) -> str:
     if score.version is not None:
         message_parts.append(f"\nAnalysis Version: {score.version}")
 
-    disclaimer = (
-        "\n⚠️ *Disclaimer*: This analysis is for informational purposes only. "
-        "Always conduct your own research before making investment decisions."
-    )
-    message_parts.append(disclaimer)
+    if include_disclaimer:
+        message_parts.append(CONFIDENCE_DISCLAIMER)
 
     return "\n".join(message_parts)
 
@@ -0,0 +1,29 @@
+import re
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Normalize a user supplied coin symbol for cache keys and lookups.
+
+    Examples:
+        ``" $BTC "`` -> ``"btc"``
+    """
+    return symbol.strip().lstrip("$").strip().casefold()
+
+
+def split_symbols(text: str, limit: int | None = None) -> list[str]:
+    """Split a message into distinct coin symbols.
+
+    Symbols may be separated by whitespace or commas. Duplicates (after
+    normalization) are dropped, keeping the first spelling.
+
+    Examples:
+        ``"BTC, eth $btc SOL"`` -> ``["BTC", "eth", "SOL"]``
+    """
+    symbols = []
+    seen = set()
+    for symbol in re.split(r"[\s,]+", text.strip()):
+        key = normalize_symbol(symbol)
+        if key and key not in seen:
+            seen.add(key)
+            symbols.append(symbol)
+    return symbols[:limit] if limit else symbols
@@ -0,0 +1,85 @@
+import time
+from typing import Hashable
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second.
+
+    Tokens may go negative through :meth:`reserve`: every caller takes a
+    token right away and waits for the returned delay, so callers are spaced
+    out in FIFO order without a queue.
+    """
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= 1
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available, without taking it."""
+        self._refill(time.monotonic())
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def take(self) -> None:
+        self._refill(time.monotonic())
+        self.tokens -= 1
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds until it may be used."""
+        self.take()
+        return max(0.0, -self.tokens / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds``."""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+    def idle_full(self, now: float) -> bool:
+        """Whether the bucket has refilled completely since its last use."""
+        return now - self.updated >= (self.capacity - self.tokens) / self.rate
+
+
+class TokenBuckets:
+    """Token buckets of the same size created on demand per key.
+
+    Buckets that refilled completely behave like new ones, so they are
+    forgotten in a sweep every ``prune_interval`` seconds.
+    """
+
+    def __init__(self, rate: float, capacity: float, prune_interval: float = 60.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.prune_interval = prune_interval
+        self._buckets: dict[Hashable, TokenBucket] = {}
+        self._last_prune = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def __getitem__(self, key: Hashable) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._prune()
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.capacity)
+        return bucket
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        if now - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = now
+        for key in [
+            key for key, bucket in self._buckets.items() if bucket.idle_full(now)
+        ]:
+            del self._buckets[key]
@@ -0,0 +1,6 @@
+import os
+
+# Settings are read on import, tests run without a .env file
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456:test")
+os.environ.setdefault("API_BASE_URL", "http://127.0.0.1:8081")
+os.environ.setdefault("API_KEY", "test")
@@ -0,0 +1,121 @@
+import unittest
+
+from src.utils.addresses import (
+    WalletAddress,
+    keccak256,
+    parse_address,
+    to_checksum_address,
+)
+
+BAD_CHECKSUM = "the checksum does not match"
+
+
+class Keccak256Test(unittest.TestCase):
+    def test_known_digests(self):
+        vectors = {
+            b"": "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470",
+            b"abc": "4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45",
+            b"The quick brown fox jumps over the lazy dog": (
+                "4d741b6f1eb29cb2a9b9911c82f56fa8d73b04959d3d9d222895df6c0b28aa15"
+            ),
+        }
+        for data, digest in vectors.items():
+            with self.subTest(data=data):
+                self.assertEqual(keccak256(data).hex(), digest)
+
+
+class EvmAddressTest(unittest.TestCase):
+    CHECKSUMMED = (
+        "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed",
+        "0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359",
+        "0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB",
+        "0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb",
+    )
+
+    def test_checksum_encoding_matches_eip55(self):
+        for address in self.CHECKSUMMED:
+            with self.subTest(address=address):
+                self.assertEqual(to_checksum_address(address.lower()), address)
+
+    def test_accepts_checksummed_and_single_case_addresses(self):
+        for address in self.CHECKSUMMED + (
+            self.CHECKSUMMED[0].lower(),
+            "0x" + self.CHECKSUMMED[0][2:].upper(),
+        ):
+            with self.subTest(address=address):
+                self.assertEqual(
+                    parse_address(address),
+                    (WalletAddress("evm", address.lower()), None),
+                )
+
+    def test_rejects_a_wrong_checksum_or_length(self):
+        wrong_case = self.CHECKSUMMED[0][:-1] + "D"
+        address, error = parse_address(wrong_case)
+        self.assertIsNone(address)
+        self.assertIn(BAD_CHECKSUM, error)
+
+        address, error = parse_address(self.CHECKSUMMED[0][:-2])
+        self.assertIsNone(address)
+        self.assertIn("40 hex digits", error)
+
+
+class BitcoinAddressTest(unittest.TestCase):
+    VALID = (
+        "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
+        "3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy",
+        "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4",
+        "bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0",
+    )
+
+    def test_accepts_legacy_and_segwit_addresses(self):
+        for address in self.VALID:
+            with self.subTest(address=address):
+                self.assertEqual(
+                    parse_address(address), (WalletAddress("bitcoin", address), None)
+                )
+
+    def test_bech32_addresses_are_case_insensitive(self):
+        self.assertEqual(
+            parse_address(self.VALID[2].upper()),
+            (WalletAddress("bitcoin", self.VALID[2]), None),
+        )
+
+    def test_rejects_tampered_addresses(self):
+        tampered = [address[:-1] + "2" for address in self.VALID] + [
+            "bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj1",
+            # Taproot program with a bech32 instead of a bech32m checksum
+            "bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqh2y7hd",
+            # Mixed case is not allowed in bech32
+            "BC1QW508D6qejxtdg4y5r3zarvary0c5xw7kv8f3t4",
+        ]
+        for address in tampered:
+            with self.subTest(address=address):
+                result, error = parse_address(address)
+                self.assertIsNone(result)
+                self.assertIn(BAD_CHECKSUM, error)
+
+
+class OtherChainsTest(unittest.TestCase):
+    def test_tron_addresses(self):
+        usdt = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+        self.assertEqual(parse_address(usdt), (WalletAddress("tron", usdt), None))
+
+        result, error = parse_address(usdt[:-1] + "u")
+        self.assertIsNone(result)
+        self.assertIn("Tron", error)
+
+    def test_solana_addresses(self):
+        for address in (
+            "So11111111111111111111111111111111111111112",
+            "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+        ):
+            with self.subTest(address=address):
+                self.assertEqual(
+                    parse_address(f" {address} "),
+                    (WalletAddress("solana", address), None),
+                )
+
+    def test_other_text_is_no_address(self):
+        for text in ("bitcoin", "hello world", "0x123", "$eth", "ETH/USDT", ""):
+            with self.subTest(text=text):
+                self.assertEqual(parse_address(text), (None, None))
@@ -0,0 +1,143 @@
+import unittest
+from unittest import mock
+
+from telegram.error import Forbidden
+
+from src.services.alerts import CHAT_ALERTS, Alert, AlertBook, PriceAlerts
+
+
+class AlertBookTest(unittest.TestCase):
+    def test_triggered_returns_only_crossed_alerts(self):
+        book = AlertBook()
+        above = Alert(1, "btc", high=100)
+        below = Alert(2, "btc", low=50)
+        far = Alert(3, "btc", high=200)
+        other = Alert(4, "eth", high=1)
+        for alert in (above, below, far, other):
+            book.add(alert)
+
+        self.assertEqual(book.triggered("btc", 100), [above])
+        self.assertEqual(book.triggered("btc", 50), [below])
+        self.assertEqual(book.triggered("btc", 150), [])
+        self.assertEqual(len(book), 2)
+        self.assertEqual(sorted(book.symbols()), ["btc", "eth"])
+
+    def test_triggered_removes_both_bounds_of_a_watch(self):
+        book = AlertBook()
+        watch = Alert.watch(1, "btc", price=100, percent=10)
+        book.add(watch)
+
+        self.assertEqual(book.triggered("btc", 111), [watch])
+        self.assertEqual(len(book), 0)
+        self.assertEqual(book.symbols(), [])
+        self.assertEqual(book.triggered("btc", 80), [])
+
+    def test_triggered_matches_brute_force(self):
+        book = AlertBook()
+        alerts = [
+            Alert(i, "btc", low=i * 3 % 17 or None, high=i * 7 % 23 + 20)
+            for i in range(50)
+        ]
+        for alert in alerts:
+            book.add(alert)
+
+        for price in (5, 12, 25, 31, 40):
+            expected = {
+                alert
+                for alert in alerts
+                if (alert.high is not None and price >= alert.high)
+                or (alert.low is not None and price <= alert.low)
+            }
+            self.assertEqual(set(book.triggered("btc", price)), expected)
+            alerts = [alert for alert in alerts if alert not in expected]
+            self.assertEqual(len(book), len(alerts))
+
+    def test_remove_keeps_alerts_with_equal_thresholds(self):
+        book = AlertBook()
+        first = Alert(1, "btc", high=100)
+        second = Alert(2, "btc", high=100)
+        book.add(first)
+        book.add(second)
+
+        book.remove(first)
+        book.remove(first)
+        self.assertEqual(len(book), 1)
+        self.assertEqual(book.triggered("btc", 100), [second])
+
+
+class AlertTest(unittest.TestCase):
+    def test_rearm_centers_the_range_on_the_price(self):
+        alert = Alert.watch(1, "btc", price=100, percent=5)
+        self.assertAlmostEqual(alert.low, 95)
+        self.assertAlmostEqual(alert.high, 105)
+
+        alert.rearm(200)
+        self.assertAlmostEqual(alert.low, 190)
+        self.assertAlmostEqual(alert.high, 210)
+        self.assertAlmostEqual(alert.reference, 200)
+
+
+class PriceAlertsTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.prices = {"btc": 100.0}
+
+        async def fetch_price(symbol):
+            return True, {"usd": self.prices[symbol]}
+
+        self.alerts = PriceAlerts(fetch_price, max_per_chat=2)
+        self.bot = mock.AsyncMock()
+        self.chat_data = {1: {}, 2: {}}
+
+    async def test_add_enforces_the_per_chat_maximum(self):
+        self.assertTrue(self.alerts.add(self.chat_data[1], Alert(1, "btc", high=1)))
+        self.assertTrue(self.alerts.add(self.chat_data[1], Alert(1, "btc", high=2)))
+        self.assertFalse(self.alerts.add(self.chat_data[1], Alert(1, "btc", high=3)))
+        self.assertEqual(len(self.alerts.book), 2)
+
+    async def test_check_removes_fired_one_off_alerts(self):
+        fired = Alert(1, "btc", high=90)
+        pending = Alert(1, "btc", high=150)
+        self.alerts.add(self.chat_data[1], fired)
+        self.alerts.add(self.chat_data[1], pending)
+
+        changed = await self.alerts.check(self.bot, self.chat_data)
+
+        self.assertEqual(changed, {1})
+        self.assertEqual(self.chat_data[1][CHAT_ALERTS], [pending])
+        self.assertEqual(len(self.alerts.book), 1)
+        self.bot.send_message.assert_awaited_once()
+
+    async def test_check_rearms_watches_around_the_new_price(self):
+        watch = Alert.watch(2, "btc", price=80, percent=10)
+        self.alerts.add(self.chat_data[2], watch)
+
+        changed = await self.alerts.check(self.bot, self.chat_data)
+
+        self.assertEqual(changed, {2})
+        self.assertEqual(self.chat_data[2][CHAT_ALERTS], [watch])
+        self.assertAlmostEqual(watch.reference, 100)
+        self.assertEqual(len(self.alerts.book), 1)
+        self.assertEqual(await self.alerts.check(self.bot, self.chat_data), set())
+
+    async def test_check_drops_the_alerts_of_unreachable_chats(self):
+        self.alerts.add(self.chat_data[1], Alert(1, "btc", high=90))
+        self.alerts.add(self.chat_data[1], Alert.watch(1, "btc", 500, percent=10))
+        self.bot.send_message.side_effect = Forbidden("bot was blocked")
+
+        changed = await self.alerts.check(self.bot, self.chat_data)
+
+        self.assertEqual(changed, {1})
+        self.assertEqual(self.chat_data[1][CHAT_ALERTS], [])
+        self.assertEqual(len(self.alerts.book), 0)
+
+    async def test_check_job_marks_changed_chats_for_persistence(self):
+        self.alerts.add(self.chat_data[1], Alert(1, "btc", high=90))
+        self.alerts.add(self.chat_data[2], Alert(2, "btc", high=150))
+        context = mock.Mock(bot=self.bot)
+        context.application.chat_data = self.chat_data
+
+        await self.alerts.check_job(context)
+
+        context.application.mark_data_for_update_persistence.assert_called_once_with(
+            chat_ids={1}
+        )
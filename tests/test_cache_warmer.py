@@ -0,0 +1,42 @@
+import unittest
+from unittest import mock
+
+from src.services.cache_warmer import CacheWarmer
+from src.utils.markdown import pack_markdown
+
+ENDPOINT = "/addon/price_info"
+
+
+class CacheWarmerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.data = {"text": "BTC *up*"}
+        self.api_service = mock.Mock(cache_ttls={ENDPOINT: 60})
+        self.api_service.popular_symbols.return_value = [("btc", 10.0), ("eth", 1.0)]
+        self.api_service.cache_expires_in.return_value = None
+        self.api_service.refresh_symbol = mock.AsyncMock(return_value=(True, self.data))
+        self.warmer = CacheWarmer(
+            self.api_service,
+            renderers={ENDPOINT: lambda data: data["text"]},
+            top_n=2,
+            min_score=3.0,
+            lead_time=15,
+        )
+
+    async def test_warm_refreshes_popular_symbols_and_keeps_their_cards(self):
+        await self.warmer.warm()
+
+        self.api_service.refresh_symbol.assert_awaited_once_with(ENDPOINT, "BTC")
+        self.assertEqual(self.warmer.card(self.data), pack_markdown(["BTC *up*"]))
+
+    async def test_cards_are_only_served_for_the_warmed_response(self):
+        await self.warmer.warm()
+
+        self.assertIsNone(self.warmer.card(dict(self.data)))
+
+    async def test_failed_renders_keep_no_card(self):
+        self.warmer.renderers[ENDPOINT] = lambda data: data["missing"]
+
+        await self.warmer.warm()
+
+        self.assertIsNone(self.warmer.card(self.data))
+        self.assertEqual(len(self.warmer.cards), 0)
@@ -0,0 +1,25 @@
+import unittest
+
+from loadtest import payloads
+from src.handlers.inline_query_handler import InlineQueryManager
+
+
+class CardsTest(unittest.TestCase):
+    def ids(self, price, confidence) -> list[str]:
+        return [card.id for card in InlineQueryManager._cards("BTC", price, confidence)]
+
+    def test_builds_both_cards(self):
+        price = (True, payloads.price_info("BTC"))
+        confidence = (True, payloads.confidence_score("BTC"))
+
+        self.assertEqual(self.ids(price, confidence), ["price:BTC", "confidence:BTC"])
+
+    def test_malformed_card_does_not_hide_the_other(self):
+        price = (True, payloads.price_info("BTC"))
+        confidence = (True, payloads.confidence_score("BTC"))
+
+        self.assertEqual(self.ids((True, {"usd": 1}), confidence), ["confidence:BTC"])
+        self.assertEqual(self.ids(price, (True, {"symbol": "BTC"})), ["price:BTC"])
+
+    def test_failed_lookups_get_no_card(self):
+        self.assertEqual(self.ids((False, "down"), None), [])
@@ -0,0 +1,84 @@
+import re
+import unittest
+
+from src.utils.markdown import cut_to_fit, pack_markdown, split_markdown
+from src.utils.string_formatters import markdownify
+
+LIMIT = 500
+
+
+def _content(text: str) -> str:
+    """Rendered text without whitespace and code fences, which cuts may move."""
+    return re.sub(r"\s+|```\w*", "", text)
+
+
+class SplitMarkdownTest(unittest.TestCase):
+    DOCUMENTS = {
+        "list": "# Coins\n\n"
+        + "".join(f"- coin_{i}: *up* 1.{i}% (24h)\n" for i in range(300)),
+        "code": "## Code\n\n```python\n"
+        + "".join(f"price_{i} = fetch({i}) * 2\n" for i in range(300))
+        + "```\n\nafter *code*\n",
+        "paragraph": " ".join(f"word_{i}." for i in range(1500)),
+        "word": "x_y" * 1000,
+        "sections": "".join(
+            f"## Section {i}\n\nSome *text* about coin_{i}.\n\n" for i in range(100)
+        ),
+    }
+
+    def test_chunks_fit_and_keep_all_content(self):
+        for name, text in self.DOCUMENTS.items():
+            with self.subTest(document=name):
+                chunks = split_markdown(text, LIMIT)
+
+                self.assertGreater(len(chunks), 1)
+                self.assertTrue(all(0 < len(chunk) <= LIMIT for chunk in chunks))
+                self.assertEqual(_content("".join(chunks)), _content(markdownify(text)))
+
+    def test_sections_are_packed_into_few_messages(self):
+        text = self.DOCUMENTS["sections"]
+        chunks = split_markdown(text, LIMIT)
+
+        rendered = sum(len(chunk) for chunk in chunks)
+        self.assertLessEqual(len(chunks), rendered // (LIMIT * 3 // 4) + 1)
+
+    def test_cut_code_blocks_are_reopened(self):
+        chunks = split_markdown(self.DOCUMENTS["code"], LIMIT)
+
+        for chunk in chunks[1:]:
+            self.assertTrue(chunk.startswith("```python\n"), chunk[:20])
+        for chunk in chunks:
+            self.assertEqual(chunk.count("```") % 2, 0)
+
+    def test_short_text_is_one_message(self):
+        self.assertEqual(split_markdown("Hello *world*"), ["Hello *world*"])
+        self.assertEqual(pack_markdown(["a", "b"]), ["a\n\nb"])
+        self.assertEqual(split_markdown(""), [])
+
+
+class CutToFitTest(unittest.TestCase):
+    def test_cuts_at_the_last_line_break_that_fits(self):
+        text = "\n".join(f"line {i}" for i in range(100))
+
+        head, tail = cut_to_fit(text, 50)
+
+        self.assertLessEqual(len(markdownify(head)), 50)
+        self.assertTrue(head.endswith("line 6"))
+        self.assertTrue(tail.startswith("line 7\n"))
+
+    def test_code_fence_is_closed_and_reopened(self):
+        text = "```\n" + "\n".join(f"x = {i}" for i in range(100)) + "\n```"
+
+        head, tail = cut_to_fit(text, 100)
+
+        self.assertTrue(head.startswith("```\n") and head.endswith("\n```"))
+        self.assertTrue(tail.startswith("```\nx = "))
+        self.assertLessEqual(len(markdownify(head)), 100)
+
+    def test_fence_opened_at_the_cut_moves_to_the_tail(self):
+        text = "intro\n```\n" + "y = 1\n" * 50 + "```"
+
+        head, tail = cut_to_fit(text, 12)
+
+        self.assertEqual(head, "intro")
+        self.assertTrue(tail.startswith("```\ny = 1"))
@@ -0,0 +1,62 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from src.core import metrics
+from src.utils.metrics import REGISTRY, Counter, MetricsServer, Registry
+
+
+class MetricsServerTest(unittest.IsolatedAsyncioTestCase):
+    async def serve(self, **kwargs) -> MetricsServer:
+        server = MetricsServer("127.0.0.1", 0, **kwargs)
+        await server.start()
+        self.addAsyncCleanup(server.stop)
+        return server
+
+    async def get(self, server: MetricsServer, path: str) -> tuple[str, str]:
+        port = server._server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\n\r\n".encode())
+        response = (await reader.read()).decode()
+        writer.close()
+        status_line, _, body = response.partition("\r\n\r\n")
+        return status_line.split("\r\n")[0].split(" ", 1)[1], body
+
+    async def test_serves_metrics_and_health(self):
+        registry = Registry()
+        Counter("requests_total", "Requests", registry=registry).inc()
+        healthy = True
+        server = await self.serve(registry=registry, health_check=lambda: healthy)
+
+        status, body = await self.get(server, "/metrics")
+        self.assertEqual(status, "200 OK")
+        self.assertIn("requests_total 1", body)
+        self.assertEqual(await self.get(server, "/healthz"), ("200 OK", "ok\n"))
+
+        healthy = False
+        status, _ = await self.get(server, "/healthz")
+        self.assertEqual(status, "503 Service Unavailable")
+
+    async def test_serves_only_health_without_a_registry(self):
+        server = await self.serve(registry=None, health_check=lambda: True)
+
+        self.assertEqual(await self.get(server, "/healthz"), ("200 OK", "ok\n"))
+        status, _ = await self.get(server, "/metrics")
+        self.assertEqual(status, "404 Not Found")
+
+
+class UpdateMetricsTest(unittest.TestCase):
+    def test_only_the_deepest_chats_are_reported(self):
+        processor = mock.Mock(running=0)
+        processor.queue_depths.return_value = {chat: chat for chat in range(1, 31)}
+
+        metrics.register_update_metrics(processor)
+
+        chats = [
+            line
+            for line in REGISTRY.render().splitlines()
+            if line.startswith("bot_update_queue_chat_depth{")
+        ]
+        self.assertEqual(len(chats), metrics.TOP_CHAT_QUEUES)
+        self.assertIn('bot_update_queue_chat_depth{chat="30"} 30', chats)
+        self.assertNotIn('bot_update_queue_chat_depth{chat="20"} 20', chats)
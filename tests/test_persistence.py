@@ -0,0 +1,113 @@
+import asyncio
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.services import persistence
+from src.services.persistence import SQLitePersistence
+
+
+class SharedPersistenceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.database = Path(directory.name, "state.sqlite3")
+        await SQLitePersistence(self.database).prepare()
+        self.first = SQLitePersistence(self.database, shared=True)
+        self.second = SQLitePersistence(self.database, shared=True)
+        self.addAsyncCleanup(self.first.flush)
+        self.addAsyncCleanup(self.second.flush)
+
+    async def write(self, persistence: SQLitePersistence) -> None:
+        await persistence._write_task
+
+    async def test_refresh_reads_changes_of_other_processes(self):
+        user_data = (await self.second.get_user_data()).get(1, {})
+        await self.first.update_user_data(1, {"seen": 1})
+        await self.write(self.first)
+
+        await self.second.refresh_user_data(1, user_data)
+        self.assertEqual(user_data, {"seen": 1})
+
+        await self.first.drop_user_data(1)
+        await self.write(self.first)
+        await self.second.refresh_user_data(1, user_data)
+        self.assertEqual(user_data, {})
+
+    async def test_refresh_keeps_unsaved_changes(self):
+        await self.first.update_chat_data(1, {"alerts": []})
+        await self.write(self.first)
+        chat_data = (await self.second.get_chat_data())[1]
+
+        chat_data["alerts"].append("btc")
+        await self.first.update_chat_data(1, {"alerts": ["eth"]})
+        await self.write(self.first)
+        await self.second.refresh_chat_data(1, chat_data)
+        self.assertEqual(chat_data, {"alerts": ["btc"]})
+
+    async def test_refresh_does_not_rewrite_unchanged_rows(self):
+        await self.first.update_bot_data({"version": 2})
+        await self.write(self.first)
+        bot_data = {}
+
+        await self.second.refresh_bot_data(bot_data)
+        await self.second.update_bot_data(bot_data)
+        self.assertEqual(bot_data, {"version": 2})
+        self.assertEqual(self.second._pending, {})
+
+    async def test_unshared_refresh_is_a_no_op(self):
+        await self.first.update_user_data(1, {"seen": 1})
+        await self.write(self.first)
+        unshared = SQLitePersistence(self.database)
+        self.addAsyncCleanup(unshared.flush)
+
+        user_data = {}
+        await unshared.refresh_user_data(1, user_data)
+        self.assertEqual(user_data, {})
+
+
+class FailedWriteTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.persistence = SQLitePersistence(Path(directory.name, "state.sqlite3"))
+        self.write = self.persistence._write
+        self.failures = 0
+
+    def fail(self, times: int):
+        def write(batch):
+            if self.failures < times:
+                self.failures += 1
+                raise sqlite3.OperationalError("database is locked")
+            self.write(batch)
+
+        self.persistence._write = write
+
+    async def stored_users(self) -> dict:
+        await self.persistence.flush()
+        return await SQLitePersistence(self.persistence.database).get_user_data()
+
+    @mock.patch("src.services.persistence.RETRY_DELAY", 0.01)
+    async def test_failed_rows_are_retried_without_overwriting_newer_ones(self):
+        self.fail(times=2)
+        await self.persistence.update_user_data(1, {"mode": "old"})
+        await self.persistence.update_user_data(2, {"mode": "kept"})
+        await asyncio.sleep(0)
+        await self.persistence.update_user_data(1, {"mode": "new"})
+
+        await asyncio.wait_for(self.persistence._write_task, timeout=5)
+
+        self.assertEqual(self.failures, 2)
+        self.assertEqual(
+            await self.stored_users(), {1: {"mode": "new"}, 2: {"mode": "kept"}}
+        )
+
+    async def test_flush_gives_up_after_a_few_attempts(self):
+        self.fail(times=100)
+        await self.persistence.update_user_data(1, {"mode": "lost"})
+
+        await asyncio.wait_for(self.persistence.flush(), timeout=5)
+
+        self.assertEqual(self.failures, persistence.FLUSH_ATTEMPTS)
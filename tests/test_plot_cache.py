@@ -0,0 +1,80 @@
+import mmap
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.handlers.message_handler import message_handler
+from src.services.plot_cache import PlotCache
+
+
+class PlotCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_get_maps_cached_images(self):
+        cache = PlotCache(self.directory, max_bytes=100)
+        cache.put("abcdef", b"image")
+
+        image = cache.get("abcdef")
+        self.addCleanup(image.close)
+        self.assertEqual(image[:], b"image")
+        self.assertIsNone(cache.get("missing"))
+        self.assertIsNone(cache.get("../etc"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_images_are_evicted(self):
+        cache = PlotCache(self.directory, max_bytes=10)
+        cache.put("aaaa", b"12345")
+        cache.put("bbbb", b"12345")
+        cache.get("aaaa").close()
+        cache.put("cccc", b"12345")
+
+        self.assertIsNone(cache.get("bbbb"))
+        self.assertEqual(cache.total_bytes, 10)
+
+    def test_images_of_previous_runs_are_indexed(self):
+        PlotCache(self.directory, max_bytes=100).put("abcdef", b"image")
+
+        image = PlotCache(self.directory, max_bytes=100).get("abcdef")
+        self.addCleanup(image.close)
+        self.assertEqual(image[:], b"image")
+
+
+class SendPlotsTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        with tempfile.TemporaryFile() as file:
+            file.write(b"image")
+            file.flush()
+            self.image = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.update = mock.Mock()
+        self.update.message.reply_text = mock.AsyncMock()
+        self.context = mock.Mock()
+        self.context.bot.send_chat_action = mock.AsyncMock()
+        self.context.bot.send_media_group = mock.AsyncMock()
+
+    async def send_plots(self, *images) -> None:
+        with mock.patch.object(
+            message_handler, "_fetch_plot_images", mock.AsyncMock(return_value=images)
+        ):
+            await message_handler._send_plots(self.update, self.context, ["ab"], 1)
+
+    async def test_cached_images_are_streamed_from_their_maps(self):
+        await self.send_plots(self.image, b"downloaded")
+
+        cached, downloaded = self.context.bot.send_media_group.await_args.kwargs[
+            "media"
+        ]
+        self.assertIs(cached.media.input_file_content, self.image)
+        self.assertEqual(downloaded.media.input_file_content, b"downloaded")
+        self.assertTrue(self.image.closed)
+
+    async def test_cached_images_are_closed_when_sending_fails(self):
+        self.context.bot.send_media_group.side_effect = OSError
+
+        await self.send_plots(self.image)
+
+        self.assertTrue(self.image.closed)
+        self.update.message.reply_text.assert_awaited_once()
@@ -0,0 +1,99 @@
+import asyncio
+import datetime
+import unittest
+
+from telegram.error import RetryAfter
+
+from src.services.rate_limiter import PRIORITY_ACTION, PriorityRateLimiter
+
+
+class PriorityRateLimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.limiter = PriorityRateLimiter(global_rate=20, chat_rate=20, chat_burst=1)
+        self.addAsyncCleanup(self.limiter.shutdown)
+        self.calls = []
+
+    async def request(self, endpoint: str, data: dict, *results, priority=None):
+        results = iter(results or [True])
+
+        async def callback():
+            self.calls.append(endpoint)
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return await asyncio.wait_for(
+            self.limiter.process_request(callback, (), {}, endpoint, data, priority),
+            timeout=5,
+        )
+
+    async def test_calls_outside_chats_are_not_limited(self):
+        self.limiter.global_bucket.pause(60)
+
+        self.assertTrue(await self.request("getMe", {}))
+        self.assertEqual(self.limiter.queue_depth, 0)
+
+    async def test_answers_go_before_queued_messages(self):
+        self.limiter.global_bucket.tokens = 0
+
+        message = asyncio.create_task(self.request("sendMessage", {"chat_id": 1}))
+        await asyncio.sleep(0)
+        answer = asyncio.create_task(
+            self.request("answerCallbackQuery", {"callback_query_id": "1"})
+        )
+        await asyncio.gather(message, answer)
+
+        self.assertEqual(self.calls, ["answerCallbackQuery", "sendMessage"])
+
+    async def test_explicit_priority_overrides_the_endpoint(self):
+        self.limiter.global_bucket.tokens = 0
+
+        answer = asyncio.create_task(
+            self.request(
+                "answerInlineQuery", {"inline_query_id": "1"}, priority=PRIORITY_ACTION
+            )
+        )
+        await asyncio.sleep(0)
+        message = asyncio.create_task(self.request("sendMessage", {"chat_id": 1}))
+        await asyncio.gather(answer, message)
+
+        self.assertEqual(self.calls, ["sendMessage", "answerInlineQuery"])
+
+    async def test_chat_actions_that_would_wait_are_dropped(self):
+        await self.request("sendMessage", {"chat_id": 1})
+
+        self.assertTrue(await self.request("sendChatAction", {"chat_id": 1}))
+        await self.request("sendChatAction", {"chat_id": 2})
+
+        self.assertEqual(self.calls, ["sendMessage", "sendChatAction"])
+
+    async def test_group_chats_also_take_a_group_token(self):
+        await self.request("sendMessage", {"chat_id": -100})
+        await self.request("sendMessage", {"chat_id": "@channel"})
+
+        self.assertEqual(len(self.limiter._group_buckets), 2)
+        self.assertEqual(len(self.limiter._chat_buckets), 2)
+
+    async def test_flood_control_pauses_the_chat_and_retries(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        result = await self.request(
+            "sendMessage",
+            {"chat_id": 1},
+            RetryAfter(datetime.timedelta(milliseconds=100)),
+            {"ok": True},
+        )
+
+        self.assertEqual(result, {"ok": True})
+        self.assertEqual(self.calls, ["sendMessage", "sendMessage"])
+        self.assertGreaterEqual(loop.time() - start, 0.1)
+
+    async def test_flood_control_is_raised_after_the_retries(self):
+        flood = RetryAfter(datetime.timedelta(milliseconds=10))
+
+        with self.assertRaises(RetryAfter):
+            await self.request("sendMessage", {"chat_id": 1}, *[flood] * 3)
+
+        self.assertEqual(len(self.calls), self.limiter.max_retries + 1)
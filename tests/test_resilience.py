@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+
+from src.utils.resilience import CircuitBreaker, CircuitOpenError, backoff_delay
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch(
+            "src.utils.resilience.time.monotonic", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(
+            "api", failure_threshold=3, reset_timeout=30, half_open_max_calls=1
+        )
+
+    def fail(self, times: int = 1) -> None:
+        for _ in range(times):
+            self.breaker.acquire()
+            self.breaker.release(False)
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail(2)
+        self.breaker.acquire()
+        self.breaker.release(True)
+        self.fail(2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.fail()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_open_circuit_rejects_calls_until_the_reset_timeout(self):
+        self.fail(3)
+        self.now += 10
+
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.acquire()
+        self.assertAlmostEqual(raised.exception.retry_after, 20)
+        self.assertEqual(self.breaker.rejected, 1)
+
+        self.now += 20
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+    def test_half_open_lets_a_limited_number_of_probes_through(self):
+        self.fail(3)
+        self.now += 30
+
+        self.breaker.acquire()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.acquire()
+
+        # An abandoned probe frees its slot without deciding the state
+        self.breaker.release(None)
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.breaker.acquire()
+
+    def test_successful_probe_closes_the_circuit(self):
+        self.fail(3)
+        self.now += 30
+
+        self.breaker.acquire()
+        self.breaker.release(True)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_failed_probe_reopens_the_circuit(self):
+        self.fail(3)
+        self.now += 30
+
+        self.fail()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.acquire()
+        self.assertAlmostEqual(raised.exception.retry_after, 30)
+
+    def test_outcomes_can_be_recorded_after_release(self):
+        for _ in range(3):
+            self.breaker.acquire()
+            self.breaker.release(None)
+            self.breaker.record(False)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+
+class BackoffDelayTest(unittest.TestCase):
+    def test_delay_is_jittered_below_the_capped_exponential(self):
+        for attempt, ceiling in ((0, 0.5), (1, 1.0), (2, 2.0), (5, 10.0)):
+            with self.subTest(attempt=attempt):
+                delays = [backoff_delay(attempt, base=0.5, cap=10) for _ in range(200)]
+                self.assertTrue(all(0 <= delay <= ceiling for delay in delays))
+                self.assertGreater(max(delays), ceiling / 2)
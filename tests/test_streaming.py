@@ -0,0 +1,200 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+from telegram.error import BadRequest
+
+from src.core.cofig import settings
+from src.handlers.message_handler import (
+    MAX_MESSAGE_LENGTH,
+    MessageManager,
+    message_handler,
+)
+from src.services.api_service import AnalysisAPIService
+from src.utils.resilience import CircuitBreaker
+
+ENDPOINT = "/addon/response"
+SSE_HEADERS = {"content-type": "text/event-stream"}
+
+
+class ClosingStream(httpx.AsyncByteStream):
+    def __init__(self, *payloads: str):
+        self.payloads = payloads
+        self.closed = False
+
+    async def __aiter__(self):
+        for payload in self.payloads:
+            yield f"data: {payload}\n\n".encode()
+
+    async def aclose(self):
+        self.closed = True
+
+
+def sse(*payloads: str, hang: bool = False):
+    async def body():
+        for payload in payloads:
+            yield f"data: {payload}\n\n".encode()
+        if hang:
+            await asyncio.sleep(60)
+
+    return body()
+
+
+class StreamAnalysisTest(unittest.IsolatedAsyncioTestCase):
+    def serve(self, *responses: httpx.Response) -> AnalysisAPIService:
+        responses = iter(responses)
+        service = AnalysisAPIService()
+        service._client = httpx.AsyncClient(
+            base_url="http://backend",
+            transport=httpx.MockTransport(lambda request: next(responses)),
+        )
+        service.deadlines[ENDPOINT] = 0.5
+        self.addAsyncCleanup(service.close)
+        return service
+
+    async def events(self, service: AnalysisAPIService) -> list[dict]:
+        return [event async for event in service.stream_analysis("btc")]
+
+    async def test_streams_deltas_then_the_result(self):
+        service = self.serve(
+            httpx.Response(
+                200,
+                headers=SSE_HEADERS,
+                content=sse(
+                    '{"text": "Hel"}', '{"text": "lo", "plots": ["a"]}', "[DONE]"
+                ),
+            )
+        )
+
+        events = await self.events(service)
+
+        self.assertEqual(
+            [event["type"] for event in events], ["delta", "delta", "done"]
+        )
+        self.assertEqual(events[-1]["text"], "Hello")
+        self.assertEqual(events[-1]["plots"], ["a"])
+        self.assertEqual(service.breakers[ENDPOINT].failures, 0)
+
+    async def test_retries_opening_the_stream(self):
+        service = self.serve(
+            httpx.Response(503),
+            httpx.Response(200, headers=SSE_HEADERS, content=sse('{"text": "ok"}')),
+        )
+
+        with mock.patch("src.services.api_service.backoff_delay", return_value=0):
+            events = await self.events(service)
+
+        self.assertTrue(events[-1]["success"])
+        self.assertEqual(events[-1]["text"], "ok")
+
+    async def test_hung_stream_ends_at_the_deadline_and_counts_as_failure(self):
+        service = self.serve(
+            httpx.Response(
+                200, headers=SSE_HEADERS, content=sse('{"text": "Hel"}', hang=True)
+            )
+        )
+
+        events = await asyncio.wait_for(self.events(service), timeout=5)
+
+        self.assertEqual(events[0], {"type": "delta", "text": "Hel"})
+        self.assertFalse(events[-1]["success"])
+        self.assertIn("too long", events[-1]["text"])
+        self.assertEqual(service.breakers[ENDPOINT].failures, 1)
+
+    async def test_streams_opened_but_never_finished_open_the_circuit(self):
+        threshold = settings.BREAKER_FAILURE_THRESHOLD
+        service = self.serve(
+            *(
+                httpx.Response(200, headers=SSE_HEADERS, content=sse(hang=True))
+                for _ in range(threshold)
+            )
+        )
+        service.deadlines[ENDPOINT] = 0.05
+
+        for _ in range(threshold):
+            events = await asyncio.wait_for(self.events(service), timeout=5)
+            self.assertFalse(events[-1]["success"])
+
+        self.assertEqual(service.breakers[ENDPOINT].state, CircuitBreaker.OPEN)
+
+    async def test_plain_responses_are_passed_through(self):
+        service = self.serve(
+            httpx.Response(200, json={"success": True, "text": "Hi", "plots": None})
+        )
+
+        events = await self.events(service)
+
+        self.assertEqual(
+            events,
+            [{"type": "done", "success": True, "text": "Hi", "plots": None}],
+        )
+
+
+class EditStreamedTest(unittest.IsolatedAsyncioTestCase):
+    def message(self) -> mock.Mock:
+        message = mock.Mock(chat_id=1)
+        message.edit_text = mock.AsyncMock()
+        return message
+
+    async def test_only_the_last_message_gets_the_keyboard(self):
+        first, second = self.message(), self.message()
+        context = mock.Mock()
+        context.bot.send_message = mock.AsyncMock(return_value=second)
+        text = "word " * (MAX_MESSAGE_LENGTH // 4)
+
+        current, rest = await message_handler._edit_streamed(
+            context, first, text, final=True
+        )
+
+        self.assertIs(current, second)
+        self.assertTrue(rest)
+        self.assertIsNone(first.edit_text.await_args.kwargs["reply_markup"])
+        self.assertIsNotNone(second.edit_text.await_args.kwargs["reply_markup"])
+
+    async def test_unmodified_final_edit_is_ignored(self):
+        message = self.message()
+        message.edit_text.side_effect = BadRequest(
+            "Message is not modified: specified new message content and reply "
+            "markup are exactly the same as a current content and reply markup "
+            "of the message"
+        )
+
+        await MessageManager._edit_message(
+            message, "done", complete=True, keyboard=True
+        )
+
+    async def test_failed_complete_edit_raises(self):
+        message = self.message()
+        message.edit_text.side_effect = BadRequest("Can't parse entities")
+
+        await MessageManager._edit_message(message, "partial")
+        with self.assertRaises(BadRequest):
+            await MessageManager._edit_message(message, "done", complete=True)
+
+
+class StreamAnalysisQueryTest(unittest.IsolatedAsyncioTestCase):
+    async def test_failed_edit_closes_the_stream(self):
+        stream = ClosingStream('{"text": "Hel"}', '{"text": "lo"}', "[DONE]")
+        service = AnalysisAPIService()
+        service._client = httpx.AsyncClient(
+            base_url="http://backend",
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, headers=SSE_HEADERS, stream=stream)
+            ),
+        )
+        self.addAsyncCleanup(service.close)
+        edit = mock.AsyncMock(side_effect=BadRequest("Can't parse entities"))
+
+        with (
+            mock.patch.object(message_handler, "api_service", service),
+            mock.patch.object(message_handler, "_edit_streamed", edit),
+            mock.patch.object(settings, "STREAM_EDIT_INTERVAL", 0),
+        ):
+            with self.assertRaises(BadRequest):
+                await message_handler._stream_analysis_query(
+                    mock.Mock(), mock.Mock(), "btc", mock.Mock()
+                )
+
+        edit.assert_awaited_once()
+        self.assertTrue(stream.closed)
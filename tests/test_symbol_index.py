@@ -0,0 +1,40 @@
+import unittest
+
+from src.services.symbol_index import Coin, SymbolIndex
+
+BITCOIN = Coin("bitcoin", "btc", "Bitcoin")
+ETHEREUM = Coin("ethereum", "eth", "Ethereum")
+BITCOIN_CASH = Coin("bitcoin-cash", "bch", "Bitcoin Cash")
+MEMECOIN = Coin("harrypotterobamasonic10inu", "bitcoin", "HarryPotterObamaSonic10Inu")
+BRIDGED_ETH = Coin("ethereum-wormhole", "eth", "Wrapped Ether (Wormhole)")
+
+
+class SymbolIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = SymbolIndex(
+            [MEMECOIN, BRIDGED_ETH, BITCOIN, ETHEREUM, BITCOIN_CASH]
+        )
+
+    def test_resolve_tickers_by_symbol_first(self):
+        self.assertEqual(self.index.resolve(" $BTC "), BITCOIN)
+        self.assertEqual(self.index.resolve("eth"), ETHEREUM)
+
+    def test_resolve_words_by_id_and_name_first(self):
+        self.assertEqual(self.index.resolve("bitcoin"), BITCOIN)
+        self.assertEqual(self.index.resolve("Bitcoin  Cash"), BITCOIN_CASH)
+        self.assertEqual(self.index.resolve("ethereum-wormhole"), BRIDGED_ETH)
+        self.assertIsNone(self.index.resolve("dogecoin"))
+
+    def test_prefix_prefers_shorter_aliases(self):
+        self.assertEqual(self.index.prefix("bitc", limit=2), [BITCOIN, BITCOIN_CASH])
+        self.assertEqual(self.index.prefix(""), [])
+
+    def test_suggest_finds_typos_anywhere_in_the_alias(self):
+        for typo in ("bitcon", "bitcoim", "vitcoin", "ibtcoin", "bitcoinn", "etherium"):
+            with self.subTest(typo=typo):
+                self.assertIn(self.index.suggest(typo)[0], (BITCOIN, ETHEREUM))
+
+    def test_suggest_skips_typos_of_distant_and_short_queries(self):
+        self.assertEqual(self.index.suggest("solana"), [])
+        self.assertEqual(self.index.suggest("bz"), [])
+        self.assertEqual(self.index.suggest("bt"), [BITCOIN])
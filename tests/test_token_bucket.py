@@ -0,0 +1,75 @@
+import unittest
+from unittest import mock
+
+from src.utils.token_bucket import TokenBucket, TokenBuckets
+
+
+class ClockTestCase(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch(
+            "src.utils.token_bucket.time.monotonic", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TokenBucketTest(ClockTestCase):
+    def test_refills_at_the_rate_up_to_the_capacity(self):
+        bucket = TokenBucket(rate=2, capacity=3)
+        for _ in range(3):
+            self.assertTrue(bucket.available())
+            bucket.take()
+        self.assertFalse(bucket.available())
+        self.assertAlmostEqual(bucket.wait_time(), 0.5)
+
+        self.now += 0.5
+        self.assertTrue(bucket.available())
+        self.now += 60
+        bucket.take()
+        self.assertAlmostEqual(bucket.tokens, 2)
+
+    def test_reservations_are_spaced_out_in_order(self):
+        bucket = TokenBucket(rate=4, capacity=2)
+
+        delays = [bucket.reserve() for _ in range(5)]
+
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        for delay, expected in zip(delays[2:], (0.25, 0.5, 0.75)):
+            self.assertAlmostEqual(delay, expected)
+
+    def test_pause_hands_out_no_tokens_for_the_given_time(self):
+        bucket = TokenBucket(rate=1, capacity=5)
+
+        bucket.pause(10)
+
+        self.assertFalse(bucket.available())
+        self.assertAlmostEqual(bucket.wait_time(), 11)
+        self.now += 11
+        self.assertTrue(bucket.available())
+        self.assertAlmostEqual(bucket.reserve(), 0)
+
+
+class TokenBucketsTest(ClockTestCase):
+    def test_buckets_are_kept_per_key(self):
+        buckets = TokenBuckets(rate=1, capacity=1)
+
+        buckets[1].take()
+
+        self.assertIs(buckets[1], buckets[1])
+        self.assertFalse(buckets[1].available())
+        self.assertTrue(buckets[2].available())
+        self.assertEqual(len(buckets), 2)
+
+    def test_refilled_buckets_are_pruned_after_the_interval(self):
+        buckets = TokenBuckets(rate=1, capacity=2, prune_interval=60)
+        buckets["idle"].take()
+        buckets["busy"].pause(120)
+
+        self.now += 30
+        buckets["early"]
+        self.assertEqual(len(buckets), 3)
+
+        self.now += 30
+        buckets["new"]
+        self.assertEqual(sorted(buckets._buckets), ["busy", "new"])